@@ -51,7 +51,7 @@ if [ $? -eq 0 ]; then
     echo "- One big table: data/processed/obt/"
     echo ""
     echo "Next steps:"
-    echo "- Run 'make export' to load data into DuckDB"
+    echo "- Run 'make export' (or 'make export-views') to load data into DuckDB"
     echo "- Run 'make query' to start querying the data"
 else
     echo ""
@@ -0,0 +1,492 @@
+import argparse
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from duckdb import DuckDBPyConnection, connect
+
+from config import OBT_MATERIALIZATIONS, obt_policy
+from etl.duckdb_engine import literal, quote, relation_type
+from etl.transforms.rollups import ADDITIVE_MEASURES
+from io_utlis.duckdb_loader import load_models
+
+logger = logging.getLogger(__name__)
+
+# Whiffs per swing, with the same pitch descriptions as the rollups
+WHIFF_RATE = f"{ADDITIVE_MEASURES['whiffs']} / nullif({ADDITIVE_MEASURES['swings']}, 0)"
+
+# Representative analytic queries, one SQL statement per model. Each variant
+# answers the same question, so results are comparable across layouts.
+QUERIES: Dict[str, Dict[str, str]] = {
+    "pitch_mix_by_pitcher": {
+        "star": """
+            SELECT p.full_name, f.pitch_type, count(*) AS pitches
+            FROM star_fact_pitch f
+            JOIN star_dim_player p ON f.pitcher_key = p.player_key
+            GROUP BY ALL
+        """,
+        "snowflake": """
+            SELECT p.full_name, f.pitch_type, count(*) AS pitches
+            FROM snowflake_fact_pitch f
+            JOIN snowflake_dim_player p ON f.player_key_pitcher = p.player_key
+            GROUP BY ALL
+        """,
+        "obt": """
+            SELECT pitcher_full_name AS full_name, pitch_type, count(*) AS pitches
+            FROM one_big_table
+            GROUP BY ALL
+        """,
+    },
+    "whiff_rate_by_count_category": {
+        "star": f"""
+            SELECT c.count_category, {WHIFF_RATE} AS whiff_rate
+            FROM star_fact_pitch f
+            JOIN star_dim_count c ON f.count_key = c.count_key
+            GROUP BY ALL
+        """,
+        "snowflake": f"""
+            SELECT c.count_category, {WHIFF_RATE} AS whiff_rate
+            FROM snowflake_fact_pitch f
+            JOIN snowflake_dim_count c ON f.count_key = c.count_key
+            GROUP BY ALL
+        """,
+        "obt": f"""
+            SELECT f.count_category, {WHIFF_RATE} AS whiff_rate
+            FROM one_big_table f
+            GROUP BY ALL
+        """,
+    },
+    "velocity_by_stadium": {
+        "star": """
+            SELECT g.stadium, f.pitch_type, avg(f.release_speed) AS avg_speed
+            FROM star_fact_pitch f
+            JOIN star_dim_game g ON f.game_key = g.game_key
+            GROUP BY ALL
+        """,
+        "snowflake": """
+            SELECT g.stadium, f.pitch_type, avg(f.release_speed) AS avg_speed
+            FROM snowflake_fact_pitch f
+            JOIN snowflake_dim_game g ON f.game_key = g.game_key
+            GROUP BY ALL
+        """,
+        "obt": """
+            SELECT stadium, pitch_type, avg(release_speed) AS avg_speed
+            FROM one_big_table
+            GROUP BY ALL
+        """,
+    },
+    "batter_handedness_splits": {
+        "star": """
+            SELECT b.full_name, f.p_throws, count(*) AS pitches, avg(f.woba_value) AS woba
+            FROM star_fact_pitch f
+            JOIN star_dim_player b ON f.batter_key = b.player_key
+            GROUP BY ALL
+        """,
+        "snowflake": """
+            SELECT b.full_name, f.p_throws, count(*) AS pitches, avg(f.woba_value) AS woba
+            FROM snowflake_fact_pitch f
+            JOIN snowflake_dim_player b ON f.player_key_batter = b.player_key
+            GROUP BY ALL
+        """,
+        "obt": """
+            SELECT batter_full_name AS full_name, p_throws, count(*) AS pitches,
+                   avg(woba_value) AS woba
+            FROM one_big_table
+            GROUP BY ALL
+        """,
+    },
+}
+
+# Pitch-grain tables replicated to scale the data; dimensions keep their size
+FACT_TABLES = ["star_fact_pitch", "snowflake_fact_pitch", "one_big_table"]
+
+PERCENTILES = [50, 90, 99]
+
+
+def scale_facts(conn: DuckDBPyConnection, factor: int, tables: Sequence[str] = FACT_TABLES):
+    """
+    Replicate the fact rows ``factor`` times.
+
+    Copies keep their dimension keys, so joins behave as on a larger sample
+    of the same games and players.
+    """
+    if factor <= 1:
+        return
+    for table in tables:
+        # A view OBT grows with the star facts it reads
+        if relation_type(conn, table) != "BASE TABLE":
+            continue
+        scaled = quote(f"{table}_scaled")
+        conn.execute(
+            f"CREATE TABLE {scaled} AS SELECT t.* FROM {quote(table)} t CROSS JOIN range({int(factor)})"
+        )
+        conn.execute(f"DROP TABLE {quote(table)}")
+        conn.execute(f"ALTER TABLE {scaled} RENAME TO {quote(table)}")
+
+
+def time_query(conn: DuckDBPyConnection, sql: str, warmup: int, repeat: int) -> Dict:
+    """Latency statistics in milliseconds over ``repeat`` runs after ``warmup`` runs."""
+    for _ in range(warmup):
+        conn.execute(sql).fetchall()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(sql).fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    stats = {f"p{q}_ms": float(np.percentile(latencies, q)) for q in PERCENTILES}
+    stats.update(
+        min_ms=min(latencies),
+        mean_ms=float(np.mean(latencies)),
+        result_rows=len(result),
+    )
+    return stats
+
+
+def profile_query(conn: DuckDBPyConnection, sql: str, profile_path: str) -> Dict:
+    """
+    Rows scanned, CPU time and peak buffer memory from DuckDB's profiler.
+
+    DuckDB's total_bytes_read only counts reads of external files, so it is
+    zero for the tables loaded here and is not reported.
+    """
+    conn.execute("SET enable_profiling = 'json'")
+    conn.execute(f"SET profiling_output = {literal(profile_path)}")
+    try:
+        conn.execute(sql).fetchall()
+    finally:
+        conn.execute("PRAGMA disable_profiling")
+    with open(profile_path, encoding="utf-8") as f:
+        profile = json.load(f)
+    os.remove(profile_path)
+    return {
+        "rows_scanned": profile.get("cumulative_rows_scanned"),
+        "cpu_time_ms": profile.get("cpu_time", 0) * 1000,
+        "peak_buffer_memory": profile.get("system_peak_buffer_memory"),
+    }
+
+
+def run_benchmark(
+    processed_dir: str = os.path.join("data", "processed"),
+    scales: Sequence[int] = (1, 10, 100),
+    queries: Optional[List[str]] = None,
+    models: Sequence[str] = ("star", "snowflake", "obt"),
+    warmup: int = 2,
+    repeat: int = 10,
+    threads: Optional[int] = None,
+    work_dir: str = os.path.join("data", "benchmarks"),
+) -> Dict:
+    """
+    Run the query catalogue against every model at each scale factor.
+
+    Each scale gets a fresh DuckDB database loaded from the pipeline outputs
+    with the fact tables replicated, so runs don't share caches.
+
+    Args:
+        processed_dir: Pipeline output directory to load
+        scales: Fact table multipliers
+        queries: Names from QUERIES to run (default: all)
+        models: Models to compare
+        warmup: Untimed runs before measuring
+        repeat: Timed runs per query
+        threads: DuckDB worker threads, defaults to one per core
+        work_dir: Where the scratch databases live
+
+    Returns:
+        Report with one result per scale, query and model
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    for scale in scales:
+        db_path = os.path.join(work_dir, f"bench_{scale}x.duckdb")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        load_models(db_path, processed_dir, mode="table", threads=threads)
+
+        conn = connect(db_path)
+        try:
+            if threads:
+                conn.execute(f"SET threads = {int(threads)}")
+            scale_facts(conn, scale)
+            fact_rows = {
+                table: conn.execute(f"SELECT count(*) FROM {quote(table)}").fetchone()[0]
+                for table in FACT_TABLES
+            }
+            logger.info(f"Scale {scale}x: {fact_rows}")
+
+            for name in queries or QUERIES:
+                for model in models:
+                    sql = QUERIES[name][model]
+                    result = {"scale": scale, "query": name, "model": model}
+                    result.update(time_query(conn, sql, warmup, repeat))
+                    result.update(
+                        profile_query(conn, sql, os.path.join(work_dir, "profile.json"))
+                    )
+                    results.append(result)
+                    logger.info(
+                        f"{scale}x {name} [{model}]: p50 {result['p50_ms']:.2f}ms, "
+                        f"p99 {result['p99_ms']:.2f}ms"
+                    )
+        finally:
+            conn.close()
+            os.remove(db_path)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "processed_dir": processed_dir,
+        "warmup": warmup,
+        "repeat": repeat,
+        "threads": threads,
+        "results": results,
+    }
+
+
+def used_bytes(conn: DuckDBPyConnection) -> int:
+    """Bytes of the database file in use after a checkpoint, ignoring freed blocks."""
+    conn.execute("CHECKPOINT")
+    return conn.execute("SELECT used_blocks * block_size FROM pragma_database_size()").fetchone()[0]
+
+
+def run_obt_benchmark(
+    processed_dir: str = os.path.join("data", "processed"),
+    policies: Sequence[str] = OBT_MATERIALIZATIONS,
+    hot_columns: Optional[List[str]] = None,
+    scales: Sequence[int] = (1, 10, 100),
+    queries: Optional[List[str]] = None,
+    warmup: int = 2,
+    repeat: int = 10,
+    threads: Optional[int] = None,
+    work_dir: str = os.path.join("data", "benchmarks"),
+) -> Dict:
+    """
+    Compare OBT materialization policies on storage and query latency.
+
+    For every scale a star-only database is loaded as the storage baseline,
+    then one database per policy: the full OBT table, a view over the star
+    tables, and a table of the hot columns. The OBT variants of the query
+    catalogue run against each. Needs a full OBT in the pipeline outputs.
+
+    Args:
+        processed_dir: Pipeline output directory to load
+        policies: OBT materializations to compare
+        hot_columns: Columns of the partial OBT, defaults to obt.hot_columns
+        scales: Fact table multipliers
+        queries: Names from QUERIES to run (default: all)
+        warmup: Untimed runs before measuring
+        repeat: Timed runs per query
+        threads: DuckDB worker threads, defaults to one per core
+        work_dir: Where the scratch databases live
+
+    Returns:
+        Report with the OBT storage and query results per scale and policy
+    """
+    hot_columns = hot_columns or obt_policy()["hot_columns"]
+    os.makedirs(work_dir, exist_ok=True)
+    storage, results = [], []
+    for scale in scales:
+        baseline = None
+        for policy in ("star",) + tuple(policies):
+            db_path = os.path.join(work_dir, f"bench_obt_{policy}_{scale}x.duckdb")
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            if policy == "star":
+                load_models(db_path, processed_dir, models=["star"], threads=threads)
+            else:
+                load_models(
+                    db_path,
+                    processed_dir,
+                    models=["star", "obt"],
+                    threads=threads,
+                    obt={"materialization": policy, "hot_columns": hot_columns},
+                )
+
+            conn = connect(db_path)
+            try:
+                if threads:
+                    conn.execute(f"SET threads = {int(threads)}")
+                scale_facts(conn, scale, ["star_fact_pitch", "one_big_table"])
+                database_bytes = used_bytes(conn)
+                if policy == "star":
+                    baseline = database_bytes
+                    continue
+                storage.append(
+                    {
+                        "scale": scale,
+                        "policy": policy,
+                        "database_bytes": database_bytes,
+                        "obt_bytes": database_bytes - baseline,
+                        "obt_columns": len(conn.execute("DESCRIBE one_big_table").fetchall()),
+                    }
+                )
+                logger.info(f"Scale {scale}x, OBT {policy}: {database_bytes - baseline} bytes")
+
+                for name in queries or QUERIES:
+                    sql = QUERIES[name]["obt"]
+                    result = {"scale": scale, "query": name, "policy": policy}
+                    result.update(time_query(conn, sql, warmup, repeat))
+                    result.update(
+                        profile_query(conn, sql, os.path.join(work_dir, "profile.json"))
+                    )
+                    results.append(result)
+                    logger.info(
+                        f"{scale}x {name} [obt {policy}]: p50 {result['p50_ms']:.2f}ms, "
+                        f"p99 {result['p99_ms']:.2f}ms"
+                    )
+            finally:
+                conn.close()
+                os.remove(db_path)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "processed_dir": processed_dir,
+        "warmup": warmup,
+        "repeat": repeat,
+        "threads": threads,
+        "hot_columns": hot_columns,
+        "storage": storage,
+        "results": results,
+    }
+
+
+def obt_markdown_report(report: Dict) -> str:
+    """Render an OBT policy report as storage and latency tables per scale."""
+    lines = [
+        "# OBT materialization benchmark",
+        "",
+        f"{report['created_at']}, {report['repeat']} runs after {report['warmup']} warmup runs, "
+        f"{len(report['hot_columns'])} hot columns.",
+    ]
+    for scale in sorted({row["scale"] for row in report["storage"]}):
+        lines += [
+            "",
+            f"## {scale}x",
+            "",
+            "| policy | columns | OBT MB | database MB |",
+            "|---|---:|---:|---:|",
+        ]
+        for row in report["storage"]:
+            if row["scale"] == scale:
+                lines.append(
+                    f"| {row['policy']} | {row['obt_columns']} | {row['obt_bytes'] / 1e6:.1f} "
+                    f"| {row['database_bytes'] / 1e6:.1f} |"
+                )
+        lines += [
+            "",
+            "| query | policy | p50 ms | p99 ms | CPU ms | peak MB |",
+            "|---|---|---:|---:|---:|---:|",
+        ]
+        for result in report["results"]:
+            if result["scale"] == scale:
+                lines.append(
+                    f"| {result['query']} | {result['policy']} "
+                    f"| {result['p50_ms']:.2f} | {result['p99_ms']:.2f} "
+                    f"| {result['cpu_time_ms']:.2f} "
+                    f"| {(result['peak_buffer_memory'] or 0) / 1e6:.1f} |"
+                )
+    return "\n".join(lines) + "\n"
+
+
+def markdown_report(report: Dict) -> str:
+    """Render a benchmark report as a Markdown table per scale."""
+    lines = [
+        "# Query benchmark",
+        "",
+        f"{report['created_at']}, {report['repeat']} runs after {report['warmup']} warmup runs.",
+    ]
+    for scale in sorted({result["scale"] for result in report["results"]}):
+        lines += [
+            "",
+            f"## {scale}x",
+            "",
+            "| query | model | p50 ms | p90 ms | p99 ms | CPU ms | rows scanned | peak MB |",
+            "|---|---|---:|---:|---:|---:|---:|---:|",
+        ]
+        for result in report["results"]:
+            if result["scale"] != scale:
+                continue
+            lines.append(
+                f"| {result['query']} | {result['model']} "
+                f"| {result['p50_ms']:.2f} | {result['p90_ms']:.2f} | {result['p99_ms']:.2f} "
+                f"| {result['cpu_time_ms']:.2f} | {result['rows_scanned']} "
+                f"| {(result['peak_buffer_memory'] or 0) / 1e6:.1f} |"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report: Dict, output_dir: str, name: str = "query_benchmark") -> List[Path]:
+    """Write the report as {name}.json and {name}.md."""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    json_path = output_path / f"{name}.json"
+    markdown_path = output_path / f"{name}.md"
+    render = obt_markdown_report if "storage" in report else markdown_report
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(render(report))
+    return [json_path, markdown_path]
+
+
+def main():
+    """Benchmark the star, snowflake and OBT models."""
+    parser = argparse.ArgumentParser(description="Benchmark analytic queries per model")
+    parser.add_argument(
+        "--processed-dir",
+        default=os.path.join("data", "processed"),
+        help="Pipeline output directory",
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 10, 100], help="Fact table multipliers"
+    )
+    parser.add_argument(
+        "--queries", nargs="*", choices=sorted(QUERIES), help="Queries to run (default: all)"
+    )
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per query")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query")
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads")
+    parser.add_argument(
+        "--obt-policies",
+        nargs="+",
+        choices=list(OBT_MATERIALIZATIONS),
+        help="Compare these OBT materializations instead of the three models",
+    )
+    parser.add_argument(
+        "--output-dir", default=os.path.join("data", "benchmarks"), help="Report directory"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.obt_policies:
+        report = run_obt_benchmark(
+            args.processed_dir,
+            args.obt_policies,
+            scales=args.scales,
+            queries=args.queries,
+            warmup=args.warmup,
+            repeat=args.repeat,
+            threads=args.threads,
+            work_dir=args.output_dir,
+        )
+        for path in write_report(report, args.output_dir, "obt_benchmark"):
+            logger.info(f"Report written to {path}")
+        return
+
+    report = run_benchmark(
+        args.processed_dir,
+        args.scales,
+        args.queries,
+        warmup=args.warmup,
+        repeat=args.repeat,
+        threads=args.threads,
+        work_dir=args.output_dir,
+    )
+    for path in write_report(report, args.output_dir):
+        logger.info(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
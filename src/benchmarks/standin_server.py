@@ -0,0 +1,171 @@
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from io_utlis.raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+PEOPLE_PATH = re.compile(r"/people(?:/(\d+))?/?$")
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Baseball Savant CSV export and the MLB people API.
+
+    Serves a pipeline data directory, typically one written by
+    ``benchmarks.synthetic_statcast``: pitches come from its raw Statcast
+    partitions and players from its raw player responses. Savant exports
+    are filtered like the real endpoint with ``player_type=pitcher``, by
+    game date range and by the pitching team::
+
+        GET /statcast_search/csv?game_date_gt=2024-04-01&game_date_lt=2024-04-01&team=TOR
+        GET /api/v1/people/660271
+        GET /api/v1/people?personIds=660271,592450
+
+    Point the pipeline at it through :meth:`api_config`, e.g. to record an
+    archive for replay runs without touching the real services. ``latency``
+    delays every response, to compare execution modes under realistic
+    network waits.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        data_dir: str = os.path.join("data", "synthetic"),
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.raw_store = RawStore(os.path.join(data_dir, "raw"))
+        self.people = self.load_people()
+        if not self.raw_store.statcast_dates():
+            logger.warning(f"No Statcast partitions under {self.raw_store.statcast_dir}, run `make synthetic` first")
+        super().__init__((host, port), StandinHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def api_config(self) -> Dict[str, str]:
+        """The ``api`` section of config.yaml that targets this server."""
+        return {
+            "baseball_savant_url": f"{self.base_url}/statcast_search/csv",
+            "mlb_api_base_url": f"{self.base_url}/api/v1",
+        }
+
+    def load_people(self) -> Dict[int, Dict]:
+        """Latest stored payload of every player, by player ID."""
+        people = {}
+        # Fetch dates are read in order, so later snapshots win
+        for record in self.raw_store.read_player_responses():
+            for person in record.get("response", {}).get("people", []):
+                people[int(person["id"])] = person
+        logger.info(f"Serving {len(people)} players")
+        return people
+
+    def savant_csv(self, params: Dict[str, str]) -> bytes:
+        """
+        Statcast export for a date range and team filter.
+
+        Args:
+            params: Savant query; game_date_gt and game_date_lt bound the
+                game dates (inclusive), team is a "|"-separated list of
+                pitching teams, empty for the whole league
+
+        Returns:
+            CSV bytes, empty when no games were played
+        """
+        pitches = self.raw_store.read_statcast(
+            params.get("game_date_gt") or None, params.get("game_date_lt") or None
+        )
+        if pitches.empty:
+            return b""
+        teams = [team for team in params.get("team", "").split("|") if team]
+        if teams:
+            top = (pitches["inning_topbot"] == "Top").to_numpy()
+            pitching = np.where(top, pitches["home_team"].astype(str), pitches["away_team"].astype(str))
+            pitches = pitches[np.isin(pitching, teams)]
+        return pitches.to_csv(index=False).encode("utf-8")
+
+    def find_people(self, player_ids: List[int]) -> List[Dict]:
+        """Payloads of the known players among ``player_ids``, unknown IDs are skipped."""
+        return [self.people[player_id] for player_id in player_ids if player_id in self.people]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server: StandinServer
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+
+        if url.path.endswith("/statcast_search/csv"):
+            self._send(200, "text/csv; charset=utf-8", self.server.savant_csv(params))
+            return
+
+        match = PEOPLE_PATH.search(url.path)
+        if match:
+            if match.group(1):
+                player_ids = [int(match.group(1))]
+            else:
+                player_ids = [int(p) for p in params.get("personIds", "").split(",") if p.strip()]
+            people = self.server.find_people(player_ids)
+            status = 404 if match.group(1) and not people else 200
+            self._send(status, "application/json", json.dumps({"people": people}).encode("utf-8"))
+            return
+
+        self._send(404, "application/json", json.dumps({"message": f"Unknown path {url.path}"}).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve(data_dir: str, host: str = "127.0.0.1", port: int = 8765, latency: float = 0.0):
+    """Serve a data directory until interrupted."""
+    with StandinServer(data_dir, host, port, latency) as server:
+        logger.info(f"Stand-in API listening on {server.base_url}")
+        logger.info(f"Use it with this api section in config.yaml: {server.api_config()}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main():
+    """Serve synthetic data as stand-in Savant and MLB API endpoints."""
+    parser = argparse.ArgumentParser(description="Local stand-in for Baseball Savant and the MLB people API")
+    parser.add_argument(
+        "--data-dir", default=os.path.join("data", "synthetic"), help="Pipeline data directory to serve"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (0 picks a free one)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every response")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(args.data_dir, args.host, args.port, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,707 @@
+import argparse
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from config import load_config
+from etl.player_cache import PlayerCache
+from etl.players_client import PlayersClient
+from etl.statcast_schema import (
+    DERIVED_COLUMNS,
+    downcast_floats,
+    parse_dbml_columns,
+    statcast_dtypes,
+)
+from io_utlis.raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+# Raw store part the generated pitches are written to
+PART_NAME = "statcast_synthetic"
+
+# (code, name, mean release speed, mean spin rate, league usage)
+PITCH_TYPES = [
+    ("FF", "4-Seam Fastball", 94.2, 2290, 0.32),
+    ("SI", "Sinker", 93.4, 2150, 0.15),
+    ("FC", "Cutter", 89.3, 2380, 0.08),
+    ("SL", "Slider", 85.6, 2420, 0.15),
+    ("ST", "Sweeper", 81.9, 2580, 0.06),
+    ("CU", "Curveball", 79.4, 2560, 0.09),
+    ("CH", "Changeup", 85.9, 1760, 0.11),
+    ("FS", "Split-Finger", 86.4, 1350, 0.04),
+]
+
+# Plate appearance outcomes (the events column of the last pitch) and their share
+PA_RESULTS = {
+    "field_out": 0.405,
+    "strikeout": 0.225,
+    "single": 0.14,
+    "walk": 0.085,
+    "double": 0.045,
+    "home_run": 0.031,
+    "grounded_into_double_play": 0.017,
+    "force_out": 0.015,
+    "hit_by_pitch": 0.011,
+    "field_error": 0.007,
+    "sac_fly": 0.006,
+    "fielders_choice": 0.004,
+    "triple": 0.004,
+}
+IN_PLAY = {"field_out", "single", "double", "home_run", "grounded_into_double_play",
+           "force_out", "field_error", "sac_fly", "fielders_choice", "triple"}
+WOBA_WEIGHTS = {"walk": 0.69, "hit_by_pitch": 0.72, "single": 0.88, "double": 1.25,
+                "triple": 1.58, "home_run": 2.03}
+ISO_VALUES = {"double": 1, "triple": 2, "home_run": 3}
+# Expected runs scored on each outcome, on top of the batter's own home run
+RUN_RATES = {"home_run": 0.6, "triple": 0.9, "double": 0.6, "single": 0.3,
+             "sac_fly": 1.0, "walk": 0.05, "hit_by_pitch": 0.05, "field_error": 0.3}
+
+POSITIONS = [
+    ("2", "Catcher", "C"),
+    ("3", "First Base", "1B"),
+    ("4", "Second Base", "2B"),
+    ("5", "Third Base", "3B"),
+    ("6", "Shortstop", "SS"),
+    ("7", "Outfielder", "LF"),
+    ("8", "Outfielder", "CF"),
+    ("9", "Outfielder", "RF"),
+    ("10", "Designated Hitter", "DH"),
+]
+
+# (country, [(city, state or province)], share of players)
+BIRTH_PLACES = [
+    ("USA", [("San Diego", "CA"), ("Houston", "TX"), ("Miami", "FL"), ("Atlanta", "GA"),
+             ("Phoenix", "AZ"), ("Chicago", "IL"), ("Sacramento", "CA"), ("Tampa", "FL")], 0.70),
+    ("Dominican Republic", [("Santo Domingo", None), ("San Pedro de Macoris", None),
+                            ("Bani", None)], 0.11),
+    ("Venezuela", [("Caracas", None), ("Maracaibo", None), ("Valencia", None)], 0.07),
+    ("Cuba", [("Havana", None), ("Cienfuegos", None)], 0.03),
+    ("Puerto Rico", [("San Juan", None), ("Bayamon", None)], 0.03),
+    ("Mexico", [("Hermosillo", "SO"), ("Culiacan", "SI")], 0.02),
+    ("Canada", [("Toronto", "ON"), ("Vancouver", "BC")], 0.02),
+    ("Japan", [("Osaka", None), ("Tokyo", None)], 0.02),
+]
+
+FIRST_NAMES = [
+    "Aaron", "Alex", "Andres", "Blake", "Bo", "Carlos", "Chris", "Cody", "Dylan", "Eduardo",
+    "Felix", "Gabriel", "Hunter", "Jack", "Jacob", "Jose", "Josh", "Juan", "Julio", "Kyle",
+    "Luis", "Marcus", "Matt", "Michael", "Nick", "Pablo", "Rafael", "Ryan", "Shohei", "Tyler",
+    "Vladimir", "Will", "Yoshinobu", "Zack",
+]
+LAST_NAMES = [
+    "Alvarez", "Betts", "Bichette", "Burnes", "Castillo", "Cole", "Diaz", "Freeman", "Garcia",
+    "Gausman", "Gonzalez", "Guerrero", "Harper", "Hernandez", "Judge", "Kirk", "Lindor",
+    "Lopez", "Machado", "Martinez", "Ohtani", "Perez", "Ramirez", "Rodriguez", "Santana",
+    "Seager", "Smith", "Soto", "Springer", "Suarez", "Tatis", "Turner", "Valdez", "Wheeler",
+    "Williams", "Yamamoto",
+]
+
+
+def _cumcount(groups: np.ndarray) -> np.ndarray:
+    """Position of each element within its run of equal consecutive group ids."""
+    index = np.arange(len(groups))
+    starts = np.r_[True, groups[1:] != groups[:-1]]
+    return index - np.maximum.accumulate(np.where(starts, index, 0))
+
+
+def _isin(values: np.ndarray, options) -> np.ndarray:
+    """np.isin for object arrays holding None."""
+    return pd.Series(values).isin(list(options)).to_numpy()
+
+
+def _before_in_group(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Running total of ``values`` within each group, excluding the current element."""
+    return pd.Series(values).groupby(groups).cumsum().to_numpy() - values
+
+
+class SyntheticLeague:
+    """
+    Seeded generator of Statcast-shaped pitches and MLB API player payloads.
+
+    Each team carries a roster of pitchers and position players; rosters turn
+    over between seasons through trades, call-ups and retirements, and
+    players' weights drift, so successive player snapshots differ the way the
+    real API's do. Pitchers have their own repertoire, velocity and arm side,
+    which drive pitch_type, release_speed and p_throws. Outcome columns
+    (launch data, batted ball type, wOBA values, events) are only filled on
+    the pitches where Statcast fills them, giving realistic null rates.
+    """
+
+    def __init__(
+        self,
+        teams: Sequence[str],
+        seed: int = 0,
+        pitchers_per_team: int = 13,
+        hitters_per_team: int = 13,
+        turnover: float = 0.15,
+    ):
+        self.teams = list(teams)
+        self.rng = np.random.default_rng(seed)
+        self.pitchers_per_team = pitchers_per_team
+        self.hitters_per_team = hitters_per_team
+        self.turnover = turnover
+
+        self.people: Dict[int, Dict] = {}
+        self.traits: Dict[int, Dict] = {}
+        self.next_player_id = 400001
+        self.next_game_pk = 700001
+        self.rosters = {
+            team: {
+                "pitchers": [self.new_player(pitcher=True) for _ in range(pitchers_per_team)],
+                "hitters": [self.new_player(pitcher=False) for _ in range(hitters_per_team)],
+            }
+            for team in self.teams
+        }
+
+    def new_player(self, pitcher: bool, debut: Optional[str] = None) -> int:
+        """Create a player with an MLB API payload and pitching traits; returns the ID."""
+        rng = self.rng
+        player_id = self.next_player_id
+        self.next_player_id += 1
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        country_index = rng.choice(len(BIRTH_PLACES), p=[p[2] for p in BIRTH_PLACES])
+        country, places, _ = BIRTH_PLACES[country_index]
+        city, province = places[rng.integers(len(places))]
+        birth = date(int(rng.integers(1985, 2003)), int(rng.integers(1, 13)), int(rng.integers(1, 29)))
+        inches = int(np.clip(rng.normal(74, 2.2), 66, 83))
+        throws = "L" if rng.random() < (0.28 if pitcher else 0.12) else "R"
+        bats = rng.choice(["R", "L", "S"], p=[0.55, 0.37, 0.08]) if not pitcher else throws
+        hand = {"R": "Right", "L": "Left", "S": "Switch"}
+        code, name, abbreviation = (
+            ("1", "Pitcher", "P") if pitcher else POSITIONS[rng.integers(len(POSITIONS))]
+        )
+
+        person = {
+            "id": player_id,
+            "fullName": f"{first} {last}",
+            "firstName": str(first),
+            "lastName": str(last),
+            "birthDate": birth.isoformat(),
+            "birthCity": city,
+            "birthCountry": country,
+            "height": f"{inches // 12}' {inches % 12}\"",
+            "weight": int(np.clip(rng.normal(210 if pitcher else 200, 18), 160, 290)),
+            "active": True,
+            "primaryPosition": {"code": code, "name": name, "abbreviation": abbreviation},
+            "batSide": {"code": str(bats), "description": hand[str(bats)]},
+            "pitchHand": {"code": throws, "description": hand[throws]},
+        }
+        # Optional fields are missing from real payloads at similar rates
+        if province is not None:
+            person["birthStateProvince"] = province
+        if rng.random() < 0.9:
+            person["primaryNumber"] = str(rng.integers(0, 100))
+        if debut is not None or rng.random() < 0.95:
+            person["mlbDebutDate"] = debut or date(
+                max(birth.year + 20, 2010), int(rng.integers(4, 10)), int(rng.integers(1, 29))
+            ).isoformat()
+        self.people[player_id] = person
+
+        usage = np.array([p[4] for p in PITCH_TYPES])
+        dropped = rng.choice(len(PITCH_TYPES), size=rng.integers(3, 6), replace=False)
+        usage[dropped] = 0
+        if not usage.any():
+            usage[0] = 1
+        repertoire = rng.dirichlet(usage * 20 + 1e-9) * (usage > 0)
+        self.traits[player_id] = {
+            "repertoire": repertoire / repertoire.sum(),
+            "velocity": rng.normal(0, 1.6),
+            "arm_angle": rng.normal(42, 12),
+        }
+        return player_id
+
+    def new_season(self, season: int, season_start: str):
+        """Turn rosters over: trade some players, call others up, retire the rest."""
+        rng = self.rng
+        for role, size in (("pitchers", self.pitchers_per_team), ("hitters", self.hitters_per_team)):
+            moving = []
+            for team in self.teams:
+                roster = self.rosters[team][role]
+                for index in rng.choice(size, size=int(round(size * self.turnover)), replace=False):
+                    moving.append((team, index, roster[index]))
+            players = [player_id for _, _, player_id in moving]
+            rng.shuffle(players)
+            for (team, index, _), player_id in zip(moving, players):
+                if rng.random() < 0.4:
+                    self.people[player_id]["active"] = False
+                    player_id = self.new_player(role == "pitchers", debut=f"{season}-{season_start}")
+                self.rosters[team][role][index] = player_id
+
+        for person in self.people.values():
+            if rng.random() < 0.3:
+                person["weight"] = int(person["weight"] + rng.integers(-6, 7))
+
+    def schedule(
+        self, season: int, season_start: str, season_end: str, games_per_team: int
+    ) -> List[Tuple[str, str, str]]:
+        """(game_date, home team, away team) of every game of a season, in date order."""
+        first = date.fromisoformat(f"{season}-{season_start}")
+        last = date.fromisoformat(f"{season}-{season_end}")
+        days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+        total_games = len(self.teams) * games_per_team // 2
+        max_per_day = len(self.teams) // 2
+
+        games_per_day = np.full(len(days), total_games // len(days))
+        games_per_day[self.rng.choice(len(days), total_games % len(days), replace=False)] += 1
+        if games_per_day.max() > max_per_day:
+            logger.warning(
+                f"{games_per_team} games per team don't fit between {first} and {last}; "
+                f"capping at {max_per_day} games a day"
+            )
+            games_per_day = np.minimum(games_per_day, max_per_day)
+
+        schedule = []
+        for day, count in zip(days, games_per_day):
+            if count == 0:
+                continue
+            teams = list(self.rng.permutation(self.teams))
+            schedule.extend((day.isoformat(), teams[2 * i], teams[2 * i + 1]) for i in range(count))
+        return schedule
+
+    def player_arrays(self, player_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized lookup of the player attributes the pitch columns depend on."""
+        ids = pd.unique(player_ids)
+        people = [self.people[int(player_id)] for player_id in ids]
+        traits = [self.traits[int(player_id)] for player_id in ids]
+        index = pd.Index(ids).get_indexer(player_ids)
+        return {
+            "name": np.array([f"{p['lastName']}, {p['firstName']}" for p in people])[index],
+            "full_name": np.array([p["fullName"] for p in people])[index],
+            "throws": np.array([p["pitchHand"]["code"] for p in people])[index],
+            "bats": np.array([p["batSide"]["code"] for p in people])[index],
+            "birth_year": np.array([int(p["birthDate"][:4]) for p in people])[index],
+            "repertoire": np.cumsum([t["repertoire"] for t in traits], axis=1)[index],
+            "velocity": np.array([t["velocity"] for t in traits])[index],
+            "arm_angle": np.array([t["arm_angle"] for t in traits])[index],
+        }
+
+    def play(self, schedule: List[Tuple[str, str, str]]) -> pd.DataFrame:
+        """
+        Pitches of a batch of games.
+
+        Args:
+            schedule: (game_date, home team, away team) per game
+
+        Returns:
+            DataFrame with the raw Statcast columns and dtypes
+        """
+        rng = self.rng
+        games = len(schedule)
+        game_pks = np.arange(self.next_game_pk, self.next_game_pk + games)
+        self.next_game_pk += games
+
+        # Per game and side (0 = away, 1 = home): lineup, starter and bullpen by inning
+        lineups = np.empty((games, 2, 9), dtype=np.int64)
+        starters = np.empty((games, 2), dtype=np.int64)
+        relievers = np.empty((games, 2, 10), dtype=np.int64)
+        for game, (_, home, away) in enumerate(schedule):
+            for side, team in enumerate((away, home)):
+                roster = self.rosters[team]
+                lineups[game, side] = rng.choice(roster["hitters"], 9, replace=False)
+                rotation = roster["pitchers"][:5]
+                starters[game, side] = rotation[rng.integers(len(rotation))]
+                relievers[game, side] = rng.choice(roster["pitchers"][5:], 10)
+        starter_innings = rng.integers(5, 8, size=(games, 2))
+
+        # Plate appearances: 18 half-innings per game, home team batting in the bottom
+        halves = np.arange(games * 18)
+        half_game, half_number = halves // 18, halves % 18
+        pa_half = np.repeat(halves, 3 + rng.poisson(1.2, len(halves)))
+        pa_game = half_game[pa_half]
+        inning = half_number[pa_half] // 2 + 1
+        bat_side = half_number[pa_half] % 2
+        field_side = 1 - bat_side
+        side_key = pa_game * 2 + bat_side
+        order_slot = pd.Series(side_key).groupby(side_key).cumcount().to_numpy()
+
+        batter = lineups[pa_game, bat_side, order_slot % 9]
+        pitcher = np.where(
+            inning <= starter_innings[pa_game, field_side],
+            starters[pa_game, field_side],
+            relievers[pa_game, field_side, np.minimum(inning, 9)],
+        )
+        results = np.array(list(PA_RESULTS))
+        shares = np.array(list(PA_RESULTS.values()))
+        result = rng.choice(results, size=len(pa_half), p=shares / shares.sum())
+        min_pitches = np.select([result == "strikeout", result == "walk"], [3, 4], 1)
+        pitches_per_pa = np.clip(rng.geometric(0.3, len(pa_half)), min_pitches, 12)
+
+        runs = rng.poisson([RUN_RATES.get(r, 0) for r in result]) + (result == "home_run")
+        home_runs_before = _before_in_group(runs * bat_side, pa_game)
+        away_runs_before = _before_in_group(runs * field_side, pa_game)
+
+        # Pitches
+        pa = np.repeat(np.arange(len(pa_half)), pitches_per_pa)
+        n = len(pa)
+        pitch_number = _cumcount(pa) + 1
+        last = pitch_number == pitches_per_pa[pa]
+        event = np.where(last, result[pa], None)
+        in_play = last & _isin(event, IN_PLAY)
+
+        pitch_type_code = np.where(rng.random(n) < 0.45, "B", "S")
+        pitch_type_code = np.select(
+            [in_play, last & (event == "strikeout"), last & _isin(event, ["walk", "hit_by_pitch"])],
+            ["X", "S", "B"],
+            pitch_type_code,
+        )
+        description = np.select(
+            [
+                in_play,
+                event == "hit_by_pitch",
+                last & (event == "walk"),
+                last & (event == "strikeout"),
+                pitch_type_code == "B",
+            ],
+            [
+                "hit_into_play",
+                "hit_by_pitch",
+                "ball",
+                rng.choice(["swinging_strike", "called_strike"], n, p=[0.7, 0.3]),
+                rng.choice(["ball", "blocked_ball"], n, p=[0.96, 0.04]),
+            ],
+            rng.choice(["called_strike", "swinging_strike", "foul"], n, p=[0.33, 0.2, 0.47]),
+        )
+        swing = _isin(description, ["swinging_strike", "foul", "hit_into_play"])
+        balls = np.minimum(_before_in_group((pitch_type_code == "B").astype(int), pa), 3)
+        strikes = np.minimum(_before_in_group((pitch_type_code == "S").astype(int), pa), 2)
+
+        game = pa_game[pa]
+        pitchers = self.player_arrays(pitcher[pa])
+        batters = self.player_arrays(batter[pa])
+        arm = np.where(pitchers["throws"] == "L", 1.0, -1.0)
+
+        type_index = np.minimum(
+            (rng.random(n)[:, None] > pitchers["repertoire"]).sum(axis=1), len(PITCH_TYPES) - 1
+        )
+        speed = np.array([p[2] for p in PITCH_TYPES])[type_index] + pitchers["velocity"]
+        release_speed = np.round(speed + rng.normal(0, 0.9, n), 1)
+        release_speed[rng.random(n) < 0.003] = np.nan
+        spin = np.array([p[3] for p in PITCH_TYPES])[type_index] + rng.normal(0, 120, n)
+
+        plate_x = np.round(rng.normal(0, 0.85, n), 2)
+        plate_z = np.round(rng.normal(2.35, 0.95, n), 2)
+        in_zone = (np.abs(plate_x) < 0.83) & (plate_z > 1.5) & (plate_z < 3.5)
+        zone_column = np.clip(((plate_x + 0.83) / (1.66 / 3)).astype(int), 0, 2)
+        zone_row = np.clip(((3.5 - plate_z) / (2 / 3)).astype(int), 0, 2)
+        zone = np.where(
+            in_zone, zone_row * 3 + zone_column + 1, 11 + (plate_x > 0) + 2 * (plate_z < 2.5)
+        )
+
+        home_run = event == "home_run"
+        launch_speed = np.where(home_run, rng.normal(104, 4, n), np.clip(rng.normal(88, 14, n), 30, 118))
+        launch_angle = np.where(home_run, rng.normal(28, 5, n), rng.normal(12, 26, n))
+        tracked = in_play & (rng.random(n) > 0.02)
+        distance = np.clip(launch_speed * 2.6 + launch_angle * 2, 0, 470)
+        bb_type = np.select(
+            [launch_angle < 10, launch_angle < 25, launch_angle < 50],
+            ["ground_ball", "line_drive", "fly_ball"],
+            "popup",
+        )
+
+        def when(mask, values, decimals=2):
+            return np.where(mask, np.round(values, decimals), np.nan)
+
+        bat_home = bat_side[pa] == 1
+        home_score = home_runs_before[pa]
+        away_score = away_runs_before[pa]
+        scored = np.where(last, runs[pa], 0)
+        post_home = home_score + np.where(bat_home, scored, 0)
+        post_away = away_score + np.where(bat_home, 0, scored)
+        bat_score = np.where(bat_home, home_score, away_score)
+        fld_score = np.where(bat_home, away_score, home_score)
+        stand = np.where(batters["bats"] == "S", np.where(pitchers["throws"] == "R", "L", "R"), batters["bats"])
+        game_date, home, away = (np.array(column)[game] for column in zip(*schedule))
+        season = np.array([int(day[:4]) for day, _, _ in schedule])[game]
+
+        columns = {
+            "pitch_type": np.array([p[0] for p in PITCH_TYPES])[type_index],
+            "game_date": game_date,
+            "release_speed": release_speed,
+            "release_pos_x": np.round(arm * rng.normal(1.9, 0.5, n), 2),
+            "release_pos_z": np.round(rng.normal(5.8, 0.4, n), 2),
+            "player_name": pitchers["name"],
+            "batter": batter[pa],
+            "pitcher": pitcher[pa],
+            "events": event,
+            "description": description,
+            "zone": zone,
+            "des": np.where(
+                last,
+                pd.Series(batters["full_name"]) + " " + pd.Series(event).str.replace("_", " ") + ".",
+                None,
+            ),
+            "game_type": np.full(n, "R"),
+            "stand": stand,
+            "p_throws": pitchers["throws"],
+            "home_team": home,
+            "away_team": away,
+            "type": pitch_type_code,
+            "hit_location": np.where(in_play & ~home_run, rng.integers(1, 10, n), np.nan),
+            "bb_type": np.where(tracked, bb_type, None),
+            "balls": balls,
+            "strikes": strikes,
+            "game_year": season,
+            "pfx_x": np.round(arm * rng.normal(0.6, 0.5, n), 2),
+            "pfx_z": np.round(rng.normal(0.9, 0.6, n), 2),
+            "plate_x": plate_x,
+            "plate_z": plate_z,
+            "on_3b": np.where(rng.random(n) < 0.1, lineups[game, bat_side[pa], rng.integers(9, size=n)], np.nan),
+            "on_2b": np.where(rng.random(n) < 0.18, lineups[game, bat_side[pa], rng.integers(9, size=n)], np.nan),
+            "on_1b": np.where(rng.random(n) < 0.3, lineups[game, bat_side[pa], rng.integers(9, size=n)], np.nan),
+            "outs_when_up": np.minimum(_cumcount(pa_half)[pa], 2),
+            "inning": inning[pa],
+            "inning_topbot": np.where(bat_home, "Bot", "Top"),
+            "hc_x": when(tracked, rng.normal(125, 40, n)),
+            "hc_y": when(tracked, rng.normal(150, 40, n)),
+            "vx0": np.round(-arm * rng.normal(6, 2, n), 4),
+            "vy0": np.round(-release_speed * 1.467, 4),
+            "vz0": np.round(rng.normal(-4, 2, n), 4),
+            "ax": np.round(arm * rng.normal(6, 6, n), 4),
+            "ay": np.round(rng.normal(28, 3, n), 4),
+            "az": np.round(rng.normal(-22, 8, n), 4),
+            "sz_top": np.round(rng.normal(3.35, 0.12, n), 2),
+            "sz_bot": np.round(rng.normal(1.6, 0.08, n), 2),
+            "hit_distance_sc": when(tracked, distance, 0),
+            "launch_speed": when(tracked, launch_speed, 1),
+            "launch_angle": when(tracked, launch_angle, 0),
+            "effective_speed": np.round(release_speed + rng.normal(0, 1, n), 1),
+            "release_spin_rate": np.where(rng.random(n) < 0.01, np.nan, np.round(spin)),
+            "release_extension": np.round(rng.normal(6.4, 0.4, n), 1),
+            "game_pk": game_pks[game],
+            **{
+                f"fielder_{position}": lineups[game, field_side[pa], position - 2]
+                for position in range(2, 10)
+            },
+            "release_pos_y": np.round(rng.normal(54.1, 0.4, n), 4),
+            "estimated_ba_using_speedangle": when(tracked, rng.beta(2, 4, n), 3),
+            "estimated_woba_using_speedangle": when(tracked, rng.beta(2, 4, n) * 1.3, 3),
+            "woba_value": np.where(last, [WOBA_WEIGHTS.get(e, 0.0) for e in event], np.nan),
+            "woba_denom": np.where(last & (event != "sac_fly"), 1.0, np.nan),
+            "babip_value": np.where(in_play, _isin(event, ["single", "double", "triple"]), np.nan),
+            "iso_value": np.where(last, [ISO_VALUES.get(e, 0) for e in event], np.nan),
+            "launch_speed_angle": np.where(tracked, rng.integers(1, 7, n), np.nan),
+            "at_bat_number": (_cumcount(pa_game) + 1)[pa],
+            "pitch_number": pitch_number,
+            "pitch_name": np.array([p[1] for p in PITCH_TYPES])[type_index],
+            "home_score": home_score,
+            "away_score": away_score,
+            "bat_score": bat_score,
+            "fld_score": fld_score,
+            "post_away_score": post_away,
+            "post_home_score": post_home,
+            "post_bat_score": np.where(bat_home, post_home, post_away),
+            "post_fld_score": np.where(bat_home, post_away, post_home),
+            "if_fielding_alignment": rng.choice(["Standard", "Infield shade", "Strategic"], n, p=[0.7, 0.2, 0.1]),
+            "of_fielding_alignment": rng.choice(["Standard", "Strategic"], n, p=[0.85, 0.15]),
+            "spin_axis": np.round(rng.normal(200, 40, n) % 360),
+            "delta_home_win_exp": np.round(rng.normal(0, 0.02, n), 3),
+            "delta_run_exp": np.round(rng.normal(0, 0.12, n), 3),
+            "bat_speed": when(swing & (rng.random(n) > 0.05), rng.normal(71.5, 5, n), 1),
+            "swing_length": when(swing & (rng.random(n) > 0.05), rng.normal(7.3, 0.5, n), 1),
+            "estimated_slg_using_speedangle": when(tracked, rng.beta(2, 3, n) * 2, 3),
+            "hyper_speed": when(tracked, np.maximum(launch_speed, 88), 1),
+            "home_score_diff": home_score - away_score,
+            "bat_score_diff": bat_score - fld_score,
+            "home_win_exp": np.round(np.clip(rng.normal(0.5, 0.2, n), 0, 1), 3),
+            "age_pit": season - pitchers["birth_year"],
+            "age_bat": season - batters["birth_year"],
+            "age_pit_legacy": season - pitchers["birth_year"],
+            "age_bat_legacy": season - batters["birth_year"],
+            "n_thruorder_pitcher": (order_slot // 9 + 1)[pa],
+            "n_priorpa_thisgame_player_at_bat": (order_slot // 9)[pa],
+            "pitcher_days_since_prev_game": np.where(rng.random(n) < 0.1, np.nan, rng.integers(1, 6, n)),
+            "batter_days_since_prev_game": np.where(rng.random(n) < 0.1, np.nan, rng.integers(1, 3, n)),
+            "api_break_z_with_gravity": np.round(rng.normal(2.2, 0.8, n), 2),
+            "api_break_x_arm": np.round(rng.normal(0.6, 0.5, n), 2),
+            "api_break_x_batter_in": np.round(rng.normal(0, 0.8, n), 2),
+            "arm_angle": np.round(pitchers["arm_angle"] + rng.normal(0, 2, n), 1),
+            "attack_angle": when(swing, rng.normal(10, 8, n), 1),
+            "attack_direction": when(swing, rng.normal(0, 12, n), 1),
+            "swing_path_tilt": when(swing, rng.normal(32, 6, n), 1),
+            "intercept_ball_minus_batter_pos_x_inches": when(swing, rng.normal(30, 6, n), 1),
+            "intercept_ball_minus_batter_pos_y_inches": when(swing, rng.normal(20, 8, n), 1),
+        }
+        columns["bat_win_exp"] = np.where(bat_home, columns["home_win_exp"], 1 - columns["home_win_exp"])
+        columns["delta_pitcher_run_exp"] = -columns["delta_run_exp"]
+        return to_statcast_frame(columns, n)
+
+    def player_snapshot(self) -> List[Dict]:
+        """Current MLB API payloads of every rostered player."""
+        player_ids = sorted(
+            player_id
+            for roster in self.rosters.values()
+            for players in roster.values()
+            for player_id in players
+        )
+        return [dict(self.people[player_id]) for player_id in player_ids]
+
+
+def to_statcast_frame(columns: Dict[str, np.ndarray], rows: int) -> pd.DataFrame:
+    """
+    Arrange generated columns like a parsed Savant export.
+
+    Columns follow the DBML order with the dtypes read_statcast_csv produces;
+    columns the generator doesn't fill are all null, as deprecated ones are
+    in real exports.
+    """
+    frame = {}
+    for column, dtype in statcast_dtypes().items():
+        values = columns.get(column)
+        if dtype == "category":
+            frame[column] = pd.Categorical(values if values is not None else [None] * rows)
+        elif dtype == "Int32":
+            frame[column] = pd.Series(
+                values if values is not None else np.full(rows, np.nan), dtype="float64"
+            ).astype("Int32")
+        elif dtype == "float64":
+            frame[column] = np.asarray(
+                values if values is not None else np.full(rows, np.nan), dtype="float64"
+            )
+        else:
+            frame[column] = pd.array(values if values is not None else [None] * rows, dtype=object)
+    order = [c for c in parse_dbml_columns("fact_pitch") if c not in DERIVED_COLUMNS]
+    return downcast_floats(pd.DataFrame(frame)[order])
+
+
+def write_player_snapshot(
+    raw_store: RawStore,
+    people: List[Dict],
+    fetch_date: str,
+    api_base: str = "https://statsapi.mlb.com/api/v1",
+    batch_size: int = 50,
+) -> int:
+    """Store player payloads as batched /people responses, as PlayersClient does."""
+    with raw_store.player_writer(fetch_date) as writer:
+        for start in range(0, len(people), batch_size):
+            batch = people[start : start + batch_size]
+            player_ids = [person["id"] for person in batch]
+            writer.write(
+                {
+                    "player_ids": player_ids,
+                    "url": f"{api_base}/people?personIds={','.join(map(str, player_ids))}",
+                    "timestamp": f"{fetch_date}T06:00:00",
+                    "response": {"people": batch},
+                }
+            )
+        return writer.count
+
+
+def generate(
+    data_dir: str = os.path.join("data", "synthetic"),
+    seasons: Sequence[int] = (2024,),
+    teams: Optional[Sequence[str]] = None,
+    games_per_team: int = 162,
+    season_start: str = "03-28",
+    season_end: str = "09-29",
+    seed: int = 0,
+    seed_player_cache: bool = True,
+    batch_games: int = 200,
+) -> Dict:
+    """
+    Generate a synthetic league into the raw layout the pipeline reads.
+
+    Pitches land in ``{data_dir}/raw/statcast/game_date=*/statcast_synthetic.parquet``
+    and one player snapshot per season in ``{data_dir}/raw/mlb/``. With
+    ``seed_player_cache`` every generated player is also stored in the player
+    cache, so ``MLBDataPipeline(data_dir).run_pipeline(from_raw=True)`` runs
+    without any network access. A full 30-team season is about 700k pitches.
+
+    Args:
+        data_dir: Pipeline data directory to populate
+        seasons: Seasons to generate
+        teams: Team abbreviations, defaults to the stadiums in config.yaml
+        games_per_team: Games each team plays per season
+        season_start: MM-DD of the first game day
+        season_end: MM-DD of the last game day
+        seed: Random seed; the same arguments always produce the same data
+        seed_player_cache: Store the players in the pipeline's player cache
+        batch_games: Games generated per batch
+
+    Returns:
+        Summary with the date range and pitch, game and player counts
+    """
+    if teams is None:
+        teams = list(load_config().get("data", {}).get("stadiums") or {})
+    league = SyntheticLeague(teams, seed=seed)
+    raw_store = RawStore(os.path.join(data_dir, "raw"))
+
+    pitches = games = 0
+    dates = []
+    for position, season in enumerate(sorted(seasons)):
+        if position:
+            league.new_season(season, season_start)
+        schedule = league.schedule(season, season_start, season_end, games_per_team)
+        # Batches of games amortize the per-frame cost of building and writing
+        for start in range(0, len(schedule), batch_games):
+            batch = schedule[start : start + batch_games]
+            pitch_data = league.play(batch)
+            # One Arrow conversion per batch instead of one per game date
+            raw_store.write_statcast(pa.Table.from_pandas(pitch_data, preserve_index=False), PART_NAME)
+            pitches += len(pitch_data)
+            games += len(batch)
+            dates.extend(sorted({game_date for game_date, _, _ in batch}))
+        snapshot = league.player_snapshot()
+        write_player_snapshot(raw_store, snapshot, dates[-1] if dates else f"{season}-{season_end}")
+        logger.info(f"Season {season}: {games} games, {pitches} pitches so far")
+
+    if seed_player_cache:
+        client = PlayersClient(save_raw=False, raw_store=raw_store)
+        PlayerCache(os.path.join(data_dir, "cache", "players.sqlite")).store(
+            [client.extract_player_info(person) for person in league.people.values()]
+        )
+
+    return {
+        "start_date": dates[0] if dates else None,
+        "end_date": dates[-1] if dates else None,
+        "games": games,
+        "pitches": pitches,
+        "players": len(league.people),
+    }
+
+
+def main():
+    """Generate a synthetic dataset for load tests."""
+    parser = argparse.ArgumentParser(description="Generate synthetic Statcast and player data")
+    parser.add_argument(
+        "--data-dir", default=os.path.join("data", "synthetic"), help="Pipeline data directory"
+    )
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2024], help="Seasons to generate")
+    parser.add_argument("--teams", nargs="*", help="Team abbreviations (default: all in config)")
+    parser.add_argument("--games-per-team", type=int, default=162, help="Games per team per season")
+    parser.add_argument("--season-start", default="03-28", help="First game day (MM-DD)")
+    parser.add_argument("--season-end", default="09-29", help="Last game day (MM-DD)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--no-player-cache",
+        action="store_true",
+        help="Don't seed the player cache (the pipeline will call the MLB API)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    started = datetime.now()
+    summary = generate(
+        args.data_dir,
+        args.seasons,
+        args.teams,
+        args.games_per_team,
+        args.season_start,
+        args.season_end,
+        args.seed,
+        not args.no_player_cache,
+    )
+    logger.info(f"Generated {summary} in {datetime.now() - started}")
+    logger.info(
+        f"Build with: python src/main.py --data-dir {args.data_dir} --from-raw "
+        f"--start-date {summary['start_date']} --end-date {summary['end_date']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,99 @@
-# The contents of the file: /mlb-dim-modeling-presentation/mlb-dim-modeling-presentation/src/config/__init__.py
+from pathlib import Path
+from typing import Dict, Optional, Union
 
-# This file is intentionally left blank.
\ No newline at end of file
+import yaml
+
+CONFIG_PATH = Path(__file__).parent / "config.yaml"
+
+OBT_MATERIALIZATIONS = ("table", "view", "partial")
+
+# "live" talks to the network only, "record" also archives every successful
+# response, "replay" serves archived responses and never opens a socket
+HTTP_MODES = ("live", "record", "replay")
+
+# Uncompressed snapshots load zero-copy, LZ4 trades that for smaller files
+SNAPSHOT_COMPRESSIONS = ("uncompressed", "lz4")
+
+
+def load_config(path: Optional[Union[str, Path]] = None) -> Dict:
+    """
+    Load the pipeline configuration.
+
+    Args:
+        path: YAML file to read, defaults to src/config/config.yaml
+
+    Returns:
+        Parsed configuration as a nested dict
+    """
+    with open(path or CONFIG_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def output_formats(config: Optional[Dict] = None) -> list:
+    """Formats listed under ``output.formats``, csv and parquet by default."""
+    config = load_config() if config is None else config
+    return list(config.get("output", {}).get("formats") or ["csv", "parquet"])
+
+
+def parquet_options(config: Optional[Dict] = None) -> Dict:
+    """Parquet layout and tuning options under ``output.parquet``."""
+    config = load_config() if config is None else config
+    return dict(config.get("output", {}).get("parquet") or {})
+
+
+def obt_policy(config: Optional[Dict] = None) -> Dict:
+    """
+    How the one big table is materialized, from the ``obt`` section.
+
+    Returns:
+        Dict with ``materialization`` ("table", "view" or "partial") and
+        ``hot_columns``, the columns a partial OBT keeps
+    """
+    config = load_config() if config is None else config
+    settings = config.get("obt", {})
+    materialization = settings.get("materialization", "table")
+    if materialization not in OBT_MATERIALIZATIONS:
+        raise ValueError(f"Unknown OBT materialization: {materialization}")
+    hot_columns = list(settings.get("hot_columns") or [])
+    if materialization == "partial" and not hot_columns:
+        raise ValueError("A partial OBT needs obt.hot_columns")
+    return {"materialization": materialization, "hot_columns": hot_columns}
+
+
+def http_transport(config: Optional[Dict] = None, data_dir: str = "data") -> Dict:
+    """
+    HTTP transport of the API clients, from the ``http`` section.
+
+    Returns:
+        Dict with ``mode`` ("live", "record" or "replay") and
+        ``archive_path``, which defaults to the data directory's cache
+    """
+    config = load_config() if config is None else config
+    settings = config.get("http", {})
+    mode = settings.get("mode", "live")
+    if mode not in HTTP_MODES:
+        raise ValueError(f"Unknown HTTP mode: {mode}")
+    archive_path = settings.get("archive_path") or f"{data_dir}/cache/http_archive.sqlite"
+    return {"mode": mode, "archive_path": archive_path}
+
+
+def snapshot_options(config: Optional[Dict] = None, data_dir: str = "data") -> Dict:
+    """
+    Arrow IPC snapshots of the models, from ``output.snapshots``.
+
+    Returns:
+        Dict with ``enabled``, ``compression`` ("uncompressed" or "lz4"),
+        ``models`` (None for every model) and ``directory``, which defaults
+        to the data directory's snapshots/
+    """
+    config = load_config() if config is None else config
+    settings = config.get("output", {}).get("snapshots") or {}
+    compression = settings.get("compression", "uncompressed")
+    if compression not in SNAPSHOT_COMPRESSIONS:
+        raise ValueError(f"Unknown snapshot compression: {compression}")
+    return {
+        "enabled": bool(settings.get("enabled", False)),
+        "compression": compression,
+        "models": list(settings["models"]) if settings.get("models") else None,
+        "directory": settings.get("directory") or f"{data_dir}/snapshots",
+    }
@@ -0,0 +1,541 @@
+import logging
+import os
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+import pandas as pd
+
+from etl.statcast_schema import PITCH_KEY, statcast_sql_types
+from io_utlis.write import (
+    PARQUET_DEFAULTS,
+    path_size,
+    remove_path,
+    replace_path,
+    write_dataset_schema,
+)
+from etl.transforms.dimensions import STADIUMS, create_count_dimension
+from etl.transforms.one_big_table import BIN_RULES, FLAG_RULES, PLAYER_COLUMNS
+from etl.transforms.rollups import ROLLUPS, build_rollup_tables
+from etl.transforms.snowflake_schema import PLAYER_COLUMNS as SNOWFLAKE_PLAYER_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# DuckDB table names per model, matching the tables loaded by duckdb_loader
+MODEL_TABLES = {
+    "star": ["dim_game", "dim_player", "dim_count", "fact_pitch"],
+    "snowflake": [
+        "dim_game",
+        "dim_player",
+        "dim_position",
+        "dim_birth_location",
+        "dim_count",
+        "fact_pitch",
+    ],
+    "obt": ["one_big_table"],
+    "rollup": list(ROLLUPS),
+}
+
+# Fact tables are stored in pitch order so exports are reproducible
+PITCH_ORDER = ", ".join(f"p.{column}" for column in PITCH_KEY)
+
+
+def quote(identifier: str) -> str:
+    """Quote a SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def literal(value: str) -> str:
+    """Quote a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def table_name(model: str, table: str) -> str:
+    """DuckDB table name of a model table, e.g. star_fact_pitch or one_big_table."""
+    return table if model == "obt" else f"{model}_{table}"
+
+
+class DuckDBEngine:
+    """
+    Build the star, snowflake and OBT models inside DuckDB.
+
+    Raw Statcast Parquet partitions are registered as a view and every model
+    table is produced by a ``CREATE TABLE AS`` statement, so joins and
+    aggregations run on DuckDB's parallel operators and the tables land
+    directly in the database without a separate export step.
+    """
+
+    def __init__(self, db_path: str = "db/duckdb/mlb_data.duckdb", threads: Optional[int] = None):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = duckdb.connect(db_path)
+        if threads:
+            self.conn.execute(f"SET threads = {int(threads)}")
+
+    def close(self):
+        self.conn.close()
+
+    def execute(self, sql: str):
+        logger.debug(sql)
+        return self.conn.execute(sql)
+
+    def register_raw_statcast(
+        self, statcast_dir: str, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ):
+        """
+        Expose the game_date-partitioned raw Parquet store as the raw_pitches view.
+
+        Only partitions within the date range are read, and pitches stored in
+        more than one part (e.g. per-team chunks of the same game) are kept once.
+        """
+        filters = []
+        if start_date:
+            filters.append(f"game_date >= {literal(date.fromisoformat(start_date))}")
+        if end_date:
+            filters.append(f"game_date <= {literal(date.fromisoformat(end_date))}")
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        pattern = os.path.join(statcast_dir, "game_date=*", "*.parquet")
+        pitch_key = ", ".join(PITCH_KEY)
+
+        source = f"""
+            SELECT * EXCLUDE (filename, file_row_number) FROM read_parquet(
+                {literal(pattern)},
+                union_by_name = true,
+                hive_partitioning = false,
+                filename = true,
+                file_row_number = true
+            )
+            {where}
+            -- Keep the first stored copy, like the pandas and Arrow engines
+            QUALIFY row_number() OVER (
+                PARTITION BY {pitch_key} ORDER BY filename, file_row_number
+            ) = 1
+        """
+        casts = statcast_casts(self.execute(f"DESCRIBE {source}").fetchall())
+        replace = f" REPLACE ({', '.join(casts)})" if casts else ""
+        self.execute(
+            f"CREATE OR REPLACE TEMP VIEW raw_pitches AS SELECT *{replace} FROM ({source})"
+        )
+
+    def raw_columns(self) -> List[str]:
+        return [row[0] for row in self.execute("DESCRIBE raw_pitches").fetchall()]
+
+    def player_ids(self) -> List[int]:
+        """Distinct pitcher and batter IDs of the registered pitches."""
+        rows = self.execute(
+            """
+            SELECT pitcher AS player_id FROM raw_pitches WHERE pitcher IS NOT NULL
+            UNION
+            SELECT batter FROM raw_pitches WHERE batter IS NOT NULL
+            ORDER BY player_id
+            """
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def build_models(
+        self,
+        player_data: pd.DataFrame,
+        stadiums: Optional[Dict[str, str]] = None,
+        obt: Optional[Dict] = None,
+        player_history: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Create all model tables from raw_pitches and the fetched player data.
+
+        Args:
+            player_data: Player dimension from the MLB API
+            stadiums: Home team abbreviation to stadium name, defaults to STADIUMS
+            obt: OBT materialization policy (see config.obt_policy), a full table by default
+            player_history: Type-2 player dimension to use as star_dim_player;
+                facts then carry the pitcher_key and batter_key of the player
+                versions current on their game_date
+
+        Returns:
+            Mapping of model name to the DuckDB tables it produced; a view
+            OBT is not listed, since there is nothing to export
+        """
+        obt = obt or {"materialization": "table"}
+        self.conn.register("player_data", player_data)
+        self.conn.register(
+            "player_history", player_data if player_history is None else player_history
+        )
+        self.conn.register("count_data", create_count_dimension())
+        stadiums = stadiums or STADIUMS
+        self.conn.register(
+            "stadiums",
+            pd.DataFrame({"home_team": list(stadiums), "stadium": list(stadiums.values())}),
+        )
+
+        self.execute("BEGIN TRANSACTION")
+        try:
+            self._build_star(versioned=player_history is not None)
+            build_rollup_tables(self.conn)
+            self._build_snowflake()
+            self._build_one_big_table(obt["materialization"], obt.get("hot_columns"))
+            self.execute("COMMIT")
+        except Exception:
+            self.execute("ROLLBACK")
+            raise
+        finally:
+            for view in ["player_data", "player_history", "count_data", "stadiums"]:
+                self.conn.unregister(view)
+
+        return {
+            model: [table_name(model, table) for table in tables]
+            for model, tables in MODEL_TABLES.items()
+            if not (model == "obt" and obt["materialization"] == "view")
+        }
+
+    def _build_star(self, versioned: bool = False):
+        self.execute(
+            """
+            CREATE OR REPLACE TABLE star_dim_game AS
+            SELECT
+                row_number() OVER (ORDER BY game_pk, game_date, home_team, away_team) AS game_key,
+                game_pk,
+                game_date,
+                year(CAST(game_date AS DATE)) AS season,
+                'R' AS game_type,
+                home_team,
+                away_team,
+                any_value(s.stadium) AS stadium,
+                strftime(CAST(game_date AS DATE), '%A') AS day_of_week,
+                72 AS weather_temp,
+                'Clear' AS weather_condition,
+                count(pitch_number) AS total_pitches
+            FROM raw_pitches
+            LEFT JOIN stadiums s USING (home_team)
+            WHERE game_pk IS NOT NULL AND game_date IS NOT NULL
+                AND home_team IS NOT NULL AND away_team IS NOT NULL
+            GROUP BY game_pk, game_date, home_team, away_team
+            ORDER BY game_key
+            """
+        )
+        self.execute(
+            "CREATE OR REPLACE TABLE star_dim_count AS SELECT * FROM count_data ORDER BY count_key"
+        )
+        order = "player_key" if versioned else "player_id"
+        self.execute(
+            f"CREATE OR REPLACE TABLE star_dim_player AS SELECT * FROM player_history ORDER BY {order}"
+        )
+        # Versions of a player don't overlap, so each pitch matches at most one
+        version_keys, pitcher_on, batter_on = "", "", ""
+        if versioned:
+            version_keys = ", pp.player_key AS pitcher_key, pb.player_key AS batter_key"
+            pitcher_on = " AND p.game_date >= pp.valid_from AND p.game_date < pp.valid_to"
+            batter_on = " AND p.game_date >= pb.valid_from AND p.game_date < pb.valid_to"
+        self.execute(
+            f"""
+            CREATE OR REPLACE TABLE star_fact_pitch AS
+            SELECT
+                p.*,
+                g.game_key,
+                pp.player_id AS player_id,
+                pb.player_id AS player_id_batter_fk,
+                c.count_key
+                {version_keys}
+            FROM raw_pitches p
+            LEFT JOIN star_dim_game g ON p.game_pk = g.game_pk
+            LEFT JOIN star_dim_player pp ON p.pitcher = pp.player_id{pitcher_on}
+            LEFT JOIN star_dim_player pb ON p.batter = pb.player_id{batter_on}
+            LEFT JOIN star_dim_count c ON p.balls = c.balls AND p.strikes = c.strikes
+            ORDER BY {PITCH_ORDER}
+            """
+        )
+
+    def _build_snowflake(self):
+        player_columns = ", ".join(SNOWFLAKE_PLAYER_COLUMNS)
+        self.execute("CREATE OR REPLACE TABLE snowflake_dim_game AS SELECT * FROM star_dim_game")
+        self.execute("CREATE OR REPLACE TABLE snowflake_dim_count AS SELECT * FROM star_dim_count")
+        self.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE snowflake_players AS
+            SELECT *, row_number() OVER (ORDER BY first_seen) AS player_key
+            FROM (
+                SELECT {player_columns}, min(position) AS first_seen
+                FROM (SELECT *, row_number() OVER (ORDER BY player_id) AS position FROM player_data)
+                GROUP BY ALL
+            )
+            """
+        )
+        self.execute(
+            """
+            CREATE OR REPLACE TABLE snowflake_dim_position AS
+            SELECT primary_position, row_number() OVER (ORDER BY min(player_key)) AS position_key
+            FROM snowflake_players
+            WHERE primary_position IS NOT NULL
+            GROUP BY primary_position
+            ORDER BY position_key
+            """
+        )
+        self.execute(
+            """
+            CREATE OR REPLACE TABLE snowflake_dim_birth_location AS
+            SELECT birth_city, birth_country,
+                row_number() OVER (ORDER BY min(player_key)) AS location_key
+            FROM snowflake_players
+            WHERE birth_city IS NOT NULL AND birth_country IS NOT NULL
+            GROUP BY birth_city, birth_country
+            ORDER BY location_key
+            """
+        )
+        self.execute(
+            """
+            CREATE OR REPLACE TABLE snowflake_dim_player AS
+            SELECT p.player_id, p.full_name, p.first_name, p.last_name, p.player_key,
+                pos.position_key, loc.location_key
+            FROM snowflake_players p
+            LEFT JOIN snowflake_dim_position pos USING (primary_position)
+            LEFT JOIN snowflake_dim_birth_location loc USING (birth_city, birth_country)
+            ORDER BY p.player_key
+            """
+        )
+        self.execute(
+            f"""
+            CREATE OR REPLACE TABLE snowflake_fact_pitch AS
+            SELECT
+                p.*,
+                g.game_key,
+                pp.player_id AS player_id_pitcher,
+                pp.player_key AS player_key_pitcher,
+                pb.player_id AS player_id_batter,
+                pb.player_key AS player_key_batter,
+                c.count_key
+            FROM raw_pitches p
+            LEFT JOIN snowflake_dim_game g ON p.game_pk = g.game_pk
+            LEFT JOIN snowflake_dim_player pp ON p.pitcher = pp.player_id
+            LEFT JOIN snowflake_dim_player pb ON p.batter = pb.player_id
+            LEFT JOIN snowflake_dim_count c ON p.balls = c.balls AND p.strikes = c.strikes
+            ORDER BY {PITCH_ORDER}
+            """
+        )
+        self.execute("DROP TABLE snowflake_players")
+
+    def _build_one_big_table(self, materialization: str = "table", hot_columns=None):
+        materialize_one_big_table(self.conn, materialization, hot_columns)
+
+    def one_big_table_sql(self, prefix: str = "star_") -> str:
+        """SELECT statement producing the OBT from the star schema tables."""
+        return one_big_table_sql(self.conn, prefix)
+
+    def export(
+        self,
+        output_dir: str,
+        models: Dict[str, List[str]],
+        formats: List[str],
+        parquet_options: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """
+        Copy the model tables to files under ``output_dir/{model}``.
+
+        Args:
+            output_dir: Root of the processed data directory
+            models: Mapping of model name to DuckDB tables, as returned by build_models
+            formats: Output formats, "csv" and/or "parquet"
+            parquet_options: Overrides of write.PARQUET_DEFAULTS
+
+        Returns:
+            One report per written file with its path, bytes and seconds
+        """
+        parquet_options = {**PARQUET_DEFAULTS, **(parquet_options or {})}
+        reports = []
+        for model, tables in models.items():
+            model_dir = Path(output_dir) / model
+            model_dir.mkdir(parents=True, exist_ok=True)
+            for table in tables:
+                file_stem = table if model == "obt" else table[len(model) + 1 :]
+                for fmt in formats:
+                    start = time.perf_counter()
+                    path = self._copy_table(table, file_stem, fmt, model_dir, parquet_options)
+                    reports.append(
+                        {
+                            "table": file_stem,
+                            "format": fmt,
+                            "path": str(path),
+                            "bytes": path_size(path),
+                            "seconds": round(time.perf_counter() - start, 4),
+                        }
+                    )
+                    logger.info(f"Exported {table} to {path}")
+        return reports
+
+    def _copy_table(
+        self, table: str, file_stem: str, fmt: str, model_dir: Path, parquet_options: Dict
+    ) -> Path:
+        """COPY one table to a temporary path, then move it into place."""
+        source = quote(table)
+        if fmt == "csv":
+            path = model_dir / f"{file_stem}.csv"
+            options = "FORMAT csv, HEADER"
+        else:
+            options = (
+                f"FORMAT parquet, COMPRESSION {parquet_options['compression']}, "
+                f"ROW_GROUP_SIZE {int(parquet_options['row_group_size'])}"
+            )
+            partitioned = (
+                parquet_options["layout"] == "partitioned"
+                and file_stem in parquet_options["partitioned_tables"]
+            )
+            path = model_dir / (file_stem if partitioned else f"{file_stem}.parquet")
+            if partitioned:
+                columns = {row[0] for row in self.execute(f"DESCRIBE {source}").fetchall()}
+                partition_by = [c for c in parquet_options["partition_by"] if c in columns]
+                sort_by = [c for c in parquet_options["sort_by"] if c in columns]
+                if sort_by or partition_by:
+                    order = ", ".join(quote(c) for c in partition_by + sort_by)
+                    source = f"(SELECT * FROM {source} ORDER BY {order})"
+                if partition_by:
+                    options += f", PARTITION_BY ({', '.join(quote(c) for c in partition_by)})"
+            remove_path(model_dir / (f"{file_stem}.parquet" if partitioned else file_stem))
+
+        tmp_path = model_dir / f".{path.name}.tmp"
+        try:
+            remove_path(tmp_path)
+            self.execute(f"COPY {source} TO {literal(tmp_path)} ({options})")
+            # COPY writes no directory when the table is empty
+            if fmt == "parquet" and partitioned and tmp_path.is_dir():
+                schema = self.execute(f"SELECT * FROM {quote(table)} LIMIT 0").fetch_arrow_table()
+                write_dataset_schema(schema.schema, tmp_path)
+            replace_path(tmp_path, path)
+        finally:
+            remove_path(tmp_path)
+        return path
+
+
+def statcast_casts(columns: List[tuple]) -> List[str]:
+    """
+    REPLACE expressions casting raw Statcast columns to the star schema types.
+
+    Parquet parts store what each writer inferred: a column that was empty on
+    every day read is null-typed, and union_by_name then widens it to DOUBLE
+    instead of VARCHAR.
+
+    Args:
+        columns: Rows of DESCRIBE over the raw pitches, name and type first
+
+    Returns:
+        ``CAST(column AS type) AS column`` for every column of another type
+    """
+    sql_types = statcast_sql_types()
+    casts = []
+    for name, column_type, *_ in columns:
+        expected = sql_types.get(name)
+        if expected is None or column_type == expected:
+            continue
+        if expected == "DOUBLE" and column_type == "FLOAT":
+            continue
+        casts.append(f"CAST({quote(name)} AS {expected}) AS {quote(name)}")
+    return casts
+
+
+def relation_type(conn: duckdb.DuckDBPyConnection, name: str) -> Optional[str]:
+    """'BASE TABLE', 'VIEW' or None for a relation in the main schema."""
+    row = conn.execute(
+        "SELECT table_type FROM information_schema.tables "
+        "WHERE table_schema = 'main' AND table_name = ?",
+        [name],
+    ).fetchone()
+    return row[0] if row else None
+
+
+def drop_relation(conn: duckdb.DuckDBPyConnection, name: str):
+    """Drop a table or view; CREATE OR REPLACE cannot turn one into the other."""
+    existing = relation_type(conn, name)
+    if existing == "VIEW":
+        conn.execute(f"DROP VIEW {quote(name)}")
+    elif existing:
+        conn.execute(f"DROP TABLE {quote(name)}")
+
+
+def one_big_table_sql(conn: duckdb.DuckDBPyConnection, prefix: str = "star_") -> str:
+    """
+    SELECT statement producing the OBT from the star schema tables.
+
+    Column names follow the pandas builder: game columns that clash with
+    the pitch data get a ``_game`` suffix and player attributes are
+    prefixed with ``pitcher_``/``batter_``.
+    """
+    fact_columns = [row[0] for row in conn.execute(f"DESCRIBE {prefix}fact_pitch").fetchall()]
+    key_columns = ["game_key", "player_id", "player_id_batter_fk", "count_key"]
+    key_columns += [column for column in ("pitcher_key", "batter_key") if column in fact_columns]
+    pitch_columns = {column for column in fact_columns if column not in key_columns}
+    # Like the pandas builder, the OBT carries the players' current attributes
+    player_columns = [row[0] for row in conn.execute(f"DESCRIBE {prefix}dim_player").fetchall()]
+    current = " AND {alias}.is_current" if "is_current" in player_columns else ""
+    game_columns = [
+        row[0]
+        for row in conn.execute(f"DESCRIBE {prefix}dim_game").fetchall()
+        if row[0] not in ("game_key", "game_pk")
+    ]
+
+    select = [f"p.* EXCLUDE ({', '.join(key_columns)})"]
+    select += [
+        f"g.{quote(column)} AS {quote(column + '_game' if column in pitch_columns else column)}"
+        for column in game_columns
+    ]
+    for role, alias in [("pitcher", "pp"), ("batter", "pb")]:
+        select += [
+            f"{alias}.{quote(column)} AS {quote(f'{role}_{column}')}"
+            for column in PLAYER_COLUMNS
+            if column != "player_id"
+        ]
+    select += ["c.count_display", "c.count_category"]
+    select += derived_fields_sql()
+
+    return f"""
+        SELECT {', '.join(select)}
+        FROM {prefix}fact_pitch p
+        LEFT JOIN {prefix}dim_game g ON p.game_key = g.game_key
+        LEFT JOIN {prefix}dim_player pp ON p.player_id = pp.player_id{current.format(alias="pp")}
+        LEFT JOIN {prefix}dim_player pb ON p.player_id_batter_fk = pb.player_id{current.format(alias="pb")}
+        LEFT JOIN {prefix}dim_count c ON p.count_key = c.count_key
+    """
+
+
+def materialize_one_big_table(
+    conn: duckdb.DuckDBPyConnection,
+    materialization: str = "table",
+    hot_columns: Optional[List[str]] = None,
+    prefix: str = "star_",
+):
+    """
+    Create one_big_table from the star schema tables with a materialization policy.
+
+    Args:
+        conn: Connection holding the star schema tables
+        materialization: "table" stores every column, "view" stores nothing
+            and joins the star tables at query time, "partial" stores only
+            ``hot_columns``
+        hot_columns: Columns of a partial OBT
+        prefix: Table name prefix of the star schema
+    """
+    sql = one_big_table_sql(conn, prefix)
+    if materialization == "partial":
+        sql = f"SELECT {', '.join(quote(c) for c in hot_columns)} FROM ({sql})"
+    elif materialization not in ("table", "view"):
+        raise ValueError(f"Unknown OBT materialization: {materialization}")
+    drop_relation(conn, "one_big_table")
+    kind = "VIEW" if materialization == "view" else "TABLE"
+    conn.execute(f"CREATE {kind} one_big_table AS {sql}")
+
+
+def derived_fields_sql() -> List[str]:
+    """SQL expressions for the OBT derived fields, built from the shared rules."""
+    expressions = []
+    for column, source, edges, labels, missing_label in BIN_RULES:
+        cases = [f"WHEN p.{quote(source)} IS NULL OR isnan(p.{quote(source)}) THEN {literal(missing_label)}"]
+        cases += [
+            f"WHEN p.{quote(source)} < {edge} THEN {literal(label)}"
+            for edge, label in zip(edges, labels)
+        ]
+        expressions.append(
+            f"CASE {' '.join(cases)} ELSE {literal(labels[-1])} END AS {quote(column)}"
+        )
+    for column, source, values in FLAG_RULES:
+        value_list = ", ".join(literal(value) for value in values)
+        expressions.append(
+            f"coalesce(p.{quote(source)} IN ({value_list}), false) AS {quote(column)}"
+        )
+    return expressions
@@ -0,0 +1,216 @@
+import io
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from http.client import responses as reasons
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import pyarrow as pa
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config import HTTP_MODES
+
+logger = logging.getLogger(__name__)
+
+# Bodies are stored decoded, so transfer-level headers no longer apply
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class NotRecordedError(requests.ConnectionError):
+    """A replayed request that the archive has no response for."""
+
+
+def request_key(method: str, url: str) -> str:
+    """
+    Archive key of a request: a hash of the method and the URL with its query sorted.
+
+    Sorting the query makes the key independent of the order in which a
+    client happens to build its parameters.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{query}"
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class HttpArchive:
+    """
+    SQLite archive of HTTP responses, indexed by request.
+
+    Each row holds one response body compressed with zstd, its status and
+    headers, keyed by :func:`request_key`. Savant CSV exports shrink about
+    fourfold, and a lookup is a single primary-key read, so a season of
+    recorded chunks replays in the time it takes to decompress them.
+    """
+
+    def __init__(self, path: str = "data/cache/http_archive.sqlite", codec: str = "zstd"):
+        self.path = path
+        self.codec = codec
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            # Shard worker processes record into the same archive concurrently
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    request_key TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    codec TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    body_bytes INTEGER NOT NULL,
+                    recorded_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def store(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Archive a response, replacing an earlier recording of the same request."""
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_key(method, url),
+                    method.upper(),
+                    url,
+                    status,
+                    json.dumps(headers),
+                    self.codec,
+                    pa.compress(body, codec=self.codec, asbytes=True),
+                    len(body),
+                    time.time(),
+                ),
+            )
+
+    def lookup(self, method: str, url: str) -> Optional[Dict]:
+        """
+        Find the recorded response of a request.
+
+        Returns:
+            Dict with status, headers and the decompressed body, or None if
+            the request was never recorded
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, headers, codec, body, body_bytes FROM responses WHERE request_key = ?",
+                (request_key(method, url),),
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, codec, body, body_bytes = row
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "body": pa.decompress(body, decompressed_size=body_bytes, codec=codec, asbytes=True),
+        }
+
+    def stats(self) -> Dict:
+        """Number of recorded responses and their raw and stored sizes."""
+        with self._connect() as conn:
+            count, raw, stored = conn.execute(
+                "SELECT count(*), coalesce(sum(body_bytes), 0), coalesce(sum(length(body)), 0) "
+                "FROM responses"
+            ).fetchone()
+        return {"responses": count, "body_bytes": raw, "stored_bytes": stored}
+
+
+class ArchiveAdapter(HTTPAdapter):
+    """
+    Transport adapter that records responses to, or replays them from, an HttpArchive.
+
+    In record mode requests go to the network as usual and every 2xx
+    response is archived before it is handed back; error responses are not
+    recorded so a transient 503 can't be replayed forever. In replay mode
+    the archived response is returned without any network access, and a
+    request that was never recorded fails with a ConnectionError, the same
+    way an unreachable server would, but one that retrying can't fix.
+    """
+
+    def __init__(self, archive: HttpArchive, mode: str = "replay", **kwargs):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"ArchiveAdapter mode must be record or replay, got {mode}")
+        super().__init__(**kwargs)
+        self.archive = archive
+        self.mode = mode
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode == "replay":
+            recorded = self.archive.lookup(request.method, request.url)
+            if recorded is None:
+                raise NotRecordedError(
+                    f"No recorded response for {request.method} {request.url}", request=request
+                )
+            return self._replayed_response(request, recorded)
+
+        response = super().send(request, **kwargs)
+        if response.ok:
+            # Reading the body here leaves it on response.content, so streaming
+            # callers still get it from iter_content
+            self.archive.store(
+                request.method, request.url, response.status_code, dict(response.headers), response.content
+            )
+        return response
+
+    def _replayed_response(self, request: requests.PreparedRequest, recorded: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = reasons.get(recorded["status"], "")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(recorded["body"])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def create_session(
+    pool_size: int = 10, mode: str = "live", archive_path: Optional[str] = None
+) -> requests.Session:
+    """
+    Create a keep-alive session whose connection pool holds ``pool_size`` connections.
+
+    Args:
+        pool_size: Pooled connections per host, one per worker thread
+        mode: "live", "record" or "replay"
+        archive_path: HttpArchive file used by record and replay modes
+
+    Returns:
+        Session with the transport of ``mode`` mounted for http and https
+    """
+    if mode not in HTTP_MODES:
+        raise ValueError(f"Unknown HTTP mode: {mode}")
+    if mode == "live":
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    else:
+        if not archive_path:
+            raise ValueError(f"HTTP mode {mode} needs an archive path")
+        adapter = ArchiveAdapter(
+            HttpArchive(archive_path), mode, pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from etl.transforms.keys import map_keys
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineState:
+    """
+    High-water marks of incremental runs, persisted as a small JSON file.
+
+    Each source records the last date it has been loaded through, e.g.::
+
+        {"statcast": {"high_water_mark": "2025-08-06", "updated_at": "..."}}
+    """
+
+    def __init__(self, path: str = "data/state/pipeline_state.json"):
+        self.path = path
+        self.state: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def high_water_mark(self, source: str) -> Optional[str]:
+        return self.state.get(source, {}).get("high_water_mark")
+
+    def advance(self, source: str, high_water_mark: str, **details):
+        """Record that ``source`` is loaded through ``high_water_mark`` and save."""
+        self.state[source] = {
+            "high_water_mark": high_water_mark,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            **details,
+        }
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def incremental_window(
+    high_water_mark: Optional[str],
+    default_start: str,
+    end_date: Optional[str] = None,
+    lookback_days: int = 0,
+) -> Optional[Tuple[str, str]]:
+    """
+    Compute the game dates an incremental run should fetch.
+
+    Args:
+        high_water_mark: Last date already loaded, or None on the first run
+        default_start: First date to load when there is no high-water mark
+        end_date: Last date to load, defaults to yesterday (today's games may be in progress)
+        lookback_days: Days before the high-water mark to refetch, picking up
+            late Statcast corrections
+
+    Returns:
+        (start_date, end_date) in YYYY-MM-DD format, or None when up to date
+    """
+    end = date.fromisoformat(end_date) if end_date else date.today() - timedelta(days=1)
+    if high_water_mark:
+        start = date.fromisoformat(high_water_mark) + timedelta(days=1 - lookback_days)
+    else:
+        start = date.fromisoformat(default_start)
+
+    if start > end:
+        return None
+    return start.isoformat(), end.isoformat()
+
+
+def in_season(day: date, season_start: str, season_end: str) -> bool:
+    """Whether a date falls between the MM-DD bounds of a season."""
+    return season_start <= day.strftime("%m-%d") <= season_end
+
+
+def settled_through(
+    start_date: str,
+    end_date: str,
+    last_game_date: Optional[str],
+    season_start: str = "03-01",
+    season_end: str = "11-30",
+) -> Optional[str]:
+    """
+    Last date of a window the high-water mark may move to.
+
+    In-season dates after the last one that returned pitches may just not be
+    published yet, so the mark stops before the first of them and the next
+    run fetches them again. Off-season dates have no games and are passed.
+
+    Args:
+        start_date: First date of the window
+        end_date: Last date of the window
+        last_game_date: Latest game_date that returned pitches, None if none did
+        season_start: MM-DD of the first possible game day
+        season_end: MM-DD of the last possible game day
+
+    Returns:
+        Date in YYYY-MM-DD format, or None when the window settled no date
+    """
+    day = (
+        date.fromisoformat(last_game_date) + timedelta(days=1)
+        if last_game_date
+        else date.fromisoformat(start_date)
+    )
+    end = date.fromisoformat(end_date)
+    while day <= end:
+        if in_season(day, season_start, season_end):
+            settled = day - timedelta(days=1)
+            return settled.isoformat() if settled >= date.fromisoformat(start_date) else None
+        day += timedelta(days=1)
+    return end_date
+
+
+def merge_game_dimension(existing: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Upsert newly built game rows into an existing game dimension.
+
+    Games already in the dimension keep their game_key and take the new
+    attribute values (so corrected data replaces the old row); unseen games
+    get keys after the current maximum. Fact rows loaded by earlier runs
+    therefore keep pointing at the right games.
+
+    Args:
+        existing: Game dimension from previous runs, or None
+        new: Game dimension built from the pitches of this run
+
+    Returns:
+        Merged game dimension ordered by game_key
+    """
+    if existing is None or existing.empty:
+        return new
+
+    new = new.copy()
+    known_keys = map_keys(new["game_pk"], existing["game_pk"], existing["game_key"])
+    unseen = known_keys.isna()
+    next_key = int(existing["game_key"].max()) + 1
+    new_keys = known_keys.to_numpy(dtype="int64", na_value=0)
+    new_keys[unseen] = np.arange(next_key, next_key + unseen.sum())
+    new["game_key"] = new_keys
+
+    kept = existing[~existing["game_pk"].isin(new["game_pk"])]
+    merged = pd.concat([kept, new[existing.columns]], ignore_index=True)
+    logger.info(
+        f"Game dimension: {int(unseen.sum())} new games, "
+        f"{int((~unseen).sum())} updated, {len(merged)} total"
+    )
+    return merged.sort_values("game_key", ignore_index=True)
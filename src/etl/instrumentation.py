@@ -0,0 +1,250 @@
+import cProfile
+import json
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Stage fields exported as OpenMetrics gauges, with their unit
+METRICS = {
+    "wall_seconds": "seconds",
+    "cpu_seconds": "seconds",
+    "rss_bytes": "bytes",
+    "peak_rss_bytes": "bytes",
+    "peak_rss_delta_bytes": "bytes",
+    "traced_peak_bytes": "bytes",
+    "rows_in": None,
+    "rows_out": None,
+    "bytes_written": None,
+}
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of the process's resident memory."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_bytes() -> int:
+    """Current resident memory, or the peak where /proc is not available."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return peak_rss_bytes()
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process's threads plus reaped worker processes."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+class RunInstrumentation:
+    """
+    Per-stage measurements of one pipeline run.
+
+    Each stage records wall and CPU time, resident memory (current, peak, and
+    how far the stage raised the peak), optionally the tracemalloc peak of
+    Python allocations, input/output row counts and bytes written. Stages
+    can also be profiled with cProfile or, when installed, pyinstrument.
+    The run is reported as JSON and optionally as an OpenMetrics text file
+    for a node exporter textfile collector::
+
+        with metrics.stage("star", rows_in=len(pitch_data)) as stage:
+            tables = create_star_schema(...)
+            stage["rows_out"] = len(tables["fact_pitch"])
+    """
+
+    def __init__(
+        self,
+        run_name: str = "pipeline",
+        report_dir: str = "data/reports",
+        trace_memory: bool = False,
+        profiler: Optional[str] = None,
+        profile_stages: Optional[List[str]] = None,
+    ):
+        if profiler not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}")
+        self.run_name = run_name
+        self.run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.report_dir = Path(report_dir)
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.profile_stages = profile_stages or []
+        self.stages: List[Dict] = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._start = time.perf_counter()
+        self._start_cpu = cpu_seconds()
+        # tracemalloc slows every allocation down, so it's opt-in
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_config(cls, run_name: str, config: Dict, data_dir: str = "data") -> "RunInstrumentation":
+        """Build from the ``instrumentation`` section of config.yaml."""
+        settings = config.get("instrumentation", {})
+        return cls(
+            run_name,
+            report_dir=f"{data_dir}/reports",
+            trace_memory=settings.get("trace_memory", False),
+            profiler=settings.get("profiler"),
+            profile_stages=settings.get("profile_stages"),
+        )
+
+    def _profiles(self, name: str) -> bool:
+        return self.profiler is not None and (not self.profile_stages or name in self.profile_stages)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Measure a stage; the yielded record takes rows_out, bytes_written and cache_hit.
+
+        Args:
+            name: Stage name
+            rows_in: Rows the stage reads, when known up front
+        """
+        record = {
+            "stage": name,
+            "rows_in": rows_in,
+            "rows_out": None,
+            "bytes_written": 0,
+            "cache_hit": None,
+        }
+        profiler = self._start_profiler(name)
+        peak_before = peak_rss_bytes()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        start, start_cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield record
+            record["status"] = "ok"
+        except BaseException:
+            record["status"] = "error"
+            raise
+        finally:
+            record["wall_seconds"] = time.perf_counter() - start
+            record["cpu_seconds"] = cpu_seconds() - start_cpu
+            record["rss_bytes"] = rss_bytes()
+            record["peak_rss_bytes"] = peak_rss_bytes()
+            record["peak_rss_delta_bytes"] = record["peak_rss_bytes"] - peak_before
+            if self.trace_memory:
+                record["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1] - traced_before
+            if profiler is not None:
+                record["profile"] = self._stop_profiler(name, profiler)
+            self.stages.append(record)
+            logger.info(
+                f"Measured stage {name}: {record['wall_seconds']:.2f}s wall, "
+                f"{record['cpu_seconds']:.2f}s CPU, rows {record['rows_in']} -> {record['rows_out']}, "
+                f"RSS {record['rss_bytes'] / 1e6:.0f} MB (peak +{record['peak_rss_delta_bytes'] / 1e6:.0f} MB)"
+            )
+
+    def _start_profiler(self, name: str):
+        if not self._profiles(name):
+            return None
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("pyinstrument is not installed, profiling with cProfile")
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, name: str, profiler) -> str:
+        profile_dir = self.report_dir / "profiles"
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            path = profile_dir / f"{self.run_id}_{name}.prof"
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = profile_dir / f"{self.run_id}_{name}.html"
+            path.write_text(profiler.output_html(), encoding="utf-8")
+        return str(path)
+
+    def report(self) -> Dict:
+        """The run and its stages as a JSON-serializable dict."""
+        return {
+            "run": self.run_name,
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "wall_seconds": time.perf_counter() - self._start,
+            "cpu_seconds": cpu_seconds() - self._start_cpu,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "bytes_written": sum(stage["bytes_written"] for stage in self.stages),
+            "stages": self.stages,
+        }
+
+    def openmetrics(self, report: Optional[Dict] = None) -> str:
+        """Render the stages as OpenMetrics gauges labelled by run and stage."""
+        report = report or self.report()
+        lines = []
+        for field, unit in METRICS.items():
+            metric = f"mlb_pipeline_stage_{field}"
+            lines.append(f"# TYPE {metric} gauge")
+            if unit:
+                lines.append(f"# UNIT {metric} {unit}")
+            for stage in report["stages"]:
+                if stage.get(field) is not None:
+                    lines.append(
+                        f'{metric}{{run="{report["run"]}",stage="{stage["stage"]}"}} {stage[field]}'
+                    )
+        lines.append("# TYPE mlb_pipeline_run_wall_seconds gauge")
+        lines.append("# UNIT mlb_pipeline_run_wall_seconds seconds")
+        lines.append(f'mlb_pipeline_run_wall_seconds{{run="{report["run"]}"}} {report["wall_seconds"]}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, openmetrics: bool = False) -> List[Path]:
+        """
+        Write the run report as JSON, and as OpenMetrics text if requested.
+
+        The JSON report is kept per run (``{run_name}_{run_id}.json``); the
+        OpenMetrics file is overwritten so a textfile collector always sees
+        the latest run.
+
+        Returns:
+            Paths written
+        """
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        json_path = self.report_dir / f"{self.run_name}_{self.run_id}.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        paths = [json_path]
+
+        if openmetrics:
+            metrics_path = self.report_dir / f"{self.run_name}.prom"
+            tmp_path = metrics_path.with_name(f".{metrics_path.name}.tmp")
+            tmp_path.write_text(self.openmetrics(report), encoding="utf-8")
+            os.replace(tmp_path, metrics_path)
+            paths.append(metrics_path)
+
+        logger.info(
+            f"Run report: {report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU, "
+            f"peak RSS {report['peak_rss_bytes'] / 1e6:.0f} MB, written to {json_path}"
+        )
+        return paths
+
+
+def table_rows(tables: Dict) -> int:
+    """Total rows of a dict of DataFrames or Arrow tables."""
+    return sum(len(table) for table in tables.values())
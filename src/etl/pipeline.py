@@ -1,14 +1,50 @@
 from datetime import datetime
+import json
 import os
 import sys
+import time
 import pandas as pd
-import numpy as np
-import requests
+import pyarrow as pa
+import pyarrow.compute as pc
 import logging
-from typing import List
-from io import StringIO
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
+from etl.incremental import (
+    PipelineState,
+    incremental_window,
+    merge_game_dimension,
+    settled_through,
+)
+from etl.instrumentation import RunInstrumentation, table_rows
+from etl.player_cache import PlayerCache
 from etl.players_client import PlayersClient
+from etl.sharding import fetch_shards, plan_shards
+from etl.stage_cache import StageCache, code_version
+from etl.statcast_client import StatcastClient, date_chunks, team_slug
+from etl.statcast_schema import PITCH_KEY, concat_statcast
+from etl.streaming import BackgroundWorker, PlayerLookahead, prefetch
+from io_utlis.raw_store import JsonLinesWriter, RawStore
+from io_utlis.duckdb_loader import read_table, require_tables, table_exists, upsert_dataframe
+from io_utlis.snapshots import write_snapshots
+from io_utlis.write import (
+    PARQUET_DEFAULTS,
+    remove_path,
+    write_manifest,
+    write_parquet_partitions,
+    write_tables,
+)
+from config import (
+    http_transport,
+    load_config,
+    obt_policy,
+    output_formats,
+    parquet_options,
+    snapshot_options,
+)
+from etl.transforms import dimensions
+from etl.transforms.conformance import check_conformance
+from etl.transforms.player_history import merge_player_versions
+from etl.transforms.rollups import ROLLUPS, build_rollup_tables, create_rollups
 from etl.transforms.star_schema import create_star_schema
 
 current_dir = Path(__file__).parent
@@ -20,14 +56,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Written next to a model's files by the batch pipeline, see outputs_current
+OUTPUT_STAMP = ".outputs.json"
+
 
 class MLBDataPipeline:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        max_workers: Optional[int] = None,
+        engine: Optional[str] = None,
+        database_path: Optional[str] = None,
+        config: Optional[Dict] = None,
+    ):
+        """
+        Args:
+            data_dir: Root of the raw, processed, cache and state directories
+            max_workers: Concurrent downloads per shard, defaults to pipeline.max_workers
+            engine: "pandas", "arrow" or "duckdb", defaults to pipeline.engine
+            database_path: DuckDB database, defaults to duckdb.database_path
+            config: Parsed config.yaml, loaded from src/config when omitted
+        """
+        self.config = load_config() if config is None else config
+        api = self.config.get("api", {})
+        data = self.config.get("data", {})
+        settings = self.config.get("pipeline", {})
+
+        engine = engine or settings.get("engine", "pandas")
+        if engine not in ("pandas", "arrow", "duckdb"):
+            raise ValueError(f"Unknown engine: {engine}")
         self.data_dir = data_dir
+        self.max_workers = max_workers or settings.get("max_workers", 4)
+        self.engine = engine
+        self.database_path = database_path or self.config.get("duckdb", {}).get(
+            "database_path", "db/duckdb/mlb_data.duckdb"
+        )
+
+        self.start_date = data.get("start_date", "2025-08-04")
+        self.end_date = data.get("end_date", "2025-08-06")
+        self.teams: List[str] = list(data.get("teams") or [])
+        self.seasons: List[int] = list(data.get("seasons") or [])
+        self.season_start = data.get("season_start", "03-01")
+        self.season_end = data.get("season_end", "11-30")
+        self.stadiums: Dict[str, str] = data.get("stadiums") or dimensions.STADIUMS
+        self.shard_processes = settings.get("shard_processes", 4)
+        self.split_teams = settings.get("split_teams", False)
+        self.chunk_days = settings.get("chunk_days", 1)
+        self.streaming = settings.get("streaming", False)
+        self.queue_size = settings.get("queue_size", 4)
+        self.incremental_rewrite_files = settings.get("incremental_rewrite_files", False)
+        if self.streaming and engine != "pandas":
+            raise ValueError(f"Streaming runs use the pandas engine, not {engine}")
+
+        cache_config = self.config.get("cache", {})
+        self.stage_cache = StageCache(
+            f"{self.data_dir}/cache/stages",
+            max_bytes=cache_config.get("max_bytes", 2 * 1024**3),
+            enabled=cache_config.get("enabled", True),
+        )
+        self.download_ttl_seconds = cache_config.get("download_ttl_seconds", 24 * 3600)
+        self.player_ttl_seconds = cache_config.get("player_ttl_seconds", 24 * 3600)
+
+        self.output_formats = output_formats(self.config)
+        self.parquet_options = parquet_options(self.config)
+        self.obt = obt_policy(self.config)
+        self.snapshots = snapshot_options(self.config, self.data_dir)
+        if self.streaming and "parquet" not in self.output_formats:
+            raise ValueError("Streaming runs write Parquet partitions, add parquet to output.formats")
+        if self.snapshots["enabled"] and "parquet" not in self.output_formats:
+            raise ValueError(
+                "Arrow snapshots are built from the Parquet outputs, add parquet to output.formats"
+            )
+        self.write_reports: List[Dict] = []
+        self.openmetrics = self.config.get("instrumentation", {}).get("openmetrics", False)
+        self.metrics = RunInstrumentation.from_config("pipeline", self.config, self.data_dir)
         self.create_directories()
+        self.raw_store = RawStore(f"{self.data_dir}/raw")
 
-        self.mlb_api_base = "https://statsapi.mlb.com/api/v1"
-        self.savant_base = "https://baseballsavant.mlb.com/statcast_search/csv"
+        self.mlb_api_base = api.get("mlb_api_base_url", "https://statsapi.mlb.com/api/v1")
+        self.savant_base = api.get(
+            "baseball_savant_url", "https://baseballsavant.mlb.com/statcast_search/csv"
+        )
+        self.http = http_transport(self.config, self.data_dir)
+        if self.http["mode"] != "live":
+            logger.info(f"HTTP {self.http['mode']} mode, archive {self.http['archive_path']}")
+
+    def date_range(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Resolve the game dates to load, falling back to the configured seasons or range."""
+        if self.seasons:
+            default_start = f"{min(self.seasons)}-{self.season_start}"
+            default_end = f"{max(self.seasons)}-{self.season_end}"
+        else:
+            default_start, default_end = self.start_date, self.end_date
+        return start_date or default_start, end_date or default_end
 
     def create_directories(self):
         """Create necessary directories for data storage."""
@@ -36,161 +159,234 @@ class MLBDataPipeline:
         os.makedirs(f"{self.data_dir}/processed/star", exist_ok=True)
         os.makedirs(f"{self.data_dir}/processed/snowflake", exist_ok=True)
         os.makedirs(f"{self.data_dir}/processed/obt", exist_ok=True)
+        os.makedirs(f"{self.data_dir}/processed/rollup", exist_ok=True)
         logger.info(f"Created data directories under: {self.data_dir}")
 
-    def download_statcast_data(self, start_date: str, end_date: str) -> pd.DataFrame:
+    def fetch_statcast(self, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Land Statcast pitches for a date range in the raw store.
+
+        The configured seasons and teams are split into shards that are
+        fetched on a process pool; within a shard, per-day chunks are
+        downloaded on a thread pool.
+
+        Returns:
+            One summary per shard
+        """
+        shards = plan_shards(
+            start_date,
+            end_date,
+            self.teams,
+            self.seasons,
+            self.season_start,
+            self.season_end,
+            self.split_teams,
+        )
+        settings = {
+            "base_url": self.savant_base,
+            "raw_root": str(self.raw_store.root),
+            "download_dir": f"{self.data_dir}/raw/statcast",
+            "engine": "pandas" if self.engine == "pandas" else "arrow",
+            "max_workers": self.max_workers,
+            "chunk_days": self.chunk_days,
+            "http_mode": self.http["mode"],
+            "http_archive": self.http["archive_path"],
+        }
+        logger.info(
+            f"Fetching {len(shards)} Statcast shards with up to {self.shard_processes} processes"
+        )
+        return fetch_shards(shards, settings, self.shard_processes)
+
+    def download_statcast_data(
+        self, start_date: str, end_date: str, raise_errors: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         Download Statcast pitch-by-pitch data from Baseball Savant.
 
+        The range is fetched in per-day chunks on a bounded worker pool, so
+        multi-season backfills neither time out nor hit Savant's row limit.
+        Each chunk is parsed with the fixed star schema dtypes and landed in
+        the raw store as game_date-partitioned Parquet, then the shards of
+        this run are read back and merged, dropping pitches fetched by more
+        than one team shard.
+
         Args:
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
+            raise_errors: Raise download errors instead of returning an empty frame
 
         Returns:
-            DataFrame with pitch-by-pitch data
+            DataFrame with pitch-by-pitch data (an Arrow table with the arrow engine)
         """
         logger.info(f"Downloading Statcast data from {start_date} to {end_date}")
 
-        # Baseball Savant CSV export URL
-        params = {
-            "all": "true",
-            "hfPT": "",
-            "hfAB": "",
-            "hfBBT": "",
-            "hfPR": "",
-            "hfZ": "",
-            "stadium": "",
-            "hfBBL": "",
-            "hfNewZones": "",
-            "hfGT": "R",
-            "hfC": "",
-            "hfSea": "2025",
-            "hfSit": "",
-            "player_type": "pitcher",
-            "hfOuts": "",
-            "opponent": "",
-            "pitcher_throws": "",
-            "batter_stands": "",
-            "hfSA": "",
-            "game_date_gt": start_date,
-            "game_date_lt": end_date,
-            "team": "TOR|COL",
-            "position": "",
-            "hfRO": "",
-            "home_road": "",
-            "hfFlag": "",
-            "metric_1": "",
-            "hfInn": "",
-            "min_pitches": "0",
-            "min_results": "0",
-            "group_by": "name",
-            "sort_col": "pitches",
-            "player_event_sort": "h_launch_speed",
-            "sort_order": "desc",
-            "min_abs": "0",
-            "type": "details",
-        }
-
         try:
-            response = requests.get(self.savant_base, params=params, timeout=30)
-            response.raise_for_status()
-
-            df = pd.read_csv(StringIO(response.text))
-
-            # Save raw data
-            raw_file = f"{self.data_dir}/raw/statcast/statcast_data_{start_date}_{end_date}.csv"
-            df.to_csv(raw_file, index=False)
-            logger.info(f"Saved raw Statcast data to {raw_file}")
+            summaries = self.fetch_statcast(start_date, end_date)
+            parts = sorted({f"statcast_{team_slug(s['shard'][2])}" for s in summaries})
+            if self.engine == "pandas":
+                df = self.raw_store.read_statcast(start_date, end_date, parts)
+            else:
+                df = self.raw_store.read_statcast_table(start_date, end_date, parts)
+            logger.info(
+                f"Saved {len(df)} raw Statcast pitches to {self.raw_store.statcast_dir}"
+            )
 
             return df
 
         except Exception as e:
             logger.error(f"Error downloading Statcast data: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()  # Return empty DataFrame on error
 
-    def get_player_data(self, player_ids: List[int]) -> pd.DataFrame:
+    def load_raw_statcast(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Read previously downloaded pitches back from the raw store."""
+        logger.info(f"Loading raw Statcast data from {start_date} to {end_date}")
+        return self.raw_store.read_statcast(start_date, end_date)
+
+    def get_player_data(
+        self, player_ids: List[int], raw_writer: Optional[JsonLinesWriter] = None
+    ) -> pd.DataFrame:
         """
         Fetch player dimension data from MLB API.
 
+        Players already in the local cache with a record younger than
+        cache.player_ttl_seconds are not refetched. That age bounds how late a
+        change of a tracked attribute opens a new dim_player version.
+
         Args:
             player_ids: List of MLB player IDs
+            raw_writer: Raw response appender shared by concurrent lookups
 
         Returns:
             DataFrame with player information
         """
-        client = PlayersClient()
-        return client.fetch_player_data(player_ids)
+        cache = PlayerCache(
+            f"{self.data_dir}/cache/players.sqlite", ttl_seconds=self.player_ttl_seconds
+        )
+        client = PlayersClient(
+            api_base=self.mlb_api_base,
+            cache=cache,
+            raw_store=self.raw_store,
+            http_mode=self.http["mode"],
+            http_archive=self.http["archive_path"],
+        )
+        players = client.fetch_player_data(player_ids, raw_writer)
+
+        # Cache hits and concurrent batches arrive in arbitrary order; sort so
+        # surrogate keys derived from the row order are stable between runs
+        if not players.empty:
+            players = players.sort_values("player_id", ignore_index=True)
+        return players
+
+    def update_player_dimension(
+        self, snapshot: pd.DataFrame, as_of: str, existing: Optional[pd.DataFrame] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Version the player snapshot against the type-2 dimension of earlier runs.
+
+        Args:
+            snapshot: Players fetched for this run
+            as_of: First game date of this run, where changed players' new versions start
+            existing: Current dimension, read from processed/star when omitted
+
+        Returns:
+            The merged dimension and the rows that changed
+        """
+        if existing is None:
+            existing = self.read_output("star", "dim_player")
+        return merge_player_versions(existing, snapshot, as_of)
+
+    def read_output(self, model: str, table: str) -> Optional[pd.DataFrame]:
+        """A model table written by an earlier run, or None."""
+        model_dir = Path(self.data_dir) / "processed" / model
+        if (model_dir / f"{table}.parquet").exists():
+            return pd.read_parquet(model_dir / f"{table}.parquet")
+        if (model_dir / f"{table}.csv").exists():
+            return pd.read_csv(model_dir / f"{table}.csv")
+        return None
 
     def create_game_dimension(self, pitch_data: pd.DataFrame) -> pd.DataFrame:
         """Create game dimension table from pitch data."""
         logger.info("Creating game dimension table")
-
-        games = (
-            pitch_data.groupby(["game_pk", "game_date", "home_team", "away_team"])
-            .agg({"inning": "max", "pitcher": "count"})  # Count of pitches
-            .reset_index()
-        )
-
-        games["game_key"] = range(1, len(games) + 1)
-        games["season"] = 2025
-        games["game_type"] = "R"  # Regular season
-        games["day_of_week"] = pd.to_datetime(games["game_date"]).dt.day_name()
-        games["stadium"] = games["home_team"].map(
-            {"TOR": "Rogers Centre", "COL": "Coors Field"}
-        )
-        games["weather_temp"] = 72  # Default temperature
-        games["weather_condition"] = "Clear"
-        games["total_pitches"] = games["pitcher"]  # Rename the count column
-
-        games = games.drop("pitcher", axis=1)
-
-        return games[
-            [
-                "game_key",
-                "game_pk",
-                "game_date",
-                "season",
-                "game_type",
-                "home_team",
-                "away_team",
-                "stadium",
-                "day_of_week",
-                "weather_temp",
-                "weather_condition",
-                "total_pitches",
-            ]
-        ]
+        return dimensions.create_game_dimension(pitch_data, self.stadiums)
 
     def create_count_dimension(self) -> pd.DataFrame:
         """Create count dimension table with all possible ball/strike combinations."""
         logger.info("Creating count dimension table")
+        return dimensions.create_count_dimension()
 
-        counts = []
-        count_key = 1
-
-        for balls in range(4):  # 0-3 balls
-            for strikes in range(3):  # 0-2 strikes
-                counts.append(
-                    {
-                        "count_key": count_key,
-                        "balls": balls,
-                        "strikes": strikes,
-                        "count_display": f"{balls}-{strikes}",
-                        "count_category": self.categorize_count(balls, strikes),
-                    }
+    def categorize_count(self, balls: int, strikes: int) -> str:
+        """Categorize the count as pitcher's count, hitter's count, or neutral."""
+        return dimensions.categorize_count(balls, strikes)
+
+    def start_run(self, run_name: str) -> RunInstrumentation:
+        """Start measuring a run; stages are recorded with ``self.metrics.stage``."""
+        self.write_reports = []
+        self.metrics = RunInstrumentation.from_config(run_name, self.config, self.data_dir)
+        return self.metrics
+
+    def write_model(self, model: str, tables: Dict[str, Union[pd.DataFrame, pa.Table]]):
+        """Write a model's tables to the configured output formats concurrently."""
+        reports = write_tables(
+            tables,
+            f"{self.data_dir}/processed/{model}",
+            formats=self.output_formats,
+            max_workers=self.max_workers,
+            parquet_options=self.parquet_options,
+        )
+        self.write_reports.extend(reports)
+        return reports
+
+    def write_model_stage(self, model: str, tables: Dict[str, Union[pd.DataFrame, pa.Table]]):
+        """:meth:`write_model` measured as a ``write_{model}`` stage."""
+        with self.metrics.stage(f"write_{model}", rows_in=table_rows(tables)) as stage:
+            stage["bytes_written"] = sum(report["bytes"] for report in self.write_model(model, tables))
+
+    def finish_outputs(self):
+        """Log what this run wrote, refresh the manifest and write the run report."""
+        self.log_write_summary()
+        manifest_path = write_manifest(f"{self.data_dir}/processed")
+        logger.info(f"Manifest written to {manifest_path}")
+        if self.snapshots["enabled"]:
+            with self.metrics.stage("snapshots") as stage:
+                snapshot_manifest = write_snapshots(
+                    f"{self.data_dir}/processed",
+                    self.snapshots["directory"],
+                    self.snapshots["compression"],
+                    self.snapshots["models"],
                 )
-                count_key += 1
+                stage["rows_out"] = sum(entry["rows"] for entry in snapshot_manifest["tables"])
+                stage["bytes_written"] = sum(entry["bytes"] for entry in snapshot_manifest["tables"])
+        self.metrics.write(self.openmetrics)
 
-        return pd.DataFrame(counts)
+    def hot_obt(self, tables: Dict[str, Union[pd.DataFrame, pa.Table]]) -> Dict:
+        """OBT tables as written under the materialization policy; empty for a view."""
+        if self.obt["materialization"] == "view":
+            return {}
+        if self.obt["materialization"] == "table":
+            return tables
+        columns = self.obt["hot_columns"]
+        return {
+            name: table.select(columns) if isinstance(table, pa.Table) else table[columns]
+            for name, table in tables.items()
+        }
 
-    def categorize_count(self, balls: int, strikes: int) -> str:
-        """Categorize the count as pitcher's count, hitter's count, or neutral."""
-        if strikes > balls:
-            return "Pitcher's Count"
-        elif balls > strikes:
-            return "Hitter's Count"
-        else:
-            return "Neutral Count"
+    def remove_obt_outputs(self):
+        """Delete OBT files left by an earlier run, so a view OBT isn't shadowed by stale data."""
+        model_dir = Path(self.data_dir) / "processed" / "obt"
+        for fmt in self.output_formats:
+            remove_path(model_dir / f"one_big_table.{fmt}")
+        remove_path(model_dir / "one_big_table")
+        logger.info("OBT is materialized as a view over the star tables, no OBT files written")
+
+    def log_write_summary(self):
+        total_bytes = sum(report["bytes"] for report in self.write_reports)
+        total_seconds = sum(report["seconds"] for report in self.write_reports)
+        logger.info(
+            f"Wrote {len(self.write_reports)} files, {total_bytes} bytes, "
+            f"{total_seconds:.2f}s of serialization"
+        )
 
     def create_snowflake_schema(
         self,
@@ -198,22 +394,19 @@ class MLBDataPipeline:
         player_dim: pd.DataFrame,
         game_dim: pd.DataFrame,
         count_dim: pd.DataFrame,
-    ):
+    ) -> Dict[str, pd.DataFrame]:
         """Create and save snowflake schema (normalized)."""
         from etl.transforms.snowflake_schema import create_snowflake_schema
 
-        snowflake_tables = create_snowflake_schema(pitch_data, player_dim)
+        snowflake_tables = create_snowflake_schema(
+            pitch_data, player_dim, game_dim, count_dim
+        )
 
         # Save each table
-        for table_name, table_df in snowflake_tables.items():
-            table_df.to_csv(
-                f"{self.data_dir}/processed/snowflake/{table_name}.csv", index=False
-            )
-            table_df.to_parquet(
-                f"{self.data_dir}/processed/snowflake/{table_name}.parquet", index=False
-            )
+        self.write_model("snowflake", snowflake_tables)
 
         logger.info("Snowflake schema tables saved")
+        return snowflake_tables
 
     def create_one_big_table_schema(
         self,
@@ -221,76 +414,891 @@ class MLBDataPipeline:
         player_dim: pd.DataFrame,
         game_dim: pd.DataFrame,
         count_dim: pd.DataFrame,
-    ):
+    ) -> pd.DataFrame:
         """Create and save one big table (denormalized)."""
         from etl.transforms.one_big_table import create_one_big_table
 
         big_table = create_one_big_table(pitch_data, game_dim, player_dim, count_dim)
 
         # Save the big table
-        big_table.to_csv(
-            f"{self.data_dir}/processed/obt/one_big_table.csv", index=False
-        )
-        big_table.to_parquet(
-            f"{self.data_dir}/processed/obt/one_big_table.parquet", index=False
-        )
+        self.write_model("obt", {"one_big_table": big_table})
 
         logger.info("One big table saved")
+        return big_table
+
+    def run_pipeline(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        from_raw: bool = False,
+    ):
+        """
+        Run the complete data pipeline.
+
+        Args:
+            start_date: First game date in YYYY-MM-DD format, defaults to the config
+            end_date: Last game date in YYYY-MM-DD format, defaults to the config
+            from_raw: Rebuild from the raw store instead of downloading again
+        """
+        start_date, end_date = self.date_range(start_date, end_date)
+        if self.streaming:
+            return self.run_streaming_pipeline(start_date, end_date, from_raw)
+        if self.engine == "arrow":
+            return self.run_arrow_pipeline(start_date, end_date, from_raw)
+        if self.engine == "duckdb":
+            return self.run_duckdb_pipeline(start_date, end_date, from_raw)
 
-    def run_pipeline(self):
-        """Run the complete data pipeline."""
         logger.info("Starting MLB data pipeline")
+        from etl.transforms import keys, one_big_table, rollups, snowflake_schema, star_schema
+        from etl.transforms import player_history as player_history_module
 
-        # Download pitch data
-        pitch_data = self.download_statcast_data("2025-08-04", "2025-08-06")
+        cache = self.stage_cache
+        metrics = self.start_run("pipeline")
 
-        # Create dimensions
-        game_dim = self.create_game_dimension(pitch_data)
-        count_dim = self.create_count_dimension()
+        # Download pitch data; remote fetches are reused for download_ttl_seconds,
+        # raw store reads for as long as the partitions are unchanged
+        if from_raw:
+            stage_inputs = {"raw_parts": self.raw_signature(start_date, end_date)}
+            load = lambda: {"pitches": self.load_raw_statcast(start_date, end_date)}
+            max_age = None
+        else:
+            stage_inputs = {
+                "dates": [start_date, end_date],
+                "teams": self.teams,
+                "seasons": self.seasons,
+                "savant": self.savant_base,
+            }
+            load = lambda: {"pitches": self.download_statcast_data(start_date, end_date)}
+            max_age = self.download_ttl_seconds
+        with metrics.stage("download") as stage:
+            pitch_tables, pitch_fp, stage["cache_hit"] = cache.run(
+                "download", stage_inputs, load, max_age_seconds=max_age, hash_output=True
+            )
+            pitch_data = pitch_tables["pitches"]
+            stage["rows_out"] = len(pitch_data)
 
         # Get unique player IDs and fetch player data
         pitcher_ids = pitch_data["pitcher"].dropna().unique().tolist()
         batter_ids = pitch_data["batter"].dropna().unique().tolist()
-        all_player_ids = list(set(pitcher_ids + batter_ids))
+        all_player_ids = sorted(set(pitcher_ids + batter_ids))
 
         # Get all players (not limited to 10)
-        player_dim = self.get_player_data(all_player_ids)
+        with metrics.stage("players", rows_in=len(all_player_ids)) as stage:
+            player_tables, player_fp, stage["cache_hit"] = cache.run(
+                "players",
+                {"player_ids": [int(i) for i in all_player_ids], "api": self.mlb_api_base},
+                lambda: {"dim_player": self.get_player_data(all_player_ids)},
+                # Cached snapshots must not outlive the player records they hold
+                max_age_seconds=min(self.download_ttl_seconds, self.player_ttl_seconds),
+                hash_output=True,
+            )
+            player_dim = player_tables["dim_player"]
+            stage["rows_out"] = len(player_dim)
 
-        # Create star schema with proper foreign keys
-        from etl.transforms.star_schema import create_star_schema
+        # Record player changes as new versions of the star schema's dim_player
+        with metrics.stage("player_versions", rows_in=len(player_dim)) as stage:
+            player_history, changed_players = self.update_player_dimension(player_dim, start_date)
+            history_fp = str(pd.util.hash_pandas_object(player_history, index=False).sum())
+            stage["rows_out"] = len(changed_players)
 
-        star_tables = create_star_schema(pitch_data, game_dim, player_dim, count_dim)
+        # Build the shared dimensions once and reuse them for every model
+        logger.info("Building shared dimensions")
+        with metrics.stage("dimensions", rows_in=len(pitch_data)) as stage:
+            shared_dims, dims_fp, stage["cache_hit"] = cache.run(
+                "dimensions",
+                {"pitches": pitch_fp, "players": player_fp, "stadiums": self.stadiums},
+                lambda: dimensions.build_dimensions(pitch_data, player_dim, self.stadiums),
+                code=code_version(dimensions),
+            )
+            stage["rows_out"] = table_rows(shared_dims)
+        game_dim = shared_dims["dim_game"]
+        count_dim = shared_dims["dim_count"]
+        model_inputs = {"pitches": pitch_fp, "dimensions": dims_fp}
+
+        # Create star schema with proper foreign keys
+        with metrics.stage("star", rows_in=len(pitch_data)) as stage:
+            star_tables, star_key, star_hit = cache.run(
+                "star",
+                {**model_inputs, "player_history": history_fp},
+                lambda: create_star_schema(pitch_data, game_dim, player_history, count_dim),
+                code=code_version(star_schema, keys, player_history_module),
+            )
+            stage.update(cache_hit=star_hit, rows_out=table_rows(star_tables))
 
         # Save star schema data
-        game_dim.to_csv(f"{self.data_dir}/processed/star/dim_game.csv", index=False)
-        count_dim.to_csv(f"{self.data_dir}/processed/star/dim_count.csv", index=False)
-        player_dim.to_csv(f"{self.data_dir}/processed/star/dim_player.csv", index=False)
-        star_tables["fact_pitch"].to_csv(
-            f"{self.data_dir}/processed/star/fact_pitch.csv", index=False
+        star_output = {
+            "dim_game": game_dim,
+            "dim_count": count_dim,
+            "dim_player": player_history,
+            "fact_pitch": star_tables["fact_pitch"],
+        }
+        star_names = list(star_output)
+        if not (star_hit and self.outputs_current("star", star_names, star_key)):
+            # The player dimension is only rewritten when a version changed
+            if changed_players.empty and self.outputs_exist("star", ["dim_player"]):
+                del star_output["dim_player"]
+            self.write_model_stage("star", star_output)
+            self.stamp_outputs("star", star_names, star_key)
+
+        # Pre-aggregate the facts for dashboard queries
+        with metrics.stage("rollups", rows_in=len(star_tables["fact_pitch"])) as stage:
+            rollup_tables, rollup_key, rollup_hit = cache.run(
+                "rollups",
+                model_inputs,
+                lambda: create_rollups(star_tables["fact_pitch"], game_dim, count_dim),
+                code=code_version(rollups, star_schema, keys),
+            )
+            stage.update(cache_hit=rollup_hit, rows_out=table_rows(rollup_tables))
+        if not (rollup_hit and self.outputs_current("rollup", rollup_tables, rollup_key)):
+            self.write_model_stage("rollup", rollup_tables)
+            self.stamp_outputs("rollup", rollup_tables, rollup_key)
+
+        # Create and save snowflake schema
+        with metrics.stage("snowflake", rows_in=len(pitch_data)) as stage:
+            snowflake_tables, snowflake_key, snowflake_hit = cache.run(
+                "snowflake",
+                model_inputs,
+                lambda: snowflake_schema.create_snowflake_schema(
+                    pitch_data, player_dim, game_dim, count_dim
+                ),
+                code=code_version(snowflake_schema, keys),
+            )
+            stage.update(cache_hit=snowflake_hit, rows_out=table_rows(snowflake_tables))
+        if not (
+            snowflake_hit and self.outputs_current("snowflake", snowflake_tables, snowflake_key)
+        ):
+            self.write_model_stage("snowflake", snowflake_tables)
+            self.stamp_outputs("snowflake", snowflake_tables, snowflake_key)
+
+        # Create and save one big table, unless it is a view over the star tables
+        big_table = None
+        if self.obt["materialization"] == "view":
+            self.remove_obt_outputs()
+        else:
+            with metrics.stage("obt", rows_in=len(pitch_data)) as stage:
+                obt_tables, obt_key, obt_hit = cache.run(
+                    "obt",
+                    {**model_inputs, "obt": self.obt},
+                    lambda: self.hot_obt(
+                        {
+                            "one_big_table": one_big_table.create_one_big_table(
+                                pitch_data, game_dim, player_dim, count_dim
+                            )
+                        }
+                    ),
+                    code=code_version(one_big_table, keys),
+                )
+                stage.update(cache_hit=obt_hit, rows_out=table_rows(obt_tables))
+            if not (obt_hit and self.outputs_current("obt", obt_tables, obt_key)):
+                self.write_model_stage("obt", obt_tables)
+                self.stamp_outputs("obt", obt_tables, obt_key)
+            big_table = obt_tables["one_big_table"]
+
+        # Make sure the three models agree with each other
+        with metrics.stage("conformance", rows_in=len(star_tables["fact_pitch"])):
+            star_tables.update(shared_dims)
+            for issue in check_conformance(star_tables, snowflake_tables, big_table):
+                logger.warning(f"Conformance check failed: {issue}")
+
+        self.finish_outputs()
+
+        logger.info("Pipeline completed successfully")
+
+    def stream_chunks(self, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """Date chunks of a streaming run, within the configured season windows."""
+        windows = plan_shards(
+            start_date, end_date, [], self.seasons, self.season_start, self.season_end
+        )
+        return [
+            chunk
+            for window_start, window_end, _ in windows
+            for chunk in date_chunks(window_start, window_end, self.chunk_days)
+        ]
+
+    def run_streaming_pipeline(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        from_raw: bool = False,
+    ):
+        """
+        Run the star schema, OBT and rollups as a stream of date chunks.
+
+        Three stages overlap instead of running one after the other:
+
+        - Downloads (or raw store reads) of the next chunks run on a thread
+          pool, at most ``pipeline.queue_size`` chunks ahead of the builder.
+          As soon as a chunk is parsed, lookups of player IDs not seen before
+          start on a background thread.
+        - The calling thread turns each chunk, in date order, into star
+          schema facts and OBT rows. New games and players are merged into
+          the dimensions as they appear, as in incremental runs. Games and
+          players already in processed/star keep their keys, and
+          changed players get a version starting at ``start_date``.
+        - A writer thread replaces the chunk's game_date partitions of
+          star/fact_pitch and obt/one_big_table, behind a bounded queue.
+
+        Once the stream is drained the dimensions are written and the
+        rollups are rebuilt from the fact dataset. Wall time approaches the
+        slowest of the three stages rather than their sum. The stage cache
+        is not used, and, as with incremental runs, the snowflake schema is
+        left to full runs: snowflake files of an earlier run are removed so
+        they can't be read as current. CSV and single-file Parquet copies of
+        the facts are rewritten from the datasets at the end, see
+        :meth:`write_streamed_facts`.
+
+        Args:
+            start_date: First game date in YYYY-MM-DD format, defaults to the config
+            end_date: Last game date in YYYY-MM-DD format, defaults to the config
+            from_raw: Stream the raw store's partitions instead of downloading
+        """
+        import pyarrow.dataset as ds
+
+        from etl.transforms.one_big_table import create_one_big_table
+
+        start_date, end_date = self.date_range(start_date, end_date)
+        chunks = self.stream_chunks(start_date, end_date)
+        logger.info(
+            f"Starting streaming MLB data pipeline: {len(chunks)} chunks, "
+            f"{self.max_workers} download workers, queue of {self.queue_size}"
         )
+        metrics = self.start_run("pipeline_streaming")
+        processed = f"{self.data_dir}/processed"
+        obt_view = self.obt["materialization"] == "view"
+        if obt_view:
+            self.remove_obt_outputs()
+        self.remove_snowflake_outputs()
 
-        # Also save as parquet
-        game_dim.to_parquet(
-            f"{self.data_dir}/processed/star/dim_game.parquet", index=False
+        raw_players = self.raw_store.player_writer()
+        lookahead = PlayerLookahead(lambda ids: self.get_player_data(ids, raw_players))
+        team_filters = self.teams if self.split_teams and self.teams else ["|".join(self.teams)]
+        client = StatcastClient(
+            start_date,
+            end_date,
+            base_url=self.savant_base,
+            max_workers=self.max_workers,
+            download_dir=f"{self.data_dir}/raw/statcast",
+            raw_store=self.raw_store,
+            http_mode=self.http["mode"],
+            http_archive=self.http["archive_path"],
         )
-        count_dim.to_parquet(
-            f"{self.data_dir}/processed/star/dim_count.parquet", index=False
+
+        def load(chunk: Tuple[str, str]) -> pd.DataFrame:
+            chunk_start, chunk_end = chunk
+            if from_raw:
+                pitches = self.raw_store.read_statcast(chunk_start, chunk_end)
+            else:
+                frames = [client.fetch_chunk(chunk_start, chunk_end, teams) for teams in team_filters]
+                pitches = concat_statcast(frames)
+                if len(frames) > 1 and not pitches.empty:
+                    pitches = pitches.drop_duplicates(subset=PITCH_KEY, ignore_index=True)
+            if not pitches.empty:
+                lookahead.submit(pd.concat([pitches["pitcher"], pitches["batter"]]).dropna().unique())
+            return pitches
+
+        fact_columns: Dict[Tuple[str, str], List[str]] = {}
+
+        def write_partitions(model: str, tables: Dict[str, pd.DataFrame]):
+            for name, table in tables.items():
+                fact_columns.setdefault((model, name), list(table.columns))
+            self.write_reports.extend(
+                write_parquet_partitions(tables, f"{processed}/{model}", self.parquet_options)
+            )
+
+        count_dim = dimensions.create_count_dimension()
+        game_dim = self.read_output("star", "dim_game")
+        player_history = self.read_output("star", "dim_player")
+        if player_history is None or "player_key" not in player_history:
+            player_history = pd.DataFrame({"player_id": pd.Series(dtype="int64")})
+            next_key = 1
+        else:
+            next_key = int(player_history["player_key"].max()) + 1
+        player_dim = pd.DataFrame()
+        merged_ids = set()
+        players_changed = False
+
+        writer = BackgroundWorker("partition-writer", self.queue_size)
+        rows = 0
+        download_wait = build_seconds = 0.0
+        with metrics.stage("stream") as stage:
+            try:
+                stream = prefetch(load, chunks, self.max_workers, self.queue_size)
+                while True:
+                    waited = time.perf_counter()
+                    pitches = next(stream, None)
+                    download_wait += time.perf_counter() - waited
+                    if pitches is None:
+                        break
+                    if pitches.empty:
+                        continue
+
+                    player_ids = pd.concat([pitches["pitcher"], pitches["batter"]]).dropna().unique()
+                    new_ids = [int(i) for i in player_ids if int(i) not in merged_ids]
+                    if new_ids:
+                        snapshot = lookahead.players(new_ids)
+                        merged_ids.update(new_ids)
+                    if new_ids and not snapshot.empty:
+                        # Only the new players' versions are merged, not the whole history
+                        versioned = player_history["player_id"].isin(new_ids)
+                        merged, changed = merge_player_versions(
+                            player_history[versioned], snapshot, start_date, next_key
+                        )
+                        player_history = pd.concat(
+                            [player_history[~versioned], merged], ignore_index=True
+                        )
+                        next_key = max(next_key, int(merged["player_key"].max()) + 1)
+                        players_changed |= not changed.empty
+                        player_dim = pd.concat([player_dim, snapshot], ignore_index=True)
+
+                    started = time.perf_counter()
+                    game_dim = merge_game_dimension(
+                        game_dim, dimensions.create_game_dimension(pitches, self.stadiums)
+                    )
+                    chunk_history = player_history[player_history["player_id"].isin(player_ids)]
+                    fact = create_star_schema(pitches, game_dim, chunk_history, count_dim)["fact_pitch"]
+                    build_seconds += time.perf_counter() - started
+                    writer.submit(write_partitions, "star", {"fact_pitch": fact})
+
+                    if not obt_view:
+                        started = time.perf_counter()
+                        chunk_players = player_dim[player_dim["player_id"].isin(player_ids)]
+                        big_table = self.hot_obt(
+                            {
+                                "one_big_table": create_one_big_table(
+                                    pitches, game_dim, chunk_players, count_dim
+                                )
+                            }
+                        )
+                        build_seconds += time.perf_counter() - started
+                        writer.submit(write_partitions, "obt", big_table)
+                    rows += len(pitches)
+            finally:
+                lookahead.close()
+                raw_players.close()
+                writer.join()
+            if raw_players.count:
+                logger.info(f"Saved {raw_players.count} raw MLB API responses to {raw_players.path}")
+            stage.update(
+                rows_out=rows,
+                download_wait_seconds=download_wait,
+                player_wait_seconds=lookahead.wait_seconds,
+                build_seconds=build_seconds,
+                write_seconds=writer.busy_seconds,
+                write_wait_seconds=writer.wait_seconds,
+            )
+        logger.info(
+            f"Streamed {rows} pitches: waited {download_wait:.2f}s on downloads and "
+            f"{lookahead.wait_seconds:.2f}s on players, built for {build_seconds:.2f}s, "
+            f"wrote for {writer.busy_seconds:.2f}s in the background"
         )
-        player_dim.to_parquet(
-            f"{self.data_dir}/processed/star/dim_player.parquet", index=False
+        if rows == 0:
+            logger.error("No Statcast data to process")
+            return
+
+        star_dims = {"dim_game": game_dim, "dim_count": count_dim}
+        if players_changed or not self.outputs_exist("star", ["dim_player"]):
+            star_dims["dim_player"] = player_history
+        self.write_model_stage("star", star_dims)
+
+        # Rollups span whole seasons, so they are rebuilt from every fact partition
+        facts = ds.dataset(f"{processed}/star/fact_pitch", partitioning="hive")
+        with metrics.stage("rollups", rows_in=facts.count_rows()) as stage:
+            rollup_tables = create_rollups(facts, game_dim, count_dim)
+            stage["rows_out"] = table_rows(rollup_tables)
+        self.write_model_stage("rollup", rollup_tables)
+        self.write_streamed_facts(fact_columns)
+        self.finish_outputs()
+
+        logger.info("Streaming pipeline completed successfully")
+
+    def write_streamed_facts(self, fact_columns: Dict[Tuple[str, str], List[str]]):
+        """
+        Write the streamed fact datasets in the formats partitions can't serve.
+
+        Streaming writes star/fact_pitch and obt/one_big_table as game_date
+        partitions. CSV files, and single-file Parquet under the "file"
+        layout, are rewritten from the whole dataset once the stream is
+        drained, so they hold the full history like the dataset does.
+
+        Args:
+            fact_columns: Column order of each (model, table) as it was built
+        """
+        import pyarrow.dataset as ds
+
+        options = {**PARQUET_DEFAULTS, **self.parquet_options}
+        for (model, name), columns in fact_columns.items():
+            partitioned = options["layout"] == "partitioned" and name in options["partitioned_tables"]
+            formats = [fmt for fmt in self.output_formats if not (partitioned and fmt == "parquet")]
+            if not formats:
+                continue
+            model_dir = f"{self.data_dir}/processed/{model}"
+            dataset = ds.dataset(f"{model_dir}/{name}", partitioning="hive")
+            with self.metrics.stage(f"write_{model}_files", rows_in=dataset.count_rows()) as stage:
+                table = dataset.to_table(columns=[c for c in columns if c in dataset.schema.names])
+                reports = write_tables(
+                    {name: table},
+                    model_dir,
+                    formats=formats,
+                    max_workers=self.max_workers,
+                    parquet_options=self.parquet_options,
+                )
+                self.write_reports.extend(reports)
+                stage["bytes_written"] = sum(report["bytes"] for report in reports)
+
+    def remove_snowflake_outputs(self):
+        """Delete snowflake files left by a full run, which streaming runs don't keep up to date."""
+        model_dir = Path(self.data_dir) / "processed" / "snowflake"
+        stale = list(model_dir.iterdir()) if model_dir.is_dir() else []
+        if stale:
+            for path in stale:
+                remove_path(path)
+            logger.warning(
+                f"Streaming runs don't build the snowflake schema, removed {len(stale)} "
+                f"outputs of an earlier run from {model_dir}"
+            )
+
+    def raw_signature(self, start_date: str, end_date: str) -> List[List]:
+        """Name, size and modification time of every raw part in a date range."""
+        return [
+            [str(path.relative_to(self.raw_store.root)), stat.st_size, stat.st_mtime_ns]
+            for game_date in self.raw_store.statcast_dates()
+            if start_date <= game_date <= end_date
+            for path in sorted(self.raw_store.statcast_partition(game_date).glob("*.parquet"))
+            for stat in [path.stat()]
+        ]
+
+    def output_paths(self, model: str, tables: Iterable[str]) -> List[Path]:
+        """Files and dataset directories the configured formats and layout write for a model."""
+        options = {**PARQUET_DEFAULTS, **self.parquet_options}
+        model_dir = Path(self.data_dir) / "processed" / model
+        return [
+            model_dir / name
+            if fmt == "parquet"
+            and options["layout"] == "partitioned"
+            and name in options["partitioned_tables"]
+            else model_dir / f"{name}.{fmt}"
+            for name in tables
+            for fmt in self.output_formats
+        ]
+
+    def outputs_exist(self, model: str, tables: Iterable[str]) -> bool:
+        """Whether every output of a model is on disk in the configured formats and layout."""
+        return all(path.exists() for path in self.output_paths(model, tables))
+
+    def output_signature(self, model: str, tables: Iterable[str]) -> Optional[List]:
+        """Name, size and modification time of every output file, None if one is missing."""
+        signature = []
+        for path in self.output_paths(model, tables):
+            if not path.exists():
+                return None
+            files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+            signature.extend(
+                [str(f.relative_to(path.parent)), stat.st_size, stat.st_mtime_ns]
+                for f in files
+                for stat in [f.stat()]
+            )
+        return signature
+
+    def output_stamp(self, model: str, tables: Iterable[str], stage_key: str) -> Optional[Dict]:
+        """What a model's stamp holds when its outputs were written from ``stage_key``."""
+        signature = self.output_signature(model, tables)
+        if signature is None:
+            return None
+        return {
+            "stage_key": stage_key,
+            "formats": self.output_formats,
+            "parquet": {**PARQUET_DEFAULTS, **self.parquet_options},
+            "files": signature,
+        }
+
+    def outputs_current(self, model: str, tables: Iterable[str], stage_key: str) -> bool:
+        """
+        Whether a model's files on disk were written from the stage output ``stage_key``.
+
+        A cache hit alone does not mean the files hold that output: another
+        run (a different date range, a streaming or incremental run) may have
+        rewritten them since. The stamp written by :meth:`stamp_outputs`
+        records the stage key, formats, Parquet layout and the size and
+        modification time of every file, and all of them must still match.
+        """
+        path = Path(self.data_dir) / "processed" / model / OUTPUT_STAMP
+        if not path.exists():
+            return False
+        with open(path, encoding="utf-8") as f:
+            stamp = json.load(f)
+        return stamp == self.output_stamp(model, tables, stage_key)
+
+    def stamp_outputs(self, model: str, tables: Iterable[str], stage_key: str):
+        """Record that a model's files were just written from the stage output ``stage_key``."""
+        path = Path(self.data_dir) / "processed" / model / OUTPUT_STAMP
+        stamp = self.output_stamp(model, tables, stage_key)
+        if stamp is None:
+            remove_path(path)
+            return
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stamp, f)
+        os.replace(tmp_path, path)
+
+    def write_incremental_facts(
+        self, conn, model: str, name: str, partitions: Union[pd.DataFrame, pa.Table]
+    ):
+        """
+        Write an incremental run's facts in every configured output format.
+
+        Parquet facts are kept as a game_date-partitioned dataset whatever
+        output.parquet.layout says, and only the window's partitions are
+        replaced, so a nightly run writes the size of the window rather than
+        of the history; a single file left by a full run is converted once.
+        CSV files hold the whole history, so they are only rewritten from the
+        merged DuckDB table with pipeline.incremental_rewrite_files, and
+        removed otherwise rather than left stale.
+
+        Args:
+            conn: DuckDB connection holding the merged table
+            model: Model directory, "star" or "obt"
+            name: Table name, "fact_pitch" or "one_big_table"
+            partitions: Rows of the window's game dates
+        """
+        model_dir = f"{self.data_dir}/processed/{model}"
+        if "parquet" in self.output_formats:
+            self.write_reports.extend(
+                write_parquet_partitions({name: partitions}, model_dir, self.parquet_options)
+            )
+
+        whole_file_formats = [fmt for fmt in self.output_formats if fmt != "parquet"]
+        if not whole_file_formats:
+            return
+        if self.incremental_rewrite_files:
+            table = "star_fact_pitch" if name == "fact_pitch" else name
+            history = conn.execute(
+                f"SELECT * FROM {table} ORDER BY game_date, {', '.join(PITCH_KEY)}"
+            ).df()
+            self.write_reports.extend(
+                write_tables(
+                    {name: history},
+                    model_dir,
+                    formats=whole_file_formats,
+                    max_workers=self.max_workers,
+                    parquet_options=self.parquet_options,
+                )
+            )
+            return
+        for fmt in whole_file_formats:
+            stale = Path(model_dir) / f"{name}.{fmt}"
+            if stale.exists():
+                remove_path(stale)
+                logger.warning(
+                    f"Removed {stale}: incremental runs only replace Parquet partitions, "
+                    f"set pipeline.incremental_rewrite_files to rewrite it from the whole history"
+                )
+
+    def run_incremental(
+        self,
+        end_date: Optional[str] = None,
+        default_start: Optional[str] = None,
+        lookback_days: int = 0,
+    ):
+        """
+        Load only the game dates after the last successful run.
+
+        The Statcast high-water mark is kept in data/state/pipeline_state.json.
+        New pitches are turned into star schema facts and OBT rows that replace
+        their game_date partitions, both in the DuckDB database and in the
+        Parquet datasets (see write_incremental_facts); dimension rows are
+        upserted, and known games keep their game_key. Changed players get a
+        new dim_player version starting at the window's first date, and only
+        those rows are upserted. The rollups of the window's seasons are
+        aggregated again from the merged facts. Rerunning a window is
+        idempotent, so the state only advances after everything is written,
+        and only past in-season dates that returned pitches (see
+        incremental.settled_through).
+
+        The snowflake schema's player_key is a dense sequence over all
+        players, so it is not maintained incrementally; rebuild it with a
+        full run.
+
+        Args:
+            end_date: Last game date to load, defaults to yesterday
+            default_start: First game date when no run has been recorded yet
+            lookback_days: Days before the high-water mark to refetch for corrections
+
+        Raises:
+            ValueError: If the database holds the tables as views (make export-views)
+        """
+        import duckdb
+
+        from etl.duckdb_engine import materialize_one_big_table, relation_type
+        from etl.transforms.one_big_table import create_one_big_table
+
+        state = PipelineState(f"{self.data_dir}/state/pipeline_state.json")
+        window = incremental_window(
+            state.high_water_mark("statcast"),
+            default_start or self.date_range()[0],
+            end_date,
+            lookback_days,
         )
-        star_tables["fact_pitch"].to_parquet(
-            f"{self.data_dir}/processed/star/fact_pitch.parquet", index=False
+        if window is None:
+            logger.info(
+                f"Already loaded through {state.high_water_mark('statcast')}, nothing to do"
+            )
+            return
+        start_date, end_date = window
+        logger.info(f"Incremental run for game dates {start_date} to {end_date}")
+        metrics = self.start_run("incremental")
+
+        os.makedirs(os.path.dirname(self.database_path) or ".", exist_ok=True)
+        conn = duckdb.connect(self.database_path)
+        try:
+            # Fail before downloading anything if the tables were loaded as views
+            targets = ["star_dim_game", "star_dim_player", "star_dim_count", "star_fact_pitch"]
+            targets += [f"rollup_{name}" for name in ROLLUPS]
+            if self.obt["materialization"] != "view":
+                targets.append("one_big_table")
+            require_tables(conn, targets)
+
+            with metrics.stage("download") as stage:
+                pitch_data = self.download_statcast_data(start_date, end_date, raise_errors=True)
+                stage["rows_out"] = len(pitch_data)
+
+            if not pitch_data.empty:
+                player_ids = pd.unique(
+                    pd.concat([pitch_data["pitcher"], pitch_data["batter"]]).dropna()
+                ).tolist()
+                with metrics.stage("players", rows_in=len(player_ids)) as stage:
+                    player_dim = self.get_player_data(player_ids)
+                    stage["rows_out"] = len(player_dim)
+
+                with metrics.stage("player_versions", rows_in=len(player_dim)) as stage:
+                    existing_players = read_table(conn, "star_dim_player")
+                    if existing_players is not None and "player_key" not in existing_players:
+                        # Built before player versioning: the history starts from this snapshot
+                        conn.execute("DROP TABLE star_dim_player")
+                        if table_exists(conn, "star_fact_pitch"):
+                            for column in ["pitcher_key", "batter_key"]:
+                                conn.execute(
+                                    f"ALTER TABLE star_fact_pitch ADD COLUMN IF NOT EXISTS {column} BIGINT"
+                                )
+                    player_history, changed_players = self.update_player_dimension(
+                        player_dim, start_date, existing_players
+                    )
+                    stage["rows_out"] = len(changed_players)
+
+                with metrics.stage("models", rows_in=len(pitch_data)) as stage:
+                    count_dim = dimensions.create_count_dimension()
+                    game_dim = merge_game_dimension(
+                        read_table(conn, "star_dim_game"),
+                        dimensions.create_game_dimension(pitch_data, self.stadiums),
+                    )
+                    fact = create_star_schema(pitch_data, game_dim, player_history, count_dim)[
+                        "fact_pitch"
+                    ]
+                    big_table = pd.DataFrame()
+                    if self.obt["materialization"] != "view":
+                        big_table = self.hot_obt(
+                            {
+                                "one_big_table": create_one_big_table(
+                                    pitch_data, game_dim, player_dim, count_dim
+                                )
+                            }
+                        )["one_big_table"]
+                    stage["rows_out"] = len(fact) + len(big_table)
+
+                with metrics.stage("upsert", rows_in=len(fact) + len(big_table)):
+                    upsert_dataframe(conn, "star_dim_game", game_dim, ["game_pk"])
+                    if not changed_players.empty:
+                        upsert_dataframe(conn, "star_dim_player", changed_players, ["player_key"])
+                    upsert_dataframe(conn, "star_dim_count", count_dim, ["count_key"])
+                    upsert_dataframe(conn, "star_fact_pitch", fact, ["game_date"])
+                    if self.obt["materialization"] == "view":
+                        if relation_type(conn, "one_big_table") != "VIEW":
+                            materialize_one_big_table(conn, "view")
+                    else:
+                        upsert_dataframe(conn, "one_big_table", big_table, ["game_date"])
+
+                # Rollup grains don't cross seasons, so only the window's seasons
+                # are aggregated again from the merged facts
+                window_games = game_dim["game_pk"].isin(fact["game_pk"])
+                seasons = sorted(game_dim.loc[window_games, "season"].unique().tolist())
+                with metrics.stage("rollups") as stage:
+                    conn.execute("BEGIN TRANSACTION")
+                    try:
+                        rollup_names = build_rollup_tables(conn, seasons=seasons)
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                    rollup_tables = {
+                        table[len("rollup_") :]: conn.execute(
+                            f"SELECT * FROM {table} ORDER BY ALL"
+                        ).df()
+                        for table in rollup_names
+                    }
+                    stage["rows_out"] = table_rows(rollup_tables)
+
+                # Dimensions are small and rewritten whole; facts replace partitions
+                star_dims = {"dim_game": game_dim, "dim_count": count_dim}
+                if not changed_players.empty:
+                    star_dims["dim_player"] = player_history
+                self.write_model_stage("star", star_dims)
+                with metrics.stage("write_partitions", rows_in=len(fact) + len(big_table)):
+                    self.write_incremental_facts(conn, "star", "fact_pitch", fact)
+                    if not big_table.empty:
+                        self.write_incremental_facts(conn, "obt", "one_big_table", big_table)
+                self.write_model_stage("rollup", rollup_tables)
+        finally:
+            conn.close()
+
+        self.finish_outputs()
+
+        last_game_date = None if pitch_data.empty else str(pitch_data["game_date"].max())
+        previous_mark = state.high_water_mark("statcast")
+        mark = settled_through(
+            start_date, end_date, last_game_date, self.season_start, self.season_end
+        )
+        if mark != end_date:
+            returned = f"no pitches after {last_game_date}" if last_game_date else "no pitches"
+            logger.warning(
+                f"Window {start_date} to {end_date} returned {returned}; "
+                f"its in-season dates without pitches stay in the next window"
+            )
+        # A lookback window may settle fewer dates than an earlier run did
+        if mark is None or (previous_mark is not None and mark <= previous_mark):
+            logger.warning(f"High-water mark stays at {previous_mark}")
+        else:
+            state.advance("statcast", mark, start_date=start_date, rows=len(pitch_data))
+        logger.info(
+            f"Incremental run loaded {len(pitch_data)} pitches, "
+            f"high-water mark {state.high_water_mark('statcast')}"
         )
 
-        # Create and save snowflake schema
-        self.create_snowflake_schema(pitch_data, player_dim, game_dim, count_dim)
+    def run_arrow_pipeline(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        from_raw: bool = False,
+    ):
+        """
+        Run the pipeline on Arrow tables end to end.
+
+        Parsing, dimension building, key resolution and writing all operate on
+        pyarrow tables with dictionary-encoded strings. Outputs carry the same
+        columns and values as the pandas path.
+        """
+        from etl.transforms.arrow_models import build_models_arrow
 
-        # Create and save one big table
-        self.create_one_big_table_schema(pitch_data, player_dim, game_dim, count_dim)
+        logger.info("Starting MLB data pipeline (arrow engine)")
+        start_date, end_date = self.date_range(start_date, end_date)
+        metrics = self.start_run("pipeline_arrow")
+
+        with metrics.stage("download") as stage:
+            if from_raw:
+                pitches = self.raw_store.read_statcast_table(start_date, end_date)
+            else:
+                pitches = self.download_statcast_data(start_date, end_date)
+            stage["rows_out"] = len(pitches)
+        if not isinstance(pitches, pa.Table) or pitches.num_rows == 0:
+            logger.error("No Statcast data to process")
+            return
+
+        player_ids = pc.unique(
+            pa.chunked_array(
+                pitches["pitcher"].chunks + pitches["batter"].chunks, pitches["pitcher"].type
+            ).drop_null()
+        ).to_pylist()
+        with metrics.stage("players", rows_in=len(player_ids)) as stage:
+            player_dim = self.get_player_data(player_ids)
+            stage["rows_out"] = len(player_dim)
+        with metrics.stage("player_versions", rows_in=len(player_dim)) as stage:
+            player_history, changed_players = self.update_player_dimension(player_dim, start_date)
+            stage["rows_out"] = len(changed_players)
+
+        with metrics.stage("models", rows_in=pitches.num_rows) as stage:
+            models = build_models_arrow(pitches, player_dim, self.stadiums, player_history)
+            stage["rows_out"] = sum(table_rows(tables) for tables in models.values())
+        star = models["star"]
+        with metrics.stage("rollups", rows_in=star["fact_pitch"].num_rows) as stage:
+            models["rollup"] = create_rollups(star["fact_pitch"], star["dim_game"], star["dim_count"])
+            stage["rows_out"] = table_rows(models["rollup"])
+        models["obt"] = self.hot_obt(models["obt"])
+        if not models["obt"]:
+            del models["obt"]
+            self.remove_obt_outputs()
+        for model, tables in models.items():
+            self.write_model_stage(model, tables)
+        self.finish_outputs()
 
         logger.info("Pipeline completed successfully")
 
+    def run_duckdb_pipeline(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        from_raw: bool = False,
+    ):
+        """
+        Run the transforms inside DuckDB.
+
+        Pitches are landed in the raw store as usual, then DuckDB reads the
+        Parquet partitions directly and builds every model table with SQL.
+        The tables are created in the DuckDB database, so no separate export
+        step is needed; copies in the configured formats are still written
+        under processed/.
+        """
+        from etl.duckdb_engine import DuckDBEngine
+
+        logger.info("Starting MLB data pipeline (duckdb engine)")
+        start_date, end_date = self.date_range(start_date, end_date)
+        metrics = self.start_run("pipeline_duckdb")
+
+        if not from_raw:
+            with metrics.stage("download") as stage:
+                stage["rows_out"] = sum(s["rows"] for s in self.fetch_statcast(start_date, end_date))
+        if not self.raw_store.statcast_dates():
+            logger.error("No Statcast data to process")
+            return
+
+        engine = DuckDBEngine(self.database_path)
+        try:
+            engine.register_raw_statcast(
+                str(self.raw_store.statcast_dir), start_date, end_date
+            )
+            player_ids = engine.player_ids()
+            with metrics.stage("players", rows_in=len(player_ids)) as stage:
+                player_dim = self.get_player_data(player_ids)
+                stage["rows_out"] = len(player_dim)
+            with metrics.stage("player_versions", rows_in=len(player_dim)) as stage:
+                player_history, changed_players = self.update_player_dimension(
+                    player_dim, start_date
+                )
+                stage["rows_out"] = len(changed_players)
+
+            with metrics.stage("models") as stage:
+                models = engine.build_models(
+                    player_dim, self.stadiums, self.obt, player_history
+                )
+                if "obt" not in models:
+                    self.remove_obt_outputs()
+                stage["rows_out"] = sum(
+                    engine.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                    for tables in models.values()
+                    for table in tables
+                )
+            with metrics.stage("export") as stage:
+                reports = engine.export(
+                    f"{self.data_dir}/processed",
+                    models,
+                    self.output_formats,
+                    self.parquet_options,
+                )
+                stage["bytes_written"] = sum(report["bytes"] for report in reports)
+            self.write_reports.extend(reports)
+        finally:
+            engine.close()
+        self.finish_outputs()
+
+        logger.info(f"Pipeline completed successfully, tables in {self.database_path}")
+
 
 def main():
     """Main execution function."""
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerCache:
+    """
+    On-disk cache of extracted player records, keyed by player_id.
+
+    Records older than ``ttl_seconds`` are treated as missing so they get
+    refetched, and the least recently used records are evicted once the cache
+    holds more than ``max_entries`` players.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/cache/players.sqlite",
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 20000,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS players (
+                    player_id INTEGER PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_players_accessed ON players (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, player_ids: List[int]) -> Tuple[List[Dict], List[int]]:
+        """
+        Split player IDs into fresh cached records and IDs that must be fetched.
+
+        Args:
+            player_ids: Player IDs requested by the caller.
+
+        Returns:
+            Tuple of (cached player records, unknown or stale player IDs).
+        """
+        player_ids = [int(player_id) for player_id in player_ids]
+        now = time.time()
+        cached = {}
+
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE wanted (player_id INTEGER PRIMARY KEY)")
+            conn.executemany(
+                "INSERT OR IGNORE INTO wanted VALUES (?)",
+                [(player_id,) for player_id in player_ids],
+            )
+            rows = conn.execute(
+                """
+                SELECT p.player_id, p.record FROM players p
+                JOIN wanted w USING (player_id)
+                WHERE p.fetched_at >= ?
+                """,
+                (now - self.ttl_seconds,),
+            ).fetchall()
+            conn.execute(
+                """
+                UPDATE players SET accessed_at = ?
+                WHERE player_id IN (SELECT player_id FROM wanted)
+                """,
+                (now,),
+            )
+
+        for player_id, record in rows:
+            cached[player_id] = json.loads(record)
+
+        missing = [player_id for player_id in dict.fromkeys(player_ids) if player_id not in cached]
+        logger.info(
+            f"Player cache: {len(cached)} hits, {len(missing)} unknown or stale"
+        )
+        return list(cached.values()), missing
+
+    def store(self, records: List[Dict]):
+        """Insert or refresh player records, then evict down to ``max_entries``."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO players (player_id, record, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (player_id) DO UPDATE SET
+                    record = excluded.record,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                [
+                    (int(record["player_id"]), json.dumps(record), now, now)
+                    for record in records
+                    if record.get("player_id") is not None
+                ],
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop the least recently used records beyond ``max_entries``."""
+        evicted = conn.execute(
+            """
+            DELETE FROM players WHERE player_id IN (
+                SELECT player_id FROM players
+                ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        if evicted:
+            logger.info(f"Evicted {evicted} players from cache")
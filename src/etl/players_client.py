@@ -1,76 +1,205 @@
 import pandas as pd
 import requests
 import logging
-import json
-import os
-from typing import List, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from datetime import datetime
+from etl.http_transport import NotRecordedError, create_session
+from etl.player_cache import PlayerCache
+from etl.statcast_client import RETRY_STATUS_CODES
+from io_utlis.raw_store import JsonLinesWriter, RawStore
 
 logger = logging.getLogger(__name__)
 
 
 class PlayersClient:
     def __init__(
-        self, api_base: str = "https://statsapi.mlb.com/api/v1", save_raw: bool = True
+        self,
+        api_base: str = "https://statsapi.mlb.com/api/v1",
+        save_raw: bool = True,
+        max_workers: int = 8,
+        batch_size: int = 50,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        session: Optional[requests.Session] = None,
+        cache: Optional[PlayerCache] = None,
+        raw_store: Optional[RawStore] = None,
+        http_mode: str = "live",
+        http_archive: Optional[str] = None,
     ):
         self.api_base = api_base
         self.save_raw = save_raw
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.missing_ids: List[int] = []
+        self.http_mode = http_mode
+        self.http_archive = http_archive
+        self.session = session or self._create_session()
+        self.cache = cache
+        self.raw_store = raw_store or RawStore()
 
-        if self.save_raw:
-            os.makedirs("data/raw/mlb", exist_ok=True)
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with one pooled connection per worker."""
+        return create_session(self.max_workers, self.http_mode, self.http_archive)
 
-    def fetch_player_data(self, player_ids: List[int]) -> pd.DataFrame:
+    def batch_url(self, player_ids: List[int]) -> str:
+        """Build the request URL for a batch of player IDs."""
+        if len(player_ids) == 1:
+            return f"{self.api_base}/people/{player_ids[0]}"
+        ids = ",".join(str(player_id) for player_id in player_ids)
+        return f"{self.api_base}/people?personIds={ids}"
+
+    def request_batch(
+        self, player_ids: List[int], raw_writer: Optional[JsonLinesWriter] = None
+    ) -> List[Dict]:
+        """
+        Request a batch of players, retrying transient failures with exponential backoff.
+
+        Args:
+            player_ids: Player IDs to fetch together.
+            raw_writer: Where to append the raw response as soon as it arrives.
+
+        Returns:
+            List of extracted player records.
+
+        Raises:
+            requests.RequestException: The last error once retries are exhausted,
+                or the first one that retrying can't fix.
+        """
+        url = self.batch_url(player_ids)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                break
+            except requests.RequestException as e:
+                status = getattr(e.response, "status_code", None)
+                retryable = status is None or status in RETRY_STATUS_CODES
+                retryable = retryable and not isinstance(e, NotRecordedError)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self.backoff_factor * (2**attempt)
+                logger.warning(
+                    f"Players request for {len(player_ids)} IDs failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+        if raw_writer is not None:
+            raw_writer.write(
+                {
+                    "player_ids": player_ids,
+                    "url": url,
+                    "timestamp": datetime.now().isoformat(),
+                    "response": data,
+                }
+            )
+
+        return [self.extract_player_info(person) for person in data.get("people", [])]
+
+    def fetch_batch(
+        self, player_ids: List[int], raw_writer: Optional[JsonLinesWriter] = None
+    ) -> List[Dict]:
+        """
+        Fetch one batch of players in a single request.
+
+        If the batch request still fails after its retries, each player is
+        requested on its own, so one bad ID or a flaky request doesn't lose
+        the whole batch.
+
+        Args:
+            player_ids: Player IDs to fetch together.
+            raw_writer: Where to append the raw response as soon as it arrives.
+
+        Returns:
+            List of extracted player records; players that could not be
+            fetched are left out.
+        """
+        try:
+            return self.request_batch(player_ids, raw_writer)
+        except requests.RequestException as e:
+            if len(player_ids) == 1:
+                logger.error(f"Error fetching data for player {player_ids[0]}: {e}")
+                return []
+            logger.warning(
+                f"Error fetching a batch of {len(player_ids)} players ({e}), "
+                f"requesting them one by one"
+            )
+        players = []
+        for player_id in player_ids:
+            try:
+                players.extend(self.request_batch([player_id], raw_writer))
+            except requests.RequestException as e:
+                logger.error(f"Error fetching data for player {player_id}: {e}")
+        return players
+
+    def fetch_player_data(
+        self, player_ids: List[int], raw_writer: Optional[JsonLinesWriter] = None
+    ) -> pd.DataFrame:
         """
         Fetch player data from the MLB API for given player IDs.
 
+        IDs are grouped into batches of ``batch_size`` using the multi-person
+        ``people?personIds=`` endpoint, and batches are fetched concurrently
+        over a shared pooled session. When a cache is configured, only unknown
+        or stale IDs hit the network. Raw responses are appended to the raw
+        store as they arrive.
+
         Args:
             player_ids: List of player IDs to fetch data for.
+            raw_writer: Open appender shared with concurrent calls; by
+                default each call opens and closes its own.
 
         Returns:
             DataFrame containing player information.
         """
         logger.info(f"Fetching player data for {len(player_ids)} players")
-        players = []
-        raw_responses = []
+        player_ids = [int(player_id) for player_id in player_ids]
 
-        for player_id in player_ids:
-            try:
-                url = f"{self.api_base}/people/{player_id}"
-                response = requests.get(url)
-                response.raise_for_status()
+        cached_players = []
+        if self.cache is not None:
+            cached_players, player_ids = self.cache.lookup(player_ids)
 
-                data = response.json()
+        batches = [
+            player_ids[i : i + self.batch_size]
+            for i in range(0, len(player_ids), self.batch_size)
+        ]
 
-                # Save raw response if enabled
-                if self.save_raw:
-                    raw_responses.append(
-                        {
-                            "player_id": player_id,
-                            "url": url,
-                            "timestamp": datetime.now().isoformat(),
-                            "response": data,
-                        }
-                    )
-
-                if "people" in data and len(data["people"]) > 0:
-                    player_info = self.extract_player_info(data["people"][0])
-                    players.append(player_info)
-
-            except Exception as e:
-                logger.error(f"Error fetching data for player {player_id}: {e}")
-                continue
-
-        # Save all raw responses to a single file
-        if self.save_raw and raw_responses:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            raw_file = f"data/raw/mlb/player_api_responses_{timestamp}.json"
-            with open(raw_file, "w") as f:
-                json.dump(raw_responses, f, indent=2)
-            logger.info(
-                f"Saved {len(raw_responses)} raw MLB API responses to {raw_file}"
+        owns_writer = raw_writer is None and self.save_raw and bool(batches)
+        if owns_writer:
+            raw_writer = self.raw_store.player_writer()
+        elif not self.save_raw:
+            raw_writer = None
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(
+                    executor.map(lambda batch: self.fetch_batch(batch, raw_writer), batches)
+                )
+        finally:
+            if owns_writer:
+                raw_writer.close()
+                logger.info(
+                    f"Saved {raw_writer.count} raw MLB API responses to {raw_writer.path}"
+                )
+
+        players = [player for batch_players in results for player in batch_players]
+        returned = {player["player_id"] for player in players}
+        self.missing_ids = sorted(set(player_ids) - returned)
+        if self.missing_ids:
+            logger.warning(
+                f"No player data for {len(self.missing_ids)} players: {self.missing_ids}"
             )
 
-        return pd.DataFrame(players)
+        if self.cache is not None and players:
+            self.cache.store(players)
+
+        return pd.DataFrame(cached_players + players)
 
     def extract_player_info(self, player_data: Dict) -> Dict:
         """Extract relevant player information from API response."""
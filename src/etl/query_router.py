@@ -0,0 +1,149 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+import pandas as pd
+
+from etl.duckdb_engine import literal, quote
+from etl.transforms.rollups import (
+    ADDITIVE_MEASURES,
+    RATIO_MEASURES,
+    ROLLUPS,
+    grain_column,
+    star_source_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns the router can group and filter by on the raw fact path
+ROUTABLE_COLUMNS = sorted({column for grain in ROLLUPS.values() for column in grain})
+
+
+class QueryRouter:
+    """
+    Answer aggregate queries from the smallest rollup that can serve them.
+
+    Queries are given as measures, group-by columns and equality, IN or
+    range filters rather than SQL text. A rollup is eligible when its grain
+    contains every group-by and filter column; measures are re-aggregated
+    from the additive columns (sums of counts, ratios of sums), so results
+    match aggregating star_fact_pitch directly. Queries no rollup covers
+    run against the star schema::
+
+        router = QueryRouter(conn)
+        router.query(["pitches", "avg_release_speed"], ["pitcher", "pitch_type"],
+                     {"season": 2024})
+    """
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        prefix: str = "star_",
+        rollup_prefix: str = "rollup_",
+    ):
+        self.conn = conn
+        self.prefix = prefix
+        existing = {
+            row[0]
+            for row in conn.execute(
+                "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+            ).fetchall()
+        }
+        # Try the smallest rollups first
+        sizes = {
+            name: conn.execute(f"SELECT count(*) FROM {quote(rollup_prefix + name)}").fetchone()[0]
+            for name in ROLLUPS
+            if rollup_prefix + name in existing
+        }
+        self.rollups: List[Tuple[str, str]] = [
+            (name, rollup_prefix + name) for name in sorted(sizes, key=sizes.get)
+        ]
+
+    def choose(self, columns: Sequence[str]) -> Optional[Tuple[str, str]]:
+        """Smallest loaded rollup whose grain contains ``columns``, as (rollup, table)."""
+        for name, table in self.rollups:
+            if set(columns) <= set(ROLLUPS[name]):
+                return name, table
+        return None
+
+    def plan(
+        self,
+        measures: Sequence[str],
+        group_by: Sequence[str] = (),
+        filters: Optional[Dict] = None,
+    ) -> Tuple[str, str]:
+        """
+        Build the SQL for an aggregate query.
+
+        Args:
+            measures: Names from ADDITIVE_MEASURES or RATIO_MEASURES
+            group_by: Grain columns to group by, e.g. ["pitcher", "pitch_type"]
+            filters: Column to a value (equality), a list (IN) or a
+                (low, high) tuple (inclusive range)
+
+        Returns:
+            Source table (a rollup, or star_fact_pitch) and the SQL
+        """
+        filters = filters or {}
+        unknown = [m for m in measures if m not in ADDITIVE_MEASURES and m not in RATIO_MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measures: {unknown}")
+        columns = list(group_by) + list(filters)
+        unroutable = [c for c in columns if c not in ROUTABLE_COLUMNS]
+        if unroutable:
+            raise ValueError(f"Columns not available to the router: {unroutable}")
+
+        chosen = self.choose(columns)
+        if chosen is not None:
+            source = chosen[1]
+            column_sql = lambda column: column
+            additive = lambda measure: (
+                f"sum({measure})" if measure.endswith("_sum") else f"sum({measure})::BIGINT"
+            )
+            from_sql = quote(source)
+        else:
+            source = f"{self.prefix}fact_pitch"
+            column_sql = grain_column
+            additive = ADDITIVE_MEASURES.get
+            from_sql = star_source_sql(
+                source, f"{self.prefix}dim_game", f"{self.prefix}dim_count"
+            )
+
+        select = [f"{column_sql(column)} AS {column}" for column in group_by]
+        for measure in measures:
+            if measure in RATIO_MEASURES:
+                numerator, denominator = RATIO_MEASURES[measure]
+                select.append(
+                    f"{additive(numerator)} / nullif({additive(denominator)}, 0) AS {measure}"
+                )
+            else:
+                select.append(f"{additive(measure)} AS {measure}")
+
+        where = [self._predicate(column_sql(column), value) for column, value in filters.items()]
+        sql = f"SELECT {', '.join(select)} FROM {from_sql}"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        if group_by:
+            positions = ", ".join(str(i + 1) for i in range(len(group_by)))
+            sql += f" GROUP BY {positions} ORDER BY {positions}"
+        return source, sql
+
+    @staticmethod
+    def _predicate(column: str, value) -> str:
+        if isinstance(value, tuple):
+            low, high = value
+            return f"{column} BETWEEN {literal(low)} AND {literal(high)}"
+        if isinstance(value, (list, set)):
+            return f"{column} IN ({', '.join(literal(v) for v in value)})"
+        return f"{column} = {literal(value)}"
+
+    def query(
+        self,
+        measures: Sequence[str],
+        group_by: Sequence[str] = (),
+        filters: Optional[Dict] = None,
+    ) -> pd.DataFrame:
+        """Run an aggregate query on the table chosen by :meth:`plan`."""
+        source, sql = self.plan(measures, group_by, filters)
+        logger.info(f"Routed query on {list(group_by)} to {source}")
+        return self.conn.execute(sql).df()
@@ -0,0 +1,121 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from etl.statcast_client import StatcastClient
+from io_utlis.raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+# (start_date, end_date, teams) handled by one worker process
+Shard = Tuple[str, str, str]
+
+
+def plan_shards(
+    start_date: str,
+    end_date: str,
+    teams: List[str],
+    seasons: Optional[List[int]] = None,
+    season_start: str = "03-01",
+    season_end: str = "11-30",
+    split_teams: bool = False,
+) -> List[Shard]:
+    """
+    Split the configured Statcast scope into season/team shards.
+
+    Args:
+        start_date: First game date, used when no seasons are listed
+        end_date: Last game date, used when no seasons are listed
+        teams: Team abbreviations, empty for the whole league
+        seasons: Whole seasons to load instead of the date range
+        season_start: MM-DD a season window starts on
+        season_end: MM-DD a season window ends on
+        split_teams: One shard per team instead of one Savant filter for all teams
+
+    Returns:
+        Shards in chronological order
+    """
+    if seasons:
+        # Season windows, clipped to the requested range
+        windows = [
+            (max(f"{season}-{season_start}", start_date), min(f"{season}-{season_end}", end_date))
+            for season in sorted(seasons)
+        ]
+        windows = [(start, end) for start, end in windows if start <= end]
+    else:
+        first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        windows = [
+            (
+                max(first, date(year, 1, 1)).isoformat(),
+                min(last, date(year, 12, 31)).isoformat(),
+            )
+            for year in range(first.year, last.year + 1)
+        ]
+
+    team_filters = list(teams) if split_teams and teams else ["|".join(teams)]
+    return [(start, end, team) for start, end in windows for team in team_filters]
+
+
+def fetch_shard(shard: Shard, settings: Dict) -> Dict:
+    """
+    Download one shard into the raw store.
+
+    Runs in a worker process, so it takes only picklable arguments and
+    returns a small summary instead of the pitches themselves.
+
+    Args:
+        shard: (start_date, end_date, teams)
+        settings: base_url, raw_root, download_dir, engine, max_workers, chunk_days,
+            http_mode and http_archive
+
+    Returns:
+        Summary with the shard and its row count
+    """
+    start_date, end_date, teams = shard
+    client = StatcastClient(
+        start_date,
+        end_date,
+        teams=teams,
+        base_url=settings["base_url"],
+        chunk_days=settings.get("chunk_days", 1),
+        max_workers=settings.get("max_workers", 4),
+        download_dir=settings["download_dir"],
+        raw_store=RawStore(settings["raw_root"]),
+        engine=settings.get("engine", "pandas"),
+        http_mode=settings.get("http_mode", "live"),
+        http_archive=settings.get("http_archive"),
+    )
+    return {"shard": shard, "rows": len(client.fetch_data())}
+
+
+def fetch_shards(shards: List[Shard], settings: Dict, processes: int = 4) -> List[Dict]:
+    """
+    Fetch shards on a process pool, one worker per shard at a time.
+
+    Parsing Savant CSVs is CPU bound, so separate processes let a full-league
+    backfill use every core while each process keeps its own thread pool of
+    downloads. A single shard runs in the calling process.
+
+    Args:
+        shards: Shards from plan_shards
+        settings: Passed to fetch_shard
+        processes: Maximum number of worker processes
+
+    Returns:
+        One summary per shard, in shard order
+    """
+    if len(shards) == 1 or processes <= 1:
+        summaries = [fetch_shard(shard, settings) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(shards))) as executor:
+            summaries = list(
+                executor.map(fetch_shard, shards, [settings] * len(shards))
+            )
+
+    for summary in summaries:
+        start_date, end_date, teams = summary["shard"]
+        logger.info(
+            f"Shard {start_date}..{end_date} [{teams or 'all teams'}]: {summary['rows']} pitches"
+        )
+    return summaries
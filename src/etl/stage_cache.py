@@ -0,0 +1,190 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+Tables = Dict[str, pd.DataFrame]
+
+
+def code_version(*modules: ModuleType) -> str:
+    """Hash of the source of the modules a stage runs, so code edits invalidate it."""
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(module.__name__.encode())
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()[:16]
+
+
+def tables_fingerprint(tables: Tables) -> str:
+    """Content hash of DataFrames: column names, dtypes and row values."""
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        df = tables[name]
+        digest.update(name.encode())
+        digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class StageCache:
+    """
+    On-disk cache of pipeline stage outputs, keyed by a hash of their inputs.
+
+    A stage key combines the stage name, its parameters, the fingerprints of
+    upstream stages and the source code of the modules it runs. Outputs are
+    stored as Parquet under ``{root}/{stage}/{key}/`` with a manifest, and the
+    least recently used entries are evicted once the cache exceeds
+    ``max_bytes``::
+
+        cache/stages/star/3f2a.../fact_pitch.parquet
+        cache/stages/star/3f2a.../manifest.json
+    """
+
+    def __init__(
+        self,
+        root: str = "data/cache/stages",
+        max_bytes: int = 2 * 1024**3,
+        enabled: bool = True,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        if enabled:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(stage: str, inputs: Dict, code: str = "") -> str:
+        payload = json.dumps({"stage": stage, "inputs": inputs, "code": code}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def entry_dir(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def get(
+        self, stage: str, key: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[Tuple[Tables, str]]:
+        """
+        Load a cached stage output.
+
+        Args:
+            stage: Stage name
+            key: Stage key from :meth:`key`
+            max_age_seconds: Treat older entries as missing, e.g. for remote sources
+
+        Returns:
+            (tables, fingerprint), or None on a miss
+        """
+        manifest_path = self.entry_dir(stage, key) / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if max_age_seconds is not None and time.time() - manifest["created_at"] > max_age_seconds:
+            return None
+
+        tables = {
+            name: pd.read_parquet(self.entry_dir(stage, key) / file_name)
+            for name, file_name in manifest["tables"].items()
+        }
+        # The manifest's modification time records the last use for eviction
+        os.utime(manifest_path)
+        return tables, manifest["fingerprint"]
+
+    def put(self, stage: str, key: str, tables: Tables, fingerprint: str):
+        """Store a stage output atomically, then evict old entries if over budget."""
+        entry_dir = self.entry_dir(stage, key)
+        tmp_dir = entry_dir.with_name(f".{key}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        file_names = {}
+        for name, df in tables.items():
+            file_names[name] = f"{name}.parquet"
+            df.to_parquet(tmp_dir / file_names[name], index=False)
+        manifest = {
+            "stage": stage,
+            "key": key,
+            "fingerprint": fingerprint,
+            "tables": file_names,
+            "created_at": time.time(),
+        }
+        with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """(last used, bytes, directory) of every cache entry."""
+        entries = []
+        for manifest_path in self.root.glob("*/*/manifest.json"):
+            entry_dir = manifest_path.parent
+            if entry_dir.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in entry_dir.iterdir() if f.is_file())
+            entries.append((manifest_path.stat().st_mtime, size, entry_dir))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_bytes:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted stage cache entry {entry_dir} ({size} bytes)")
+
+    def run(
+        self,
+        stage: str,
+        inputs: Dict,
+        compute: Callable[[], Tables],
+        code: str = "",
+        max_age_seconds: Optional[float] = None,
+        hash_output: bool = False,
+    ) -> Tuple[Tables, str, bool]:
+        """
+        Return a stage's cached output, computing and storing it on a miss.
+
+        Args:
+            stage: Stage name
+            inputs: JSON-serializable parameters and upstream fingerprints
+            compute: Function producing the stage's tables
+            code: Code version of the stage, see code_version
+            max_age_seconds: Maximum age of a reusable entry
+            hash_output: Fingerprint the output by content rather than by key.
+                Used for stages reading external sources, so downstream stages
+                are reused when a refetch returns the same data.
+
+        Returns:
+            (tables, fingerprint, hit)
+        """
+        key = self.key(stage, inputs, code)
+        cached = self.get(stage, key, max_age_seconds) if self.enabled else None
+        if cached is not None:
+            logger.info(f"Stage {stage}: cache hit ({key})")
+            tables, fingerprint = cached
+            return tables, fingerprint, True
+
+        start = time.perf_counter()
+        tables = compute()
+        fingerprint = tables_fingerprint(tables) if hash_output else key
+        # Empty results usually mean a failed download; don't pin them
+        if self.enabled and any(len(df) for df in tables.values()):
+            self.put(stage, key, tables, fingerprint)
+        logger.info(
+            f"Stage {stage}: computed in {time.perf_counter() - start:.2f}s ({key})"
+        )
+        return tables, fingerprint, False
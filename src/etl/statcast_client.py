@@ -1,56 +1,279 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
 import pandas as pd
+import pyarrow as pa
 import requests
-from io import StringIO
+
+from etl.http_transport import NotRecordedError, create_session
+from etl.statcast_schema import (
+    PITCH_KEY,
+    concat_statcast,
+    concat_statcast_arrow,
+    drop_duplicate_pitches,
+    read_statcast_csv,
+    read_statcast_csv_arrow,
+)
+from io_utlis.raw_store import RawStore
+
+logger = logging.getLogger(__name__)
+
+SAVANT_URL = "https://baseballsavant.mlb.com/statcast_search/csv"
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def build_params(start_date: str, end_date: str, teams: str) -> Dict[str, str]:
+    """Build the Baseball Savant CSV export query for a date range (inclusive)."""
+    start_year = int(start_date[:4])
+    end_year = int(end_date[:4])
+    seasons = "|".join(str(year) for year in range(start_year, end_year + 1))
+
+    return {
+        "all": "true",
+        "hfPT": "",
+        "hfAB": "",
+        "hfBBT": "",
+        "hfPR": "",
+        "hfZ": "",
+        "stadium": "",
+        "hfBBL": "",
+        "hfNewZones": "",
+        "hfGT": "R",  # Regular season
+        "hfC": "",
+        "hfSea": seasons,
+        "hfSit": "",
+        "player_type": "pitcher",
+        "hfOuts": "",
+        "opponent": "",
+        "pitcher_throws": "",
+        "batter_stands": "",
+        "hfSA": "",
+        "game_date_gt": start_date,
+        "game_date_lt": end_date,
+        "team": teams,
+        "position": "",
+        "hfRO": "",
+        "home_road": "",
+        "hfFlag": "",
+        "metric_1": "",
+        "hfInn": "",
+        "min_pitches": "0",
+        "min_results": "0",
+        "group_by": "name",
+        "sort_col": "pitches",
+        "player_event_sort": "h_launch_speed",
+        "sort_order": "desc",
+        "min_abs": "0",
+        "type": "details",
+    }
+
+
+def date_chunks(start_date: str, end_date: str, chunk_days: int = 1) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive date range into consecutive chunks.
+
+    Chunks never cross a year boundary so each request targets a single season.
+
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        chunk_days: Maximum number of days per chunk
+
+    Returns:
+        List of (start, end) date strings, in chronological order
+    """
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be at least 1")
+
+    current = date.fromisoformat(start_date)
+    last = date.fromisoformat(end_date)
+    chunks = []
+
+    while current <= last:
+        chunk_end = min(
+            current + timedelta(days=chunk_days - 1),
+            last,
+            date(current.year, 12, 31),
+        )
+        chunks.append((current.isoformat(), chunk_end.isoformat()))
+        current = chunk_end + timedelta(days=1)
+
+    return chunks
+
+
+def team_slug(teams: str) -> str:
+    """File-name form of a Savant team filter; an empty filter means all teams."""
+    return teams.replace("|", "-") if teams else "all"
 
 
 class StatcastClient:
-    def __init__(self, start_date: str, end_date: str, teams: str = "TOR|COL"):
+    def __init__(
+        self,
+        start_date: str,
+        end_date: str,
+        teams: str = "",
+        base_url: str = SAVANT_URL,
+        chunk_days: int = 1,
+        split_teams: bool = False,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        timeout: float = 60,
+        session: Optional[requests.Session] = None,
+        download_dir: str = "data/raw/statcast",
+        raw_store: Optional[RawStore] = None,
+        engine: str = "pandas",
+        http_mode: str = "live",
+        http_archive: Optional[str] = None,
+    ):
         self.start_date = start_date
         self.end_date = end_date
         self.teams = teams
-        self.base_url = "https://baseballsavant.mlb.com/statcast_search/csv"
-
-    def fetch_data(self):
-        params = {
-            "all": "true",
-            "hfPT": "",
-            "hfAB": "",
-            "hfBBT": "",
-            "hfPR": "",
-            "hfZ": "",
-            "stadium": "",
-            "hfBBL": "",
-            "hfNewZones": "",
-            "hfGT": "R",  # Regular season
-            "hfC": "",
-            "hfSea": "2025",
-            "hfSit": "",
-            "player_type": "pitcher",
-            "hfOuts": "",
-            "opponent": "",
-            "pitcher_throws": "",
-            "batter_stands": "",
-            "hfSA": "",
-            "game_date_gt": self.start_date,
-            "game_date_lt": self.end_date,
-            "team": self.teams,
-            "position": "",
-            "hfRO": "",
-            "home_road": "",
-            "hfFlag": "",
-            "metric_1": "",
-            "hfInn": "",
-            "min_pitches": "0",
-            "min_results": "0",
-            "group_by": "name",
-            "sort_col": "pitches",
-            "player_event_sort": "h_launch_speed",
-            "sort_order": "desc",
-            "min_abs": "0",
-            "type": "details",
-        }
-
-        response = requests.get(self.base_url, params=params)
-        response.raise_for_status()
-
-        return pd.read_csv(StringIO(response.text))
+        self.base_url = base_url
+        self.chunk_days = chunk_days
+        self.split_teams = split_teams
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.http_mode = http_mode
+        self.http_archive = http_archive
+        self.session = session or self._create_session()
+        self.download_dir = download_dir
+        self.raw_store = raw_store
+        self.engine = engine
+
+        os.makedirs(self.download_dir, exist_ok=True)
+
+    def _create_session(self) -> requests.Session:
+        """Create a session whose connection pool matches the worker pool."""
+        return create_session(self.max_workers, self.http_mode, self.http_archive)
+
+    def chunks(self) -> List[Tuple[str, str, str]]:
+        """List the (start, end, teams) requests covering the configured range."""
+        teams = self.teams.split("|") if self.split_teams else [self.teams]
+        return [
+            (start, end, team)
+            for start, end in date_chunks(self.start_date, self.end_date, self.chunk_days)
+            for team in teams
+        ]
+
+    def chunk_path(self, start_date: str, end_date: str, teams: str) -> str:
+        """Path of the CSV file a chunk is streamed to."""
+        return os.path.join(
+            self.download_dir,
+            f"statcast_data_{start_date}_{end_date}_{team_slug(teams)}.csv",
+        )
+
+    def fetch_chunk(
+        self, start_date: str, end_date: str, teams: str
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """
+        Fetch a single chunk, retrying transient failures with exponential backoff.
+
+        The response body is streamed straight to disk and then parsed
+        incrementally, so the CSV text is never held in memory as a whole.
+        With a raw store configured, the parsed chunk lands in its game_date
+        partitions as soon as it arrives and the spooled CSV is removed.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            teams: Savant team filter, e.g. "TOR" or "TOR|COL", empty for all teams
+
+        Returns:
+            Pitches of the chunk (empty if no games were played), as an Arrow
+            table when the client runs with engine="arrow"
+        """
+        params = build_params(start_date, end_date, teams)
+        path = self.chunk_path(start_date, end_date, teams)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._download(params, path)
+                break
+            except requests.RequestException as e:
+                # Includes dropped streams (ChunkedEncodingError) besides
+                # connection errors, timeouts and retryable statuses
+                status = getattr(e.response, "status_code", None)
+                retryable = status is None or status in RETRY_STATUS_CODES
+                # A replay archive answers the same way every time
+                retryable = retryable and not isinstance(e, NotRecordedError)
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = self.backoff_factor * (2**attempt)
+                logger.warning(
+                    f"Chunk {start_date}..{end_date} [{teams}] failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+        if self.engine == "arrow":
+            df = read_statcast_csv_arrow(path)
+        else:
+            df = read_statcast_csv(path)
+        if self.raw_store is not None:
+            self.raw_store.write_statcast(df, f"statcast_{team_slug(teams)}")
+            os.remove(path)
+
+        logger.info(f"Fetched {len(df)} pitches for {start_date}..{end_date} [{teams}]")
+        return df
+
+    def _download(self, params: Dict[str, str], path: str):
+        """Stream one Savant export to ``path``, replacing it only once complete."""
+        tmp_path = f"{path}.part"
+        try:
+            with self.session.get(
+                self.base_url, params=params, timeout=self.timeout, stream=True
+            ) as response:
+                if response.status_code in RETRY_STATUS_CODES:
+                    raise requests.HTTPError(
+                        f"{response.status_code} from {self.base_url}",
+                        response=response,
+                    )
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for block in response.iter_content(chunk_size=1 << 20):
+                        f.write(block)
+            os.replace(tmp_path, path)
+        finally:
+            # Left behind only by a failed download
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def fetch_data(self) -> Union[pd.DataFrame, pa.Table]:
+        """
+        Fetch the configured range chunk by chunk on a bounded worker pool.
+
+        Results are stitched back in chronological order regardless of the
+        order in which the chunks complete.
+
+        Returns:
+            Pitch-by-pitch data for the whole range, as an Arrow table when the
+            client runs with engine="arrow"
+        """
+        chunks = self.chunks()
+        logger.info(
+            f"Fetching Statcast data in {len(chunks)} chunks "
+            f"with {self.max_workers} workers"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = list(executor.map(lambda chunk: self.fetch_chunk(*chunk), chunks))
+
+        if self.engine == "arrow":
+            df = concat_statcast_arrow(frames)
+            if self.split_teams:
+                df = drop_duplicate_pitches(df)
+            return df
+
+        df = concat_statcast(frames)
+        if self.split_teams and not df.empty:
+            df = df.drop_duplicates(subset=PITCH_KEY, ignore_index=True)
+
+        return df
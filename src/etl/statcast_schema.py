@@ -0,0 +1,244 @@
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pcsv
+from pandas.api.types import union_categoricals
+
+STAR_DBML = Path(__file__).parent.parent / "dbml" / "star.dbml"
+
+# Low-cardinality string columns stored as categoricals instead of objects
+CATEGORICAL_COLUMNS = [
+    "pitch_type",
+    "pitch_name",
+    "events",
+    "description",
+    "type",
+    "bb_type",
+    "game_type",
+    "stand",
+    "p_throws",
+    "home_team",
+    "away_team",
+    "inning_topbot",
+    "if_fielding_alignment",
+    "of_fielding_alignment",
+]
+
+# Foreign keys appended by the star schema, not present in the raw export
+DERIVED_COLUMNS = {
+    "game_key",
+    "player_id",
+    "player_id_batter_fk",
+    "count_key",
+    "pitcher_key",
+    "batter_key",
+}
+
+# Columns that uniquely identify a pitch
+PITCH_KEY = ["game_pk", "at_bat_number", "pitch_number"]
+
+# Decimal places Savant publishes; floats are downcast only if they round-trip
+FLOAT_DECIMALS = 4
+
+
+def parse_dbml_columns(table: str, dbml_path: Path = STAR_DBML) -> Dict[str, str]:
+    """
+    Read the column names and types of a table from a DBML file.
+
+    Args:
+        table: Table name, e.g. "fact_pitch"
+        dbml_path: Path to the DBML file
+
+    Returns:
+        Ordered mapping of column name to DBML type
+    """
+    text = Path(dbml_path).read_text()
+    match = re.search(rf"table\s+{table}\s*\{{(.*?)\}}", text, re.S)
+    if match is None:
+        raise ValueError(f"Table {table} not found in {dbml_path}")
+
+    columns = {}
+    for line in match.group(1).splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            columns[parts[0]] = parts[1]
+    return columns
+
+
+def statcast_dtypes() -> Dict[str, object]:
+    """Build the pandas dtypes used to parse a raw Statcast CSV export."""
+    dtypes = {}
+    for column, dbml_type in parse_dbml_columns("fact_pitch").items():
+        if column in DERIVED_COLUMNS:
+            continue
+        if column in CATEGORICAL_COLUMNS:
+            dtypes[column] = "category"
+        elif dbml_type == "int":
+            dtypes[column] = "Int32"
+        elif dbml_type == "float":
+            dtypes[column] = "float64"
+        else:
+            dtypes[column] = str
+    return dtypes
+
+
+def statcast_arrow_types() -> Dict[str, pa.DataType]:
+    """Arrow equivalents of :func:`statcast_dtypes`, with dictionary-encoded strings."""
+    arrow_types = {
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "Int32": pa.int32(),
+        "float64": pa.float64(),
+    }
+    return {
+        column: arrow_types.get(dtype, pa.string())
+        for column, dtype in statcast_dtypes().items()
+    }
+
+
+def statcast_sql_types() -> Dict[str, str]:
+    """
+    DuckDB equivalents of :func:`statcast_dtypes`.
+
+    Floats map to DOUBLE, but FLOAT columns written by :func:`downcast_floats`
+    can be kept as they are.
+    """
+    sql_types = {"category": "VARCHAR", "Int32": "INTEGER", "float64": "DOUBLE"}
+    return {
+        column: sql_types.get(dtype, "VARCHAR") for column, dtype in statcast_dtypes().items()
+    }
+
+
+def downcast_floats(df: pd.DataFrame, decimals: int = FLOAT_DECIMALS) -> pd.DataFrame:
+    """
+    Downcast float64 columns to float32 where no published precision is lost.
+
+    A column is downcast only if every value has at most ``decimals`` decimal
+    places and its float32 representation rounds back to the same value.
+    """
+    for column in df.select_dtypes(include="float64").columns:
+        values = df[column].to_numpy()
+        rounded = np.round(values, decimals)
+        as_float32 = values.astype(np.float32)
+        exact = np.isnan(values) | (
+            (rounded == values)
+            & (np.round(as_float32.astype(np.float64), decimals) == rounded)
+        )
+        if exact.all():
+            df[column] = as_float32
+    return df
+
+
+def concat_statcast(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate Statcast frames while keeping categorical columns categorical."""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    for column in frames[0].select_dtypes(include="category").columns:
+        if not all(
+            column in frame and isinstance(frame[column].dtype, pd.CategoricalDtype)
+            for frame in frames
+        ):
+            continue
+        categories = union_categoricals(
+            [frame[column] for frame in frames], ignore_order=True
+        ).categories
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_statcast_csv(path: str, chunksize: int = 100_000) -> pd.DataFrame:
+    """
+    Parse a raw Statcast CSV incrementally with the fixed star schema dtypes.
+
+    Args:
+        path: Path to a Savant CSV export on disk
+        chunksize: Rows parsed per chunk
+
+    Returns:
+        DataFrame with categorical strings, nullable integers and downcast floats
+    """
+    try:
+        header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+    schema = statcast_dtypes()
+    dtypes = {column: schema[column] for column in header if column in schema}
+
+    reader = pd.read_csv(
+        path, dtype=dtypes, chunksize=chunksize, encoding="utf-8-sig"
+    )
+    return concat_statcast([downcast_floats(chunk) for chunk in reader])
+
+
+def downcast_floats_arrow(table: pa.Table, decimals: int = FLOAT_DECIMALS) -> pa.Table:
+    """Arrow version of :func:`downcast_floats`, applying the same round-trip rule."""
+    for i, field in enumerate(table.schema):
+        if field.type != pa.float64():
+            continue
+        values = table.column(i)
+        rounded = pc.round(values, decimals)
+        as_float32 = pc.cast(values, pa.float32())
+        round_trip = pc.round(pc.cast(as_float32, pa.float64()), decimals)
+        exact = pc.and_(pc.equal(rounded, values), pc.equal(round_trip, rounded))
+        if pc.all(pc.fill_null(exact, True)).as_py():
+            table = table.set_column(i, field.name, as_float32)
+    return table
+
+
+def concat_statcast_arrow(tables: List[pa.Table]) -> pa.Table:
+    """Concatenate Statcast tables, widening types and unifying dictionaries."""
+    tables = [table for table in tables if table.num_columns > 0]
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(tables, promote_options="permissive").unify_dictionaries()
+
+
+def drop_duplicate_pitches(table: pa.Table) -> pa.Table:
+    """Keep the first occurrence of each pitch, preserving row order."""
+    if table.num_rows == 0 or not set(PITCH_KEY).issubset(table.column_names):
+        return table
+    rows = pa.array(np.arange(table.num_rows))
+    first_rows = (
+        table.select(PITCH_KEY)
+        .append_column("_row", rows)
+        .group_by(PITCH_KEY, use_threads=False)
+        .aggregate([("_row", "min")])
+        .column("_row_min")
+        .to_numpy()
+    )
+    return table.take(pa.array(np.sort(first_rows)))
+
+
+def read_statcast_csv_arrow(path: str) -> pa.Table:
+    """
+    Parse a raw Statcast CSV into an Arrow table with the fixed star schema types.
+
+    Args:
+        path: Path to a Savant CSV export on disk
+
+    Returns:
+        Table with dictionary-encoded strings, int32 integers and downcast floats
+    """
+    # Savant answers days without games with an empty body
+    with open(path, "rb") as f:
+        if not f.read(1024).strip():
+            return pa.table({})
+
+    table = pcsv.read_csv(
+        path,
+        convert_options=pcsv.ConvertOptions(
+            column_types=statcast_arrow_types(), strings_can_be_null=True
+        ),
+    )
+    return downcast_floats_arrow(table)
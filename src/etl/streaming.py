@@ -0,0 +1,175 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def prefetch(
+    fn: Callable, items: Iterable, max_workers: int = 4, queue_size: int = 4
+) -> Iterator:
+    """
+    Yield ``fn(item)`` for each item, in order, computing ahead on a thread pool.
+
+    At most ``max_workers + queue_size`` items are in flight or waiting to be
+    consumed, so a slow consumer holds back the producers instead of letting
+    finished results pile up in memory.
+
+    Args:
+        fn: Producer, e.g. a chunk download
+        items: Inputs of ``fn``
+        max_workers: Threads running ``fn``
+        queue_size: Finished results that may wait for the consumer
+
+    Yields:
+        Results of ``fn`` in the order of ``items``; an exception raised by
+        ``fn`` is raised when its result is reached
+    """
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = deque(executor.submit(fn, item) for item in islice(items, max_workers + queue_size))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, 1):
+                pending.append(executor.submit(fn, item))
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class PlayerLookahead:
+    """
+    Player lookups started as soon as new player IDs show up.
+
+    Producers call :meth:`submit` with the IDs of each parsed chunk. IDs not
+    seen before are fetched on background threads while the chunk waits its
+    turn in the queue. IDs submitted while every thread is busy are
+    coalesced into the next lookup, so a burst of chunks costs one batched
+    fetch rather than one per chunk.
+    The consumer collects a chunk's players with :meth:`players`, which only
+    blocks on lookups that have not finished yet.
+    """
+
+    def __init__(self, fetch: Callable[[List[int]], pd.DataFrame], max_lookups: int = 2):
+        self.fetch = fetch
+        self.condition = threading.Condition()
+        self.lookups: Dict[int, Future] = {}
+        self.queued: List[int] = []
+        self.next_lookup: Optional[Future] = None
+        self.closed = False
+        self.wait_seconds = 0.0
+        self.threads = [
+            threading.Thread(target=self._run, name=f"player-lookahead-{i}", daemon=True)
+            for i in range(max_lookups)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.queued and not self.closed:
+                    self.condition.wait()
+                if not self.queued:
+                    return
+                player_ids, lookup = self.queued, self.next_lookup
+                self.queued, self.next_lookup = [], None
+            try:
+                lookup.set_result(self.fetch(player_ids))
+            except BaseException as e:
+                lookup.set_exception(e)
+
+    def submit(self, player_ids: Iterable[int]):
+        """Queue the IDs that no earlier call asked for."""
+        with self.condition:
+            new_ids = sorted({int(i) for i in player_ids} - self.lookups.keys())
+            if not new_ids:
+                return
+            if self.next_lookup is None:
+                self.next_lookup = Future()
+            for player_id in new_ids:
+                self.lookups[player_id] = self.next_lookup
+            self.queued.extend(new_ids)
+            self.condition.notify()
+
+    def players(self, player_ids: Iterable[int]) -> pd.DataFrame:
+        """Player records of ``player_ids``, waiting for lookups still in flight."""
+        player_ids = sorted({int(i) for i in player_ids})
+        self.submit(player_ids)
+        with self.condition:
+            lookups = list({id(self.lookups[i]): self.lookups[i] for i in player_ids}.values())
+        start = time.perf_counter()
+        frames = [lookup.result() for lookup in lookups]
+        self.wait_seconds += time.perf_counter() - start
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        players = pd.concat(frames, ignore_index=True)
+        return players[players["player_id"].isin(player_ids)].reset_index(drop=True)
+
+    def close(self):
+        """Finish the queued lookups and stop the background thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
+class BackgroundWorker:
+    """
+    Single thread running tasks from a bounded queue, e.g. partition writes.
+
+    :meth:`submit` blocks while ``queue_size`` tasks are waiting, which keeps
+    the producer from running arbitrarily far ahead of the writes. The first
+    error raised by a task is re-raised by the next :meth:`submit` or by
+    :meth:`join`.
+    """
+
+    def __init__(self, name: str = "writer", queue_size: int = 4):
+        self.tasks: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.error: Optional[BaseException] = None
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            fn, args = task
+            if self.error is not None:
+                continue
+            start = time.perf_counter()
+            try:
+                fn(*args)
+            except BaseException as e:
+                self.error = e
+            self.busy_seconds += time.perf_counter() - start
+
+    def _raise(self):
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, fn: Callable, *args):
+        """Queue ``fn(*args)``, blocking while the queue is full."""
+        self._raise()
+        start = time.perf_counter()
+        self.tasks.put((fn, args))
+        self.wait_seconds += time.perf_counter() - start
+
+    def join(self):
+        """Wait for every queued task and re-raise the first failure."""
+        self.tasks.put(None)
+        self.thread.join()
+        self._raise()
@@ -0,0 +1,308 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from etl.transforms.dimensions import (
+    GAME_DIMENSION_COLUMNS,
+    STADIUMS,
+    create_count_dimension,
+)
+from etl.transforms.one_big_table import BIN_RULES, FLAG_RULES, PLAYER_COLUMNS
+from etl.transforms.player_history import bind_player_keys
+from etl.transforms.snowflake_schema import PLAYER_COLUMNS as SNOWFLAKE_PLAYER_COLUMNS
+
+ArrowColumn = Union[pa.Array, pa.ChunkedArray]
+
+GAME_KEYS = ["game_pk", "game_date", "home_team", "away_team"]
+
+
+def decode(values: ArrowColumn) -> ArrowColumn:
+    """Return plain values for a dictionary-encoded column."""
+    if pa.types.is_dictionary(values.type):
+        return pc.cast(values, values.type.value_type)
+    return values
+
+
+def lookup(values: ArrowColumn, natural_keys: ArrowColumn) -> ArrowColumn:
+    """
+    Find the row of each value in a dimension's natural key column.
+
+    Equivalent to pd.Index.get_indexer, with nulls where no match exists.
+    """
+    natural_keys = decode(natural_keys)
+    return pc.index_in(pc.cast(decode(values), natural_keys.type), value_set=natural_keys)
+
+
+def unique_rows(table: pa.Table, columns: List[str]) -> pa.Table:
+    """Distinct rows over ``columns``, in order of first appearance."""
+    return table.select(columns).group_by(columns, use_threads=False).aggregate([])
+
+
+def with_sequence_key(table: pa.Table, name: str) -> pa.Table:
+    """Append a 1-based surrogate key column."""
+    return table.append_column(name, pa.array(np.arange(1, table.num_rows + 1)))
+
+
+def create_game_dimension_arrow(
+    pitches: pa.Table, stadiums: Optional[Dict[str, str]] = None
+) -> pa.Table:
+    """Arrow version of dimensions.create_game_dimension."""
+    keys = pa.table({key: decode(pitches[key]) for key in GAME_KEYS})
+    games = (
+        keys.append_column("pitch_number", pitches["pitch_number"])
+        .group_by(GAME_KEYS)
+        .aggregate([("pitch_number", "count")])
+    )
+    valid = pc.and_(
+        pc.and_(pc.is_valid(games["game_pk"]), pc.is_valid(games["game_date"])),
+        pc.and_(pc.is_valid(games["home_team"]), pc.is_valid(games["away_team"])),
+    )
+    games = games.filter(valid).sort_by([(key, "ascending") for key in GAME_KEYS])
+
+    n = games.num_rows
+    stadiums = stadiums or STADIUMS
+    stadium_index = pc.index_in(games["home_team"], value_set=pa.array(list(stadiums)))
+    game_dates = pc.strptime(games["game_date"], "%Y-%m-%d", "s")
+    day_of_week = pc.strftime(game_dates, "%A")
+
+    columns = {
+        "game_key": pa.array(np.arange(1, n + 1)),
+        "game_pk": games["game_pk"],
+        "game_date": games["game_date"],
+        "season": pc.year(game_dates),
+        "game_type": pa.array(["R"] * n),
+        "home_team": games["home_team"],
+        "away_team": games["away_team"],
+        "stadium": pc.take(pa.array(list(stadiums.values())), stadium_index),
+        "day_of_week": day_of_week,
+        "weather_temp": pa.array(np.full(n, 72)),
+        "weather_condition": pa.array(["Clear"] * n),
+        "total_pitches": games["pitch_number_count"],
+    }
+    # Categorical in the pandas game dimension as well
+    for column in ["home_team", "away_team", "stadium"]:
+        columns[column] = pc.dictionary_encode(columns[column])
+    return pa.table({column: columns[column] for column in GAME_DIMENSION_COLUMNS})
+
+
+def create_count_dimension_arrow() -> pa.Table:
+    """The count dimension has 12 static rows, so it is shared with the pandas path."""
+    return pa.Table.from_pandas(create_count_dimension(), preserve_index=False)
+
+
+def count_key_arrow(pitches: pa.Table, count_dim: pa.Table) -> ArrowColumn:
+    """Arrow version of keys.count_keys: index a 4x3 lookup by balls * 3 + strikes."""
+    slots = [None] * 12
+    for balls, strikes, count_key in zip(
+        count_dim["balls"].to_pylist(),
+        count_dim["strikes"].to_pylist(),
+        count_dim["count_key"].to_pylist(),
+    ):
+        slots[balls * 3 + strikes] = count_key
+
+    balls = pc.cast(pitches["balls"], pa.int64())
+    strikes = pc.cast(pitches["strikes"], pa.int64())
+    valid = pc.and_(
+        pc.and_(pc.greater_equal(balls, 0), pc.less_equal(balls, 3)),
+        pc.and_(pc.greater_equal(strikes, 0), pc.less_equal(strikes, 2)),
+    )
+    slot = pc.if_else(valid, pc.add(pc.multiply(balls, 3), strikes), None)
+    return pc.take(pa.array(slots, pa.int64()), slot)
+
+
+def create_star_schema_arrow(
+    pitches: pa.Table, game_dim: pa.Table, player_dim: pa.Table, count_dim: pa.Table
+) -> Dict[str, pa.Table]:
+    """Arrow version of star_schema.create_star_schema."""
+    player_ids = player_dim["player_id"]
+    fact = (
+        pitches.append_column(
+            "game_key", pc.take(game_dim["game_key"], lookup(pitches["game_pk"], game_dim["game_pk"]))
+        )
+        .append_column("player_id", pc.take(player_ids, lookup(pitches["pitcher"], player_ids)))
+        .append_column(
+            "player_id_batter_fk", pc.take(player_ids, lookup(pitches["batter"], player_ids))
+        )
+        .append_column("count_key", count_key_arrow(pitches, count_dim))
+    )
+    if "valid_from" in player_dim.column_names:
+        versions = player_dim.select(["player_key", "player_id", "valid_from", "valid_to"]).to_pandas()
+        game_dates = decode(pitches["game_date"]).to_pandas()
+        for role, column in [("pitcher", "pitcher_key"), ("batter", "batter_key")]:
+            keys = bind_player_keys(pitches[role].to_pandas(), game_dates, versions)
+            fact = fact.append_column(column, pa.array(keys))
+    return {"fact_pitch": fact}
+
+
+def create_snowflake_schema_arrow(
+    pitches: pa.Table, player_data: pa.Table, game_dim: pa.Table, count_dim: pa.Table
+) -> Dict[str, pa.Table]:
+    """Arrow version of snowflake_schema.create_snowflake_schema."""
+    players = with_sequence_key(
+        unique_rows(player_data, SNOWFLAKE_PLAYER_COLUMNS), "player_key"
+    )
+
+    positions = unique_rows(players, ["primary_position"])
+    positions = with_sequence_key(
+        positions.filter(pc.is_valid(positions["primary_position"])), "position_key"
+    )
+
+    locations = unique_rows(players, ["birth_city", "birth_country"])
+    locations = with_sequence_key(
+        locations.filter(
+            pc.and_(
+                pc.is_valid(locations["birth_city"]),
+                pc.is_valid(locations["birth_country"]),
+            )
+        ),
+        "location_key",
+    )
+
+    def location_id(table: pa.Table) -> ArrowColumn:
+        return pc.binary_join_element_wise(
+            pc.cast(table["birth_city"], pa.string()),
+            pc.cast(table["birth_country"], pa.string()),
+            "\x1f",
+        )
+
+    player_dim = (
+        players.append_column(
+            "position_key",
+            pc.take(
+                positions["position_key"],
+                lookup(players["primary_position"], positions["primary_position"]),
+            ),
+        )
+        .append_column(
+            "location_key",
+            pc.take(
+                locations["location_key"],
+                lookup(location_id(players), location_id(locations)),
+            ),
+        )
+        .drop_columns(["birth_city", "birth_country", "primary_position"])
+    )
+
+    fact = pitches.append_column(
+        "game_key", pc.take(game_dim["game_key"], lookup(pitches["game_pk"], game_dim["game_pk"]))
+    )
+    for role in ["pitcher", "batter"]:
+        rows = lookup(pitches[role], player_dim["player_id"])
+        fact = fact.append_column(
+            f"player_id_{role}", pc.take(player_dim["player_id"], rows)
+        ).append_column(f"player_key_{role}", pc.take(player_dim["player_key"], rows))
+    fact = fact.append_column("count_key", count_key_arrow(pitches, count_dim))
+
+    return {
+        "dim_game": game_dim,
+        "dim_player": player_dim,
+        "dim_position": positions,
+        "dim_birth_location": locations,
+        "dim_count": count_dim,
+        "fact_pitch": fact,
+    }
+
+
+def add_derived_fields_arrow(table: pa.Table) -> pa.Table:
+    """Arrow version of one_big_table.add_derived_fields, driven by the same rules."""
+    for column, source, edges, labels, missing_label in BIN_RULES:
+        values = pc.cast(decode(table[source]), pa.float64()).to_numpy(
+            zero_copy_only=False
+        )
+        codes = np.searchsorted(np.asarray(edges, dtype="float64"), values, side="right")
+        codes[np.isnan(values)] = len(labels)
+        tiers = pa.DictionaryArray.from_arrays(
+            pa.array(codes.astype("int8")), pa.array(labels + [missing_label])
+        )
+        table = table.append_column(column, tiers)
+
+    for column, source, values in FLAG_RULES:
+        flags = pc.fill_null(pc.is_in(decode(table[source]), value_set=pa.array(values)), False)
+        table = table.append_column(column, flags)
+
+    return table
+
+
+def create_one_big_table_arrow(
+    pitches: pa.Table, game_dim: pa.Table, player_dim: pa.Table, count_dim: pa.Table
+) -> pa.Table:
+    """
+    Arrow version of one_big_table.create_one_big_table.
+
+    Dimension attributes are gathered with index lookups and ``take`` rather
+    than hash joins, which keeps the pitch order stable.
+    """
+    big_table = pitches
+
+    # Add game information, suffixing columns that clash with the pitch data
+    game_rows = lookup(pitches["game_pk"], game_dim["game_pk"])
+    for column in game_dim.column_names:
+        if column in ("game_key", "game_pk"):
+            continue
+        name = f"{column}_game" if column in pitches.column_names else column
+        big_table = big_table.append_column(name, pc.take(game_dim[column], game_rows))
+
+    # Add pitcher and batter information
+    for role in ["pitcher", "batter"]:
+        player_rows = lookup(pitches[role], player_dim["player_id"])
+        for column in PLAYER_COLUMNS:
+            if column == "player_id":
+                continue
+            big_table = big_table.append_column(
+                f"{role}_{column}", pc.take(player_dim[column], player_rows)
+            )
+
+    # Add count information
+    count_rows = pc.subtract(count_key_arrow(pitches, count_dim), 1)
+    for column in ["count_display", "count_category"]:
+        big_table = big_table.append_column(column, pc.take(count_dim[column], count_rows))
+
+    return add_derived_fields_arrow(big_table)
+
+
+def build_models_arrow(
+    pitches: pa.Table,
+    player_data: Union[pa.Table, pd.DataFrame],
+    stadiums: Optional[Dict[str, str]] = None,
+    player_history: Optional[pd.DataFrame] = None,
+) -> Dict[str, Dict[str, pa.Table]]:
+    """
+    Build the star, snowflake and OBT models entirely on Arrow tables.
+
+    Args:
+        pitches: Statcast pitches
+        player_data: Player dimension from the MLB API
+        stadiums: Home team abbreviation to stadium name
+        player_history: Type-2 player dimension for the star schema, whose
+            facts then carry pitcher_key and batter_key
+
+    Returns:
+        Mapping of model directory ("star", "snowflake", "obt") to its tables
+    """
+    if isinstance(player_data, pd.DataFrame):
+        player_data = pa.Table.from_pandas(player_data, preserve_index=False)
+
+    game_dim = create_game_dimension_arrow(pitches, stadiums)
+    count_dim = create_count_dimension_arrow()
+
+    star_players = player_data
+    if player_history is not None:
+        star_players = pa.Table.from_pandas(player_history, preserve_index=False)
+    star = create_star_schema_arrow(pitches, game_dim, star_players, count_dim)
+    star.update({"dim_game": game_dim, "dim_count": count_dim, "dim_player": star_players})
+
+    return {
+        "star": star,
+        "snowflake": create_snowflake_schema_arrow(
+            pitches, player_data, game_dim, count_dim
+        ),
+        "obt": {
+            "one_big_table": create_one_big_table_arrow(
+                pitches, game_dim, player_data, count_dim
+            )
+        },
+    }
+
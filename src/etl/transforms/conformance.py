@@ -0,0 +1,66 @@
+from typing import Dict, List, Optional
+import pandas as pd
+
+
+def check_conformance(
+    star_tables: Dict[str, pd.DataFrame],
+    snowflake_tables: Dict[str, pd.DataFrame],
+    one_big_table: Optional[pd.DataFrame],
+) -> List[str]:
+    """
+    Check that the star, snowflake and OBT models describe the same data.
+
+    Args:
+        star_tables: Star schema tables (dim_game, dim_count, fact_pitch)
+        snowflake_tables: Snowflake schema tables
+        one_big_table: Denormalized table, None when it is only a view;
+            columns a partial OBT leaves out are not checked
+
+    Returns:
+        List of human-readable mismatches, empty when the models conform
+    """
+    issues = []
+    star_fact = star_tables["fact_pitch"]
+    snowflake_fact = snowflake_tables["fact_pitch"]
+
+    # Every model holds one row per pitch
+    row_counts = {"star": len(star_fact), "snowflake": len(snowflake_fact)}
+    if one_big_table is not None:
+        row_counts["obt"] = len(one_big_table)
+    if len(set(row_counts.values())) > 1:
+        issues.append(f"Fact row counts differ: {row_counts}")
+        return issues
+
+    # Shared dimensions are the same frames in both schemas
+    for name in ["dim_game", "dim_count"]:
+        if not star_tables[name].equals(snowflake_tables[name]):
+            issues.append(f"{name} differs between star and snowflake schemas")
+
+    # Facts point at the same dimension rows
+    for key in ["game_key", "count_key"]:
+        if not star_fact[key].equals(snowflake_fact[key]):
+            issues.append(f"{key} differs between star and snowflake fact tables")
+
+    if one_big_table is None:
+        return issues
+
+    # OBT attributes match what the star schema joins to
+    game_dim = star_tables["dim_game"].set_index("game_key")
+    count_dim = star_tables["dim_count"].set_index("count_key")
+    expected = {
+        "stadium": game_dim["stadium"].reindex(star_fact["game_key"]),
+        "count_category": count_dim["count_category"].reindex(star_fact["count_key"]),
+    }
+    for column, values in expected.items():
+        if column not in one_big_table:
+            continue
+        actual = one_big_table[column].astype(object).to_numpy()
+        matches = (values.astype(object).to_numpy() == actual) | (
+            values.isna().to_numpy() & pd.isna(actual)
+        )
+        if not matches.all():
+            issues.append(
+                f"OBT {column} disagrees with the star schema on {(~matches).sum()} rows"
+            )
+
+    return issues
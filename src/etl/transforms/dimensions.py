@@ -1,52 +1,85 @@
-from typing import List
+from typing import Dict, List, Optional
 import pandas as pd
 
-
-def create_game_dimension(pitch_data: pd.DataFrame) -> pd.DataFrame:
+# Fallback stadium map; the pipeline passes data.stadiums from config.yaml
+STADIUMS = {"TOR": "Rogers Centre", "COL": "Coors Field"}
+
+GAME_DIMENSION_COLUMNS = [
+    "game_key",
+    "game_pk",
+    "game_date",
+    "season",
+    "game_type",
+    "home_team",
+    "away_team",
+    "stadium",
+    "day_of_week",
+    "weather_temp",
+    "weather_condition",
+    "total_pitches",
+]
+
+
+def create_game_dimension(
+    pitch_data: pd.DataFrame, stadiums: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
     """
     Create game dimension table from pitch data.
 
     Args:
         pitch_data: DataFrame with pitch-by-pitch data
+        stadiums: Home team abbreviation to stadium name, defaults to STADIUMS
 
     Returns:
         DataFrame with game dimension data
     """
     games = (
-        pitch_data.groupby(["game_pk", "game_date", "home_team", "away_team"])
+        pitch_data.groupby(
+            ["game_pk", "game_date", "home_team", "away_team"], observed=True
+        )
         .agg({"inning": "max", "pitch_number": "count"})
         .reset_index()
     )
 
+    game_dates = pd.to_datetime(games["game_date"])
     games["game_key"] = range(1, len(games) + 1)
-    games["season"] = 2025
+    games["season"] = game_dates.dt.year.astype("int64")
     games["game_type"] = "R"  # Regular season
-    games["day_of_week"] = pd.to_datetime(games["game_date"]).dt.day_name()
-    games["stadium"] = games["home_team"].map(
-        {"TOR": "Rogers Centre", "COL": "Coors Field"}
-    )
+    games["day_of_week"] = game_dates.dt.day_name()
+    games["stadium"] = games["home_team"].map(stadiums or STADIUMS)
     games["weather_temp"] = 72  # Could call a weather api here
     games["weather_condition"] = (
         "Clear"  # But for example purposes, we'll use static values
     )
     games["total_pitches"] = games["pitch_number"]
 
-    return games[
-        [
-            "game_key",
-            "game_pk",
-            "game_date",
-            "season",
-            "game_type",
-            "home_team",
-            "away_team",
-            "stadium",
-            "day_of_week",
-            "weather_temp",
-            "weather_condition",
-            "total_pitches",
-        ]
-    ]
+    return games[GAME_DIMENSION_COLUMNS]
+
+
+def build_dimensions(
+    pitch_data: pd.DataFrame,
+    player_dim: pd.DataFrame,
+    stadiums: Optional[Dict[str, str]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build the conformed dimensions shared by the star, snowflake and OBT models.
+
+    Each dimension is computed once per run and the same frames are handed to
+    every model builder, so the models cannot drift apart.
+
+    Args:
+        pitch_data: DataFrame with pitch-by-pitch data
+        player_dim: DataFrame with player information from the MLB API
+        stadiums: Home team abbreviation to stadium name, defaults to STADIUMS
+
+    Returns:
+        Dictionary with dim_game, dim_count and dim_player
+    """
+    return {
+        "dim_game": create_game_dimension(pitch_data, stadiums),
+        "dim_count": create_count_dimension(),
+        "dim_player": player_dim,
+    }
 
 
 def create_player_dimension(pitch_data: pd.DataFrame) -> pd.DataFrame:
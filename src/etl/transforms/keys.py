@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+def map_keys(
+    values: pd.Series, natural_keys: pd.Series, surrogate_keys: pd.Series
+) -> pd.arrays.IntegerArray:
+    """
+    Map natural keys to surrogate keys with a vectorized index lookup.
+
+    Equivalent to a left merge on the natural key followed by selecting the
+    surrogate column, without copying the left-hand table.
+
+    Args:
+        values: Natural keys to resolve, e.g. the fact table's game_pk column
+        natural_keys: Natural key column of the dimension
+        surrogate_keys: Surrogate key column of the dimension, aligned with natural_keys
+
+    Returns:
+        Nullable integer array of surrogate keys, <NA> where no match exists
+    """
+    unique = ~natural_keys.duplicated().to_numpy()
+    index = pd.Index(natural_keys.to_numpy()[unique])
+    surrogates = surrogate_keys.to_numpy()[unique]
+
+    positions = index.get_indexer(values)
+    missing = positions == -1
+    if len(surrogates) == 0:
+        return pd.arrays.IntegerArray(np.zeros(len(positions), dtype="int64"), missing)
+
+    keys = np.where(missing, 0, surrogates[positions]).astype("int64")
+
+    return pd.arrays.IntegerArray(keys, missing)
+
+
+def count_keys(
+    balls: pd.Series, strikes: pd.Series, count_dim: pd.DataFrame
+) -> pd.arrays.IntegerArray:
+    """
+    Resolve count_key from balls and strikes through a precomputed array.
+
+    The count dimension has one row per (balls, strikes) pair, so the key can
+    be read from a 4x3 lookup indexed by ``balls * 3 + strikes``.
+
+    Args:
+        balls: Balls before the pitch (0-3)
+        strikes: Strikes before the pitch (0-2)
+        count_dim: Count dimension with balls, strikes and count_key columns
+
+    Returns:
+        Nullable integer array of count keys, <NA> for out-of-range counts
+    """
+    lookup = np.zeros(12, dtype="int64")
+    defined = np.zeros(12, dtype=bool)
+    slots = count_dim["balls"].to_numpy() * 3 + count_dim["strikes"].to_numpy()
+    lookup[slots] = count_dim["count_key"].to_numpy()
+    defined[slots] = True
+
+    b = pd.to_numeric(balls).to_numpy(dtype="float64", na_value=np.nan)
+    s = pd.to_numeric(strikes).to_numpy(dtype="float64", na_value=np.nan)
+    valid = (b >= 0) & (b <= 3) & (s >= 0) & (s <= 2)
+    slot = np.where(valid, b * 3 + s, 0).astype("int64")
+    missing = ~valid | ~defined[slot]
+
+    return pd.arrays.IntegerArray(np.where(missing, 0, lookup[slot]), missing)
@@ -1,6 +1,48 @@
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+# Player attributes copied onto each pitch, once for the pitcher and the batter
+PLAYER_COLUMNS = [
+    "player_id",
+    "full_name",
+    "first_name",
+    "last_name",
+    "birth_date",
+    "birth_city",
+    "birth_country",
+    "height",
+    "weight",
+    "bat_side",
+    "pitch_hand",
+    "primary_position",
+    "mlb_debut_date",
+]
+
+# Boolean flags: (output column, source column, values that set the flag)
+FLAG_RULES: List[Tuple[str, str, List[str]]] = [
+    ("is_strike", "type", ["S"]),
+    ("is_ball", "type", ["B"]),
+    ("is_in_play", "type", ["X"]),
+    ("is_swing_and_miss", "description", ["swinging_strike"]),
+    ("is_hit", "events", ["single", "double", "triple", "home_run"]),
+    ("is_home_run", "events", ["home_run"]),
+    ("is_strikeout", "events", ["strikeout"]),
+    ("is_walk", "events", ["walk"]),
+]
+
+# Binned tiers: (output column, source column, bin edges, labels, missing label).
+# Bins are closed on the left, so 90.0 falls in the third label.
+BIN_RULES: List[Tuple[str, str, List[float], List[str], str]] = [
+    (
+        "velocity_tier",
+        "release_speed",
+        [80, 90, 95],
+        ["Slow", "Medium", "Fast", "Very Fast"],
+        "Unknown",
+    ),
+]
+
 
 def create_one_big_table(
     pitch_data: pd.DataFrame,
@@ -33,21 +75,7 @@ def create_one_big_table(
 
     # Add pitcher information
     pitcher_info = player_dim.copy()
-    pitcher_cols = [
-        "player_id",
-        "full_name",
-        "first_name",
-        "last_name",
-        "birth_date",
-        "birth_city",
-        "birth_country",
-        "height",
-        "weight",
-        "bat_side",
-        "pitch_hand",
-        "primary_position",
-        "mlb_debut_date",
-    ]
+    pitcher_cols = PLAYER_COLUMNS
     pitcher_rename = {
         col: f"pitcher_{col}" for col in pitcher_cols if col != "player_id"
     }
@@ -74,17 +102,52 @@ def create_one_big_table(
     )
 
     # Add derived fields
-    big_table["velocity_tier"] = big_table["release_speed"].apply(categorize_velocity)
-    big_table["is_strike"] = big_table["type"] == "S"
-    big_table["is_ball"] = big_table["type"] == "B"
-    big_table["is_in_play"] = big_table["type"] == "X"
-    big_table["is_swing_and_miss"] = big_table["description"] == "swinging_strike"
-    big_table["is_hit"] = big_table["events"].isin(
-        ["single", "double", "triple", "home_run"]
-    )
-    big_table["is_home_run"] = big_table["events"] == "home_run"
-    big_table["is_strikeout"] = big_table["events"] == "strikeout"
-    big_table["is_walk"] = big_table["events"] == "walk"
+    add_derived_fields(big_table)
+
+    return big_table
+
+
+def add_derived_fields(
+    big_table: pd.DataFrame,
+    flag_rules: Optional[List[Tuple[str, str, List[str]]]] = None,
+    bin_rules: Optional[List[Tuple[str, str, List[float], List[str], str]]] = None,
+) -> pd.DataFrame:
+    """
+    Add derived columns from declarative rules, without per-row Python.
+
+    Flags sharing a source column are computed from a single factorization of
+    that column. New metrics are added by appending to FLAG_RULES or BIN_RULES.
+
+    Args:
+        big_table: Table to add the columns to (modified in place)
+        flag_rules: Boolean flag rules, defaults to FLAG_RULES
+        bin_rules: Binning rules, defaults to BIN_RULES
+
+    Returns:
+        The same DataFrame with categorical tiers and boolean flags added
+    """
+    flag_rules = FLAG_RULES if flag_rules is None else flag_rules
+    bin_rules = BIN_RULES if bin_rules is None else bin_rules
+
+    for column, source, edges, labels, missing_label in bin_rules:
+        tiers = pd.cut(
+            big_table[source].astype("float64"),
+            bins=[-np.inf, *edges, np.inf],
+            labels=labels,
+            right=False,
+        )
+        big_table[column] = tiers.cat.add_categories([missing_label]).fillna(
+            missing_label
+        )
+
+    factorized = {}
+    for column, source, values in flag_rules:
+        if source not in factorized:
+            factorized[source] = pd.factorize(big_table[source])
+        codes, uniques = factorized[source]
+        # Extra trailing False so missing values (code -1) map to False
+        matches = np.append(pd.Index(uniques).isin(values), False)
+        big_table[column] = matches[codes]
 
     return big_table
 
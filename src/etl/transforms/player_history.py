@@ -0,0 +1,202 @@
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Player attributes whose changes open a new dimension version, with the
+# dtypes they are compared in (API payloads, CSV and DuckDB round trips all
+# produce slightly different types for the same values)
+TRACKED_DTYPES = {
+    "full_name": "string",
+    "first_name": "string",
+    "last_name": "string",
+    "primary_number": "string",
+    "birth_date": "string",
+    "birth_city": "string",
+    "birth_state_province": "string",
+    "birth_country": "string",
+    "height": "string",
+    "weight": "Int64",
+    "active": "boolean",
+    "primary_position": "string",
+    "bat_side": "string",
+    "pitch_hand": "string",
+    "mlb_debut_date": "string",
+}
+TRACKED_COLUMNS = list(TRACKED_DTYPES)
+
+# Version bounds: the first version of a player covers all earlier games, and
+# the current one is open-ended, so versions of a player tile the timeline
+OPEN_START = "1900-01-01"
+OPEN_END = "9999-12-31"
+
+HISTORY_COLUMNS = (
+    ["player_key", "player_id"] + TRACKED_COLUMNS + ["row_hash", "valid_from", "valid_to", "is_current"]
+)
+
+# Bits of a player/date sort key taken by the day number (days since 0001-01-01)
+DAY_BITS = 22
+
+
+def conform_players(players: pd.DataFrame) -> pd.DataFrame:
+    """Player records with every tracked column, in the dtypes used for hashing."""
+    conformed = pd.DataFrame({"player_id": pd.to_numeric(players["player_id"]).astype("int64")})
+    for column, dtype in TRACKED_DTYPES.items():
+        if column not in players:
+            conformed[column] = pd.Series(pd.NA, index=players.index, dtype=dtype)
+        elif dtype == "string":
+            values = players[column]
+            # CSV readers parse jersey numbers as floats
+            if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+                values = values.astype("Int64")
+            conformed[column] = values.astype("string").where(values.notna(), pd.NA)
+        else:
+            conformed[column] = players[column].astype(dtype)
+    return conformed
+
+
+def row_hashes(players: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of each row's tracked attributes, computed in one vectorized pass."""
+    hashes = pd.util.hash_pandas_object(players[TRACKED_COLUMNS], index=False)
+    return hashes.to_numpy().view("int64")
+
+
+def _versions(players: pd.DataFrame, first_key: int, valid_from) -> pd.DataFrame:
+    versions = players.copy()
+    versions.insert(0, "player_key", np.arange(first_key, first_key + len(players), dtype="int64"))
+    versions["valid_from"] = valid_from
+    versions["valid_to"] = OPEN_END
+    versions["is_current"] = True
+    return versions
+
+
+def merge_player_versions(
+    existing: Optional[pd.DataFrame],
+    snapshot: pd.DataFrame,
+    as_of: str,
+    next_key: Optional[int] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Apply a player snapshot to a type-2 player dimension.
+
+    Each snapshot row is hashed over TRACKED_COLUMNS and compared with the
+    hash of the player's current version. Unchanged players are left alone.
+    A changed player's current version is closed at ``as_of`` and a new
+    version opens there. If the current version itself starts on or after
+    ``as_of`` (a rerun of the same window), it is corrected in place. Unseen
+    players get a first version covering all earlier games. Players missing
+    from the snapshot keep their current version.
+
+    Args:
+        existing: Dimension from earlier runs, or None on the first run
+        snapshot: Player records as returned by PlayersClient
+        as_of: First game date (YYYY-MM-DD) the snapshot describes
+        next_key: First player_key to hand out, when ``existing`` holds only
+            part of the dimension; defaults to one past its largest key
+
+    Returns:
+        The merged dimension ordered by player_key, and only its new or
+        modified rows
+    """
+    snapshot = conform_players(snapshot).drop_duplicates("player_id", keep="last")
+    snapshot = snapshot.sort_values("player_id", ignore_index=True)
+    snapshot["row_hash"] = row_hashes(snapshot)
+
+    if existing is None or existing.empty or "player_key" not in existing:
+        dimension = _versions(snapshot, next_key or 1, OPEN_START)[HISTORY_COLUMNS]
+        logger.info(f"Player dimension: {len(dimension)} new players")
+        return dimension, dimension
+
+    # Rows are addressed by position below, so a slice of a larger dimension
+    # must not keep its index labels
+    existing = existing.reset_index(drop=True)
+    dimension = conform_players(existing)
+    dimension.insert(0, "player_key", existing["player_key"].astype("int64").to_numpy())
+    dimension["valid_from"] = existing["valid_from"].astype(str).str[:10].to_numpy()
+    dimension["valid_to"] = existing["valid_to"].astype(str).str[:10].to_numpy()
+    dimension["is_current"] = existing["is_current"].astype(bool).to_numpy()
+    dimension["row_hash"] = row_hashes(dimension)
+
+    current = dimension.index[dimension["is_current"].to_numpy()]
+    positions = pd.Index(dimension.loc[current, "player_id"]).get_indexer(snapshot["player_id"])
+    unseen = positions == -1
+    rows = current.to_numpy()[np.where(unseen, 0, positions)]
+    changed = ~unseen & (dimension["row_hash"].to_numpy()[rows] != snapshot["row_hash"].to_numpy())
+
+    # Versions opened in this window are corrected rather than versioned again
+    in_place = changed & (dimension["valid_from"].to_numpy()[rows] >= as_of)
+    closed = changed & ~in_place
+    corrected_rows, closed_rows = rows[in_place], rows[closed]
+    for column in TRACKED_COLUMNS + ["row_hash"]:
+        dimension.loc[corrected_rows, column] = snapshot.loc[in_place, column].to_numpy()
+    dimension.loc[closed_rows, "valid_to"] = as_of
+    dimension.loc[closed_rows, "is_current"] = False
+
+    if next_key is None:
+        next_key = int(dimension["player_key"].max()) + 1
+    new_versions = _versions(snapshot[closed], next_key, as_of)
+    new_players = _versions(snapshot[unseen], next_key + len(new_versions), OPEN_START)
+    added = pd.concat([new_versions, new_players], ignore_index=True)[HISTORY_COLUMNS]
+
+    modified = dimension.loc[np.concatenate([corrected_rows, closed_rows]), HISTORY_COLUMNS]
+    merged = pd.concat([dimension[HISTORY_COLUMNS], added], ignore_index=True)
+    logger.info(
+        f"Player dimension: {int(unseen.sum())} new players, {int(closed.sum())} new versions, "
+        f"{int(in_place.sum())} corrected, {len(merged)} rows"
+    )
+    return (
+        merged.sort_values("player_key", ignore_index=True),
+        pd.concat([modified, added], ignore_index=True).sort_values("player_key", ignore_index=True),
+    )
+
+
+def _day_numbers(dates) -> np.ndarray:
+    """Days since 0001-01-01 of YYYY-MM-DD dates, parsing each distinct date once."""
+    codes, uniques = pd.factorize(pd.Series(dates))
+    days = (
+        pd.Series(uniques).astype(str).str[:10].to_numpy(dtype="datetime64[D]").astype("int64")
+        - np.datetime64("0001-01-01", "D").astype("int64")
+    )
+    return np.where(codes >= 0, days[np.maximum(codes, 0)], -1)
+
+
+def current_players(dimension: pd.DataFrame) -> pd.DataFrame:
+    """The current version of every player, without the history columns."""
+    return dimension[dimension["is_current"]][["player_id"] + TRACKED_COLUMNS].reset_index(drop=True)
+
+
+def bind_player_keys(player_ids, game_dates, dimension: pd.DataFrame) -> pd.arrays.IntegerArray:
+    """
+    Surrogate key of the player version current on each game date.
+
+    Versions and pitches are reduced to one int64 sort key, player_id in the
+    high bits and the day number in the low bits, so every pitch finds its
+    version with a single searchsorted over the dimension.
+
+    Args:
+        player_ids: Pitcher or batter ID per pitch
+        game_dates: Game date per pitch, YYYY-MM-DD
+        dimension: Type-2 player dimension
+
+    Returns:
+        Nullable integer array of player_key, <NA> where no version matches
+    """
+    ids = pd.to_numeric(pd.Series(player_ids)).to_numpy(dtype="float64", na_value=np.nan)
+    valid_id = ~np.isnan(ids)
+    ids = np.where(valid_id, ids, 0).astype("int64")
+    days = _day_numbers(game_dates)
+
+    versions = dimension.sort_values(["player_id", "valid_from"])
+    version_ids = versions["player_id"].to_numpy(dtype="int64")
+    version_keys = (version_ids << DAY_BITS) | _day_numbers(versions["valid_from"])
+    valid_to = _day_numbers(versions["valid_to"])
+
+    positions = np.searchsorted(version_keys, (ids << DAY_BITS) | np.maximum(days, 0), side="right") - 1
+    found = positions >= 0
+    positions = np.maximum(positions, 0)
+    found &= valid_id & (days >= 0) & (version_ids[positions] == ids) & (days < valid_to[positions])
+    keys = versions["player_key"].to_numpy(dtype="int64")[positions]
+    return pd.arrays.IntegerArray(np.where(found, keys, 0), ~found)
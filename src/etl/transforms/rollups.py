@@ -0,0 +1,206 @@
+from typing import Dict, List, Optional, Union
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+Table = Union[pd.DataFrame, pa.Table]
+
+SWINGS = (
+    "swinging_strike",
+    "swinging_strike_blocked",
+    "foul",
+    "foul_tip",
+    "foul_bunt",
+    "missed_bunt",
+    "hit_into_play",
+)
+WHIFFS = ("swinging_strike", "swinging_strike_blocked", "missed_bunt")
+STRIKEOUTS = ("strikeout", "strikeout_double_play")
+WALKS = ("walk", "intent_walk")
+HITS = ("single", "double", "triple", "home_run")
+
+# Rollup grains. Every rollup carries the same additive measures, so any of
+# them can be summed further up to a coarser grain.
+ROLLUPS: Dict[str, List[str]] = {
+    "pitcher_game": ["season", "game_key", "game_pk", "game_date", "pitcher", "pitch_type"],
+    "batter_game": ["season", "game_key", "game_pk", "game_date", "batter", "p_throws"],
+    "pitcher_season": ["season", "pitcher", "pitch_type", "count_category"],
+}
+
+# Grain columns that come from a dimension rather than the fact table
+DIMENSION_COLUMNS = {"season": "g", "count_category": "c"}
+
+
+def _in(column: str, values: tuple) -> str:
+    quoted = ", ".join(f"'{value}'" for value in values)
+    return f"{column} IN ({quoted})"
+
+
+# Measures stored in the rollups: counts and sums, never averages or rates
+ADDITIVE_MEASURES: Dict[str, str] = {
+    "pitches": "count(*)",
+    "swings": f"count(*) FILTER (WHERE {_in('f.description', SWINGS)})",
+    "whiffs": f"count(*) FILTER (WHERE {_in('f.description', WHIFFS)})",
+    "called_strikes": "count(*) FILTER (WHERE f.description = 'called_strike')",
+    "balls_in_play": "count(*) FILTER (WHERE f.type = 'X')",
+    "plate_appearances": "count(f.events)",
+    "strikeouts": f"count(*) FILTER (WHERE {_in('f.events', STRIKEOUTS)})",
+    "walks": f"count(*) FILTER (WHERE {_in('f.events', WALKS)})",
+    "hits": f"count(*) FILTER (WHERE {_in('f.events', HITS)})",
+    "home_runs": "count(*) FILTER (WHERE f.events = 'home_run')",
+    "release_speed_sum": "sum(f.release_speed)",
+    "release_speed_count": "count(f.release_speed)",
+    "spin_rate_sum": "sum(f.release_spin_rate)",
+    "spin_rate_count": "count(f.release_spin_rate)",
+    "launch_speed_sum": "sum(f.launch_speed)",
+    "launch_speed_count": "count(f.launch_speed)",
+    "woba_value_sum": "sum(f.woba_value)",
+    "woba_denom_sum": "sum(f.woba_denom)",
+}
+
+# Non-additive measures, derived as numerator / denominator of additive ones
+RATIO_MEASURES: Dict[str, tuple] = {
+    "whiff_rate": ("whiffs", "swings"),
+    "strikeout_rate": ("strikeouts", "plate_appearances"),
+    "walk_rate": ("walks", "plate_appearances"),
+    "avg_release_speed": ("release_speed_sum", "release_speed_count"),
+    "avg_spin_rate": ("spin_rate_sum", "spin_rate_count"),
+    "avg_launch_speed": ("launch_speed_sum", "launch_speed_count"),
+    "woba": ("woba_value_sum", "woba_denom_sum"),
+}
+
+
+def grain_column(column: str) -> str:
+    """Qualified column of the fact/game/count join that a grain column reads."""
+    return f"{DIMENSION_COLUMNS.get(column, 'f')}.{column}"
+
+
+def star_source_sql(fact: str, game: str, count: str) -> str:
+    """FROM clause joining the pitch facts to the game and count dimensions."""
+    return f"""
+        {fact} f
+        LEFT JOIN {game} g ON f.game_key = g.game_key
+        LEFT JOIN {count} c ON f.count_key = c.count_key
+    """
+
+
+def rollup_sql(
+    name: str,
+    fact: str = "star_fact_pitch",
+    game: str = "star_dim_game",
+    count: str = "star_dim_count",
+    seasons: Optional[List[int]] = None,
+) -> str:
+    """
+    SELECT statement aggregating the star schema facts to a rollup's grain.
+
+    Args:
+        name: Rollup name from ROLLUPS
+        fact: Pitch fact table or view
+        game: Game dimension providing season
+        count: Count dimension providing count_category
+        seasons: Only aggregate the pitches of these seasons
+
+    Returns:
+        SQL producing one row per grain with every ADDITIVE_MEASURES column
+    """
+    grain = ROLLUPS[name]
+    select = [f"{grain_column(column)} AS {column}" for column in grain]
+    select += [f"{sql} AS {measure}" for measure, sql in ADDITIVE_MEASURES.items()]
+    positions = ", ".join(str(i + 1) for i in range(len(grain)))
+    where = ""
+    if seasons is not None:
+        where = f"WHERE g.season IN ({', '.join(str(int(season)) for season in seasons)})"
+    return f"""
+        SELECT {', '.join(select)}
+        FROM {star_source_sql(fact, game, count)}
+        {where}
+        GROUP BY {positions}
+        ORDER BY {positions}
+    """
+
+
+def build_rollup_tables(
+    conn: duckdb.DuckDBPyConnection,
+    prefix: str = "star_",
+    rollup_prefix: str = "rollup_",
+    seasons: Optional[List[int]] = None,
+) -> List[str]:
+    """
+    Create or replace the rollup tables from star schema tables in a database.
+
+    Every grain is within a season, so with ``seasons`` only the rows of
+    those seasons are deleted and aggregated again; the other seasons are
+    kept as they are. Rollup tables that don't exist yet are built whole.
+
+    Returns:
+        Names of the rollup tables
+    """
+    existing = {
+        row[0]
+        for row in conn.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
+        ).fetchall()
+    }
+    tables = []
+    for name in ROLLUPS:
+        table = f"{rollup_prefix}{name}"
+        sources = (f"{prefix}fact_pitch", f"{prefix}dim_game", f"{prefix}dim_count")
+        if seasons is None or table not in existing:
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS " + rollup_sql(name, *sources))
+        elif seasons:
+            season_list = ", ".join(str(int(season)) for season in seasons)
+            conn.execute(f"DELETE FROM {table} WHERE season IN ({season_list})")
+            conn.execute(f"INSERT INTO {table} " + rollup_sql(name, *sources, seasons))
+        tables.append(table)
+    return tables
+
+
+def dictionary_like(rollup: pa.Table, fact_pitch: pa.Table) -> pa.Table:
+    """
+    Dictionary-encode the rollup columns that are dictionaries in the facts.
+
+    DuckDB returns Arrow dictionaries as plain strings but pandas categoricals
+    as ENUMs, which come back categorical; this keeps both engines alike.
+    """
+    for index, column in enumerate(rollup.column_names):
+        if column in fact_pitch.column_names and pa.types.is_dictionary(
+            fact_pitch.schema.field(column).type
+        ):
+            rollup = rollup.set_column(index, column, pc.dictionary_encode(rollup[column]))
+    return rollup
+
+
+def create_rollups(fact_pitch: Table, game_dim: Table, count_dim: Table) -> Dict[str, Table]:
+    """
+    Aggregate the star schema facts to pitcher x game, batter x game and pitcher x season.
+
+    The aggregation runs in an in-memory DuckDB over the given DataFrames or
+    Arrow tables, so every engine shares one definition of the measures.
+
+    Args:
+        fact_pitch: Star schema pitch facts
+        game_dim: Game dimension with game_key and season
+        count_dim: Count dimension with count_key and count_category
+
+    Returns:
+        Dictionary of rollup tables, Arrow tables when fact_pitch is one
+    """
+    arrow = isinstance(fact_pitch, pa.Table)
+    conn = duckdb.connect()
+    try:
+        conn.register("fact_pitch", fact_pitch)
+        conn.register("dim_game", game_dim)
+        conn.register("dim_count", count_dim)
+        rollups = {}
+        for name in ROLLUPS:
+            result = conn.execute(rollup_sql(name, "fact_pitch", "dim_game", "dim_count"))
+            if arrow:
+                rollups[name] = dictionary_like(result.fetch_arrow_table(), fact_pitch)
+            else:
+                rollups[name] = result.df()
+        return rollups
+    finally:
+        conn.close()
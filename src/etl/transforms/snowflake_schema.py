@@ -1,9 +1,24 @@
 from typing import Dict
 import pandas as pd
+from etl.transforms.keys import count_keys, map_keys
+
+# Player attributes normalized by the snowflake schema
+PLAYER_COLUMNS = [
+    "player_id",
+    "full_name",
+    "first_name",
+    "last_name",
+    "birth_city",
+    "birth_country",
+    "primary_position",
+]
 
 
 def create_snowflake_schema(
-    pitch_data: pd.DataFrame, player_data: pd.DataFrame
+    pitch_data: pd.DataFrame,
+    player_data: pd.DataFrame,
+    game_dim: pd.DataFrame,
+    count_dim: pd.DataFrame,
 ) -> Dict[str, pd.DataFrame]:
     """
     Create normalized dimensions for snowflake schema (3NF).
@@ -11,37 +26,14 @@ def create_snowflake_schema(
     Args:
         pitch_data: Raw pitch data DataFrame.
         player_data: Player data DataFrame.
+        game_dim: Shared game dimension DataFrame.
+        count_dim: Shared count dimension DataFrame.
 
     Returns:
         Dictionary of normalized dimension tables and fact table.
     """
-    # Create game dimension
-    game_dim = (
-        pitch_data.groupby(["game_pk", "game_date", "home_team", "away_team"])
-        .agg({"inning": "max", "pitch_number": "count"})
-        .reset_index()
-    )
-
-    game_dim["game_key"] = range(1, len(game_dim) + 1)
-    game_dim["season"] = 2025
-    game_dim["game_type"] = "R"  # Regular season
-    game_dim["day_of_week"] = pd.to_datetime(game_dim["game_date"]).dt.day_name()
-    game_dim["stadium"] = game_dim["home_team"].map(
-        {"TOR": "Rogers Centre", "COL": "Coors Field"}
-    )
-
     # Create player dimension
-    player_dim = player_data[
-        [
-            "player_id",
-            "full_name",
-            "first_name",
-            "last_name",
-            "birth_city",
-            "birth_country",
-            "primary_position",
-        ]
-    ].drop_duplicates()
+    player_dim = player_data[PLAYER_COLUMNS].drop_duplicates()
     player_dim["player_key"] = range(1, len(player_dim) + 1)
 
     # Create position dimension
@@ -70,54 +62,17 @@ def create_snowflake_schema(
     # Keep only the foreign key reference
     player_dim = player_dim.drop(columns=["birth_city", "birth_country", "primary_position"])
 
-    # Create count dimension - using same structure as star schema for consistency
-    count_dim = []
-    count_key = 1
-    
-    for balls in range(4):
-        for strikes in range(3):
-            count_display = f"{balls}-{strikes}"
-            
-            # Categorize count as in star schema
-            if balls > strikes:
-                count_category = "Hitter's Count"
-            elif strikes > balls:
-                count_category = "Pitcher's Count"
-            else:
-                count_category = "Neutral Count"
-                
-            count_dim.append({
-                "count_key": count_key,
-                "balls": balls,
-                "strikes": strikes,
-                "count_display": count_display,
-                "count_category": count_category
-            })
-            count_key += 1
-            
-    count_dim = pd.DataFrame(count_dim)
-
-    # Create fact table
-    fact = pitch_data.copy()
-    fact = fact.merge(game_dim[["game_pk", "game_key"]], on="game_pk", how="left")
-    fact = fact.merge(
-        player_dim[["player_id", "player_key"]],
-        left_on="pitcher",
-        right_on="player_id",
-        how="left",
-    )
-    fact = fact.merge(
-        player_dim[["player_id", "player_key"]],
-        left_on="batter",
-        right_on="player_id",
-        how="left",
-        suffixes=("_pitcher", "_batter"),
-    )
-    fact = fact.merge(
-        count_dim[["balls", "strikes", "count_key"]],
-        on=["balls", "strikes"],
-        how="left",
-    )
+    # Create fact table: key columns are added to a shallow copy of the pitches
+    fact = pitch_data.copy(deep=False)
+    fact["game_key"] = map_keys(fact["game_pk"], game_dim["game_pk"], game_dim["game_key"])
+    for role in ["pitcher", "batter"]:
+        fact[f"player_id_{role}"] = map_keys(
+            fact[role], player_dim["player_id"], player_dim["player_id"]
+        )
+        fact[f"player_key_{role}"] = map_keys(
+            fact[role], player_dim["player_id"], player_dim["player_key"]
+        )
+    fact["count_key"] = count_keys(fact["balls"], fact["strikes"], count_dim)
 
     return {
         "dim_game": pd.DataFrame(game_dim),
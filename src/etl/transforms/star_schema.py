@@ -1,5 +1,7 @@
 from datetime import datetime
 import pandas as pd
+from etl.transforms.keys import count_keys, map_keys
+from etl.transforms.player_history import bind_player_keys
 
 def create_star_schema(
     pitch_data: pd.DataFrame,
@@ -13,42 +15,38 @@ def create_star_schema(
     Args:
         pitch_data: DataFrame containing pitch-by-pitch data.
         game_dim: DataFrame containing game dimension data with game_key.
-        player_dim: DataFrame containing player dimension data with player_id.
+        player_dim: DataFrame containing player dimension data with player_id;
+            with a type-2 dimension (player_history.merge_player_versions),
+            pitcher_key and batter_key bind each pitch to the player
+            versions current on its game_date.
         count_dim: DataFrame containing count dimension data with count_key.
 
     Returns:
         Dictionary of DataFrames: fact_pitch with proper foreign keys
     """
-    # Create fact table with foreign keys
-    fact = pitch_data.copy()
+    # Shallow copy: key columns are added without copying the pitch data
+    fact = pitch_data.copy(deep=False)
 
     # Add game_key from game dimension
-    fact = fact.merge(game_dim[["game_pk", "game_key"]], on="game_pk", how="left")
+    fact["game_key"] = map_keys(fact["game_pk"], game_dim["game_pk"], game_dim["game_key"])
 
     # Add pitcher foreign key (player_id is the primary key)
-    fact = fact.merge(
-        player_dim[["player_id"]], 
-        left_on="pitcher", 
-        right_on="player_id", 
-        how="left",
-        suffixes=("", "_pitcher_fk")
+    fact["player_id"] = map_keys(
+        fact["pitcher"], player_dim["player_id"], player_dim["player_id"]
     )
-    
-    # Add batter foreign key  
-    fact = fact.merge(
-        player_dim[["player_id"]], 
-        left_on="batter", 
-        right_on="player_id", 
-        how="left", 
-        suffixes=("", "_batter_fk")
+
+    # Add batter foreign key
+    fact["player_id_batter_fk"] = map_keys(
+        fact["batter"], player_dim["player_id"], player_dim["player_id"]
     )
 
     # Add count foreign key
-    fact = fact.merge(
-        count_dim[["balls", "strikes", "count_key"]], 
-        on=["balls", "strikes"], 
-        how="left"
-    )
+    fact["count_key"] = count_keys(fact["balls"], fact["strikes"], count_dim)
+
+    # Add player version keys
+    if "valid_from" in player_dim:
+        fact["pitcher_key"] = bind_player_keys(fact["pitcher"], fact["game_date"], player_dim)
+        fact["batter_key"] = bind_player_keys(fact["batter"], fact["game_date"], player_dim)
 
     return {
         "fact_pitch": fact
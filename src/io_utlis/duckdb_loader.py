@@ -1,88 +1,280 @@
-from duckdb import connect
+from typing import Dict, List, Optional
+from duckdb import DuckDBPyConnection, connect
+import argparse
+import logging
 import os
+import time
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
 
+from etl.duckdb_engine import (
+    drop_relation,
+    literal,
+    materialize_one_big_table,
+    quote,
+    relation_type,
+    table_name,
+)
+from config import OBT_MATERIALIZATIONS, obt_policy
+from etl.statcast_schema import statcast_sql_types
+from io_utlis.write import read_dataset_schema, read_manifest
 
-def load_csv_to_duckdb(db_path: str, csv_path: str, table_name: str):
-    """Load CSV data into DuckDB."""
-    conn = connect(db_path)
-    conn.execute(
-        f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_csv_auto('{csv_path}')"
-    )
-    conn.close()
+logger = logging.getLogger(__name__)
 
 
-def load_parquet_to_duckdb(db_path: str, parquet_path: str, table_name: str):
-    """Load Parquet data into DuckDB."""
-    conn = connect(db_path)
-    conn.execute(
-        f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_parquet('{parquet_path}')"
+def table_exists(conn: DuckDBPyConnection, table_name: str) -> bool:
+    """Check whether a table exists in the database."""
+    return (
+        conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = ?",
+            [table_name],
+        ).fetchone()[0]
+        > 0
     )
-    conn.close()
 
 
-def main():
-    """Main function to load data into DuckDB."""
-    db_path = os.path.join("db", "duckdb", "mlb_data.duckdb")
-
-    # Load Star Schema Parquet files
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "star", "dim_game.parquet"),
-        "star_dim_game",
-    )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "star", "dim_player.parquet"),
-        "star_dim_player",
-    )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "star", "dim_count.parquet"),
-        "star_dim_count",
-    )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "star", "fact_pitch.parquet"),
-        "star_fact_pitch",
-    )
+def read_table(conn: DuckDBPyConnection, table_name: str) -> Optional[pd.DataFrame]:
+    """Read a whole table, or None when it does not exist yet."""
+    if not table_exists(conn, table_name):
+        return None
+    return conn.execute(f"SELECT * FROM {table_name}").df()
+
+
+def require_tables(conn: DuckDBPyConnection, table_names: List[str]):
+    """
+    Refuse to write into relations that are views.
+
+    ``duckdb_loader --mode view`` (make export-views) creates views reading
+    the Parquet outputs in place, which DuckDB cannot delete from or insert
+    into.
+
+    Raises:
+        ValueError: If any of the relations is a view
+    """
+    views = [name for name in table_names if relation_type(conn, name) == "VIEW"]
+    if views:
+        raise ValueError(
+            f"{', '.join(views)} in the database are views over the Parquet files; "
+            "incremental runs need `mode=table`, reload them with `make export` "
+            "(duckdb_loader --mode table)"
+        )
+
+
+def upsert_dataframe(
+    conn: DuckDBPyConnection, table_name: str, df: pd.DataFrame, key_columns: List[str]
+):
+    """
+    Insert rows, replacing existing rows with the same key.
+
+    Tables built with CREATE TABLE AS have no primary key, so ON CONFLICT is
+    not available; the upsert deletes matching keys and inserts the new rows
+    in one transaction instead. With a partition column such as game_date as
+    the key, this replaces whole partitions.
+
+    Args:
+        conn: Open DuckDB connection
+        table_name: Target table, created from ``df`` when missing
+        df: Rows to upsert
+        key_columns: Columns identifying a row (or a partition)
+
+    Raises:
+        ValueError: If the target is a view rather than a table
+    """
+    require_tables(conn, [table_name])
+    # Plain strings rather than pandas categoricals, which DuckDB would turn
+    # into ENUM columns that reject values from later runs
+    rows = pa.Table.from_pandas(df, preserve_index=False)
+    for index, field in enumerate(rows.schema):
+        if pa.types.is_dictionary(field.type):
+            rows = rows.set_column(
+                index, field.name, rows[field.name].cast(field.type.value_type)
+            )
+
+    conn.register("upsert_rows", rows)
+    try:
+        conn.execute("BEGIN TRANSACTION")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM upsert_rows LIMIT 0"
+        )
+        match = " AND ".join(
+            f"{table_name}.{column} = upsert_rows.{column}" for column in key_columns
+        )
+        conn.execute(f"DELETE FROM {table_name} USING upsert_rows WHERE {match}")
+        conn.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM upsert_rows")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.unregister("upsert_rows")
 
-    # Load Snowflake Schema Parquet files
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "dim_game.parquet"),
-        "snowflake_dim_game",
+
+def partition_types(path: str) -> Dict[str, str]:
+    """
+    DuckDB types of the hive partition columns of a dataset.
+
+    Without hive_types, DuckDB infers game_date as DATE and game_year as
+    BIGINT, while the single-file layout stores them as VARCHAR and INTEGER.
+    Types come from the schema the writer recorded, or from the Statcast
+    schema for datasets written before schemas were recorded.
+    """
+    first_file = next(Path(path).rglob("*.parquet"), None)
+    if first_file is None:
+        return {}
+    columns = [
+        part.split("=", 1)[0] for part in first_file.relative_to(path).parts if "=" in part
+    ]
+    types = statcast_sql_types()
+    schema = read_dataset_schema(Path(path))
+    if schema is not None:
+        conn = connect()
+        try:
+            relation = conn.from_arrow(schema.empty_table())
+            types.update(zip(relation.columns, (str(t) for t in relation.types)))
+        finally:
+            conn.close()
+    return {column: types.get(column, "VARCHAR") for column in columns}
+
+
+def manifest_scan(processed_dir: str, entry: Dict) -> str:
+    """
+    read_parquet call for a manifest entry, with an absolute path so views keep working.
+
+    Partitioned datasets load with the same column types, and when their
+    schema was recorded the same column order, as the single-file layout.
+    """
+    path = os.path.abspath(os.path.join(processed_dir, entry["path"]))
+    if not entry["partitioned"]:
+        return f"read_parquet({literal(path)})"
+
+    hive_types = ", ".join(
+        f"{literal(column)}: {literal(sql_type)}"
+        for column, sql_type in partition_types(path).items()
     )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "dim_player.parquet"),
-        "snowflake_dim_player",
+    scan = (
+        f"read_parquet({literal(path + '/**/*.parquet')}, hive_partitioning = true"
+        + (f", hive_types = {{{hive_types}}})" if hive_types else ")")
     )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "dim_count.parquet"),
-        "snowflake_dim_count",
+    schema = read_dataset_schema(Path(path))
+    if schema is None:
+        return scan
+    # Partition columns would otherwise come last
+    return f"(SELECT {', '.join(quote(name) for name in schema.names)} FROM {scan})"
+
+
+def load_models(
+    db_path: str = os.path.join("db", "duckdb", "mlb_data.duckdb"),
+    processed_dir: str = os.path.join("data", "processed"),
+    mode: str = "table",
+    models: Optional[List[str]] = None,
+    threads: Optional[int] = None,
+    obt: Optional[Dict] = None,
+) -> Dict[str, int]:
+    """
+    Load every model table listed in the pipeline manifest into DuckDB.
+
+    All tables are created on one connection inside a single transaction, so
+    the database either has the whole new load or keeps the previous one.
+    DuckDB scans the Parquet files (and partitioned dataset globs) with its
+    own thread pool.
+
+    Args:
+        db_path: DuckDB database file
+        processed_dir: Pipeline output directory holding manifest.json
+        mode: "table" to copy the data into the database, "view" for views
+            reading the Parquet files in place
+        models: Only load these models (star, snowflake, obt, rollup)
+        threads: DuckDB worker threads, defaults to one per core
+        obt: OBT materialization policy (see config.obt_policy). With
+            "view", one_big_table is a view over the loaded star tables;
+            with "partial", only the hot columns of the OBT files are loaded
+
+    Returns:
+        Row count per DuckDB table, from the manifest
+    """
+    if mode not in ("table", "view"):
+        raise ValueError(f"Unknown load mode: {mode}")
+    materialization = (obt or {}).get("materialization", "table")
+    load_obt = models is None or "obt" in models
+    entries = [
+        entry
+        for entry in read_manifest(processed_dir)["tables"]
+        if (models is None or entry["model"] in models)
+        and not (entry["model"] == "obt" and materialization == "view")
+    ]
+
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = connect(db_path)
+    loaded = {}
+    try:
+        if threads:
+            conn.execute(f"SET threads = {int(threads)}")
+        conn.execute("BEGIN TRANSACTION")
+        for entry in entries:
+            name = table_name(entry["model"], entry["name"])
+            columns = "*"
+            if entry["model"] == "obt" and materialization == "partial":
+                columns = ", ".join(quote(column) for column in obt["hot_columns"])
+            drop_relation(conn, name)
+            conn.execute(
+                f"CREATE {mode.upper()} {quote(name)} AS "
+                f"SELECT {columns} FROM {manifest_scan(processed_dir, entry)}"
+            )
+            loaded[name] = entry["rows"]
+        if load_obt and materialization == "view" and relation_type(conn, "star_fact_pitch"):
+            materialize_one_big_table(conn, "view")
+            loaded["one_big_table"] = conn.execute(
+                "SELECT count(*) FROM star_fact_pitch"
+            ).fetchone()[0]
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    for name, rows in loaded.items():
+        logger.info(f"Loaded {name} ({mode}): {rows} rows")
+    return loaded
+
+
+def main():
+    """Load the pipeline outputs into DuckDB."""
+    parser = argparse.ArgumentParser(description="Load model tables into DuckDB")
+    parser.add_argument(
+        "--db", default=os.path.join("db", "duckdb", "mlb_data.duckdb"), help="DuckDB database file"
     )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "dim_position.parquet"),
-        "snowflake_dim_position",
+    parser.add_argument(
+        "--processed-dir",
+        default=os.path.join("data", "processed"),
+        help="Pipeline output directory",
     )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "dim_birth_location.parquet"),
-        "snowflake_dim_birth_location",
+    parser.add_argument(
+        "--mode",
+        choices=["table", "view"],
+        default="table",
+        help="Materialize tables or create views over the Parquet files",
     )
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "snowflake", "fact_pitch.parquet"),
-        "snowflake_fact_pitch",
+    parser.add_argument("--models", nargs="*", help="Models to load (default: all)")
+    parser.add_argument("--threads", type=int, help="DuckDB worker threads")
+    parser.add_argument(
+        "--obt",
+        choices=list(OBT_MATERIALIZATIONS),
+        help="OBT materialization, defaults to obt.materialization in config.yaml",
     )
+    args = parser.parse_args()
 
-    # Load One Big Table Parquet file
-    load_parquet_to_duckdb(
-        db_path,
-        os.path.join("data", "processed", "obt", "one_big_table.parquet"),
-        "one_big_table",
+    logging.basicConfig(level=logging.INFO)
+    obt = obt_policy()
+    if args.obt:
+        obt["materialization"] = args.obt
+    start = time.perf_counter()
+    loaded = load_models(
+        args.db, args.processed_dir, args.mode, args.models, args.threads, obt
+    )
+    logger.info(
+        f"Loaded {len(loaded)} tables into {args.db} in {time.perf_counter() - start:.2f}s"
     )
 
 
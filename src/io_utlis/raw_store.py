@@ -0,0 +1,202 @@
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from etl.statcast_schema import (
+    PITCH_KEY,
+    concat_statcast,
+    concat_statcast_arrow,
+    drop_duplicate_pitches,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JsonLinesWriter:
+    """Thread-safe appender of records to a gzip-compressed JSON Lines file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Appending adds a new gzip member, which readers handle transparently
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+
+    def write(self, record: Dict):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RawStore:
+    """
+    Raw landing zone for source data.
+
+    Statcast pitches are stored as zstd-compressed Parquet partitioned by
+    ``game_date``, and MLB API responses as gzip JSON Lines partitioned by
+    fetch date::
+
+        raw/statcast/game_date=2025-08-04/statcast_TOR-COL.parquet
+        raw/mlb/fetch_date=2025-08-07/player_api_responses.jsonl.gz
+    """
+
+    def __init__(self, root: str = "data/raw", compression: str = "zstd"):
+        self.root = Path(root)
+        self.compression = compression
+        self.statcast_dir = self.root / "statcast"
+        self.mlb_dir = self.root / "mlb"
+
+    def statcast_partition(self, game_date: str) -> Path:
+        return self.statcast_dir / f"game_date={game_date}"
+
+    def write_statcast(self, df: Union[pd.DataFrame, pa.Table], part_name: str) -> List[Path]:
+        """
+        Write pitches into their ``game_date`` partitions.
+
+        Writing the same ``part_name`` again replaces that part, so refetching
+        a chunk is idempotent.
+
+        Args:
+            df: Parsed Statcast pitches, as a DataFrame or an Arrow table
+            part_name: File stem identifying the source chunk, e.g. "statcast_TOR"
+
+        Returns:
+            Paths of the Parquet files written
+        """
+        paths = []
+        if len(df) == 0:
+            return paths
+
+        for game_date, part in self._split_by_game_date(df):
+            partition = self.statcast_partition(str(game_date))
+            partition.mkdir(parents=True, exist_ok=True)
+            path = partition / f"{part_name}.parquet"
+            tmp_path = partition / f".{part_name}.parquet.tmp"
+            if isinstance(part, pa.Table):
+                pq.write_table(part, tmp_path, compression=self.compression)
+            else:
+                part.to_parquet(tmp_path, index=False, compression=self.compression)
+            os.replace(tmp_path, path)
+            paths.append(path)
+
+        return paths
+
+    @staticmethod
+    def _split_by_game_date(df: Union[pd.DataFrame, pa.Table]):
+        if isinstance(df, pa.Table):
+            for game_date in sorted(pc.unique(df.column("game_date")).to_pylist()):
+                yield game_date, df.filter(pc.equal(df.column("game_date"), game_date))
+        else:
+            yield from df.groupby("game_date", sort=True)
+
+    def statcast_dates(self) -> List[str]:
+        """List the game dates that have a Statcast partition."""
+        if not self.statcast_dir.exists():
+            return []
+        return sorted(
+            partition.name.split("=", 1)[1]
+            for partition in self.statcast_dir.glob("game_date=*")
+            if partition.is_dir()
+        )
+
+    def _part_paths(self, game_date: str, parts: Optional[List[str]]) -> List[Path]:
+        return [
+            path
+            for path in sorted(self.statcast_partition(game_date).glob("*.parquet"))
+            if parts is None or path.stem in parts
+        ]
+
+    def _dates_between(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> List[str]:
+        return [
+            game_date
+            for game_date in self.statcast_dates()
+            if (start_date is None or game_date >= start_date)
+            and (end_date is None or game_date <= end_date)
+        ]
+
+    def read_statcast(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        parts: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read back only the partitions within an inclusive date range.
+
+        Args:
+            start_date: First game date to read, or None for no lower bound
+            end_date: Last game date to read, or None for no upper bound
+            parts: Part names to read, e.g. ["statcast_TOR"], or None for all parts
+
+        Returns:
+            DataFrame with the stored pitches, deduplicated across parts
+        """
+        dates = self._dates_between(start_date, end_date)
+        frames = [
+            pd.read_parquet(path)
+            for game_date in dates
+            for path in self._part_paths(game_date, parts)
+        ]
+        logger.info(f"Read {len(frames)} Statcast parts for {len(dates)} game dates")
+
+        df = concat_statcast(frames)
+        if len(frames) > 1 and set(PITCH_KEY).issubset(df.columns):
+            df = df.drop_duplicates(subset=PITCH_KEY, ignore_index=True)
+        return df
+
+    def read_statcast_table(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        parts: Optional[List[str]] = None,
+    ) -> pa.Table:
+        """Arrow version of :meth:`read_statcast`."""
+        tables = [
+            pq.read_table(path)
+            for game_date in self._dates_between(start_date, end_date)
+            for path in self._part_paths(game_date, parts)
+        ]
+        logger.info(f"Read {len(tables)} Statcast parts as Arrow tables")
+
+        table = concat_statcast_arrow(tables)
+        if len(tables) > 1:
+            table = drop_duplicate_pitches(table)
+        return table
+
+    def player_writer(self, fetch_date: Optional[str] = None) -> JsonLinesWriter:
+        """Open an appender for raw player API responses of a fetch date."""
+        fetch_date = fetch_date or datetime.now().strftime("%Y-%m-%d")
+        path = self.mlb_dir / f"fetch_date={fetch_date}" / "player_api_responses.jsonl.gz"
+        return JsonLinesWriter(path)
+
+    def read_player_responses(self, fetch_date: Optional[str] = None) -> Iterator[Dict]:
+        """Iterate over stored raw player API responses, optionally for one fetch date."""
+        pattern = f"fetch_date={fetch_date or '*'}/*.jsonl.gz"
+        for path in sorted(self.mlb_dir.glob(pattern)):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
@@ -0,0 +1,224 @@
+from typing import Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import time
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from pathlib import Path
+
+from io_utlis.write import read_manifest, remove_path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MANIFEST = "manifest.json"
+
+
+def source_signature(processed_dir: str, entry: Dict) -> List:
+    """Number of files, total size and latest modification time of a Parquet output."""
+    path = Path(processed_dir) / entry["path"]
+    files = sorted(path.rglob("*.parquet")) if entry["partitioned"] else [path]
+    stats = [f.stat() for f in files]
+    return [len(stats), sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0)]
+
+
+def read_output(processed_dir: str, entry: Dict) -> pa.Table:
+    """
+    Read a Parquet output listed in the processed manifest as one Arrow table.
+
+    Partition columns of a partitioned dataset are restored from the hive
+    directory names, as the streaming rollups read them. Dictionaries are
+    unified across chunks because an IPC file holds one dictionary per column.
+    """
+    path = Path(processed_dir) / entry["path"]
+    if entry["partitioned"]:
+        table = ds.dataset(path, format="parquet", partitioning="hive").to_table()
+    else:
+        table = pq.read_table(path)
+    return table.unify_dictionaries()
+
+
+def write_snapshot(table: pa.Table, path: Path, compression: str = "uncompressed") -> int:
+    """
+    Write a table as a Feather v2 (Arrow IPC) file and return its size.
+
+    The file is written under a temporary name and renamed, so a process
+    that has the previous snapshot mapped keeps reading the old file.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        feather.write_feather(table, str(tmp_path), compression=compression, version=2)
+        os.replace(tmp_path, path)
+    finally:
+        remove_path(tmp_path)
+    return path.stat().st_size
+
+
+def write_snapshots(
+    processed_dir: str,
+    snapshot_dir: str,
+    compression: str = "uncompressed",
+    models: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Snapshot the Parquet outputs of each model as Feather v2 files.
+
+    Snapshots mirror the processed directory, e.g. star/fact_pitch.arrow, and
+    are listed in a manifest next to them. A table whose Parquet files have
+    not changed since the last snapshot (same count, size and modification
+    time) keeps its snapshot, so runs served from the stage cache cost
+    nothing here.
+
+    Args:
+        processed_dir: Directory holding the model directories and their manifest
+        snapshot_dir: Directory receiving ``{model}/{name}.arrow`` files
+        compression: "uncompressed" for zero-copy loads, or "lz4" for
+            smaller files that are decompressed on load
+        models: Models to snapshot, every model by default
+
+    Returns:
+        Snapshot manifest with one entry per table: model, name, path, rows,
+        bytes, seconds and the signature of its Parquet source
+    """
+    root = Path(snapshot_dir)
+    previous = {
+        (entry["model"], entry["name"]): entry
+        for entry in read_snapshot_manifest(snapshot_dir).get("tables", [])
+    }
+    sources = [
+        entry
+        for entry in read_manifest(processed_dir)["tables"]
+        if models is None or entry["model"] in models
+    ]
+    if not sources:
+        logger.warning(f"No Parquet outputs under {processed_dir} to snapshot")
+
+    tables = []
+    for entry in sources:
+        path = root / entry["model"] / f"{entry['name']}.arrow"
+        signature = source_signature(processed_dir, entry)
+        cached = previous.get((entry["model"], entry["name"]))
+        if (
+            cached
+            and cached["source"] == signature
+            and cached["compression"] == compression
+            and path.exists()
+        ):
+            tables.append(cached)
+            continue
+
+        start = time.perf_counter()
+        table = read_output(processed_dir, entry)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = write_snapshot(table, path, compression)
+        tables.append(
+            {
+                "model": entry["model"],
+                "name": entry["name"],
+                "path": str(path.relative_to(root)),
+                "compression": compression,
+                "rows": table.num_rows,
+                "bytes": size,
+                "seconds": round(time.perf_counter() - start, 4),
+                "source": signature,
+            }
+        )
+        logger.info(f"Snapshot {path} ({table.num_rows} rows, {size} bytes)")
+
+    # Snapshots of tables that are no longer written would otherwise be loaded as current
+    current = {(entry["model"], entry["name"]) for entry in tables}
+    for key, entry in previous.items():
+        if key not in current and (models is None or entry["model"] in models):
+            remove_path(root / entry["path"])
+        elif key not in current:
+            tables.append(entry)
+
+    manifest = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "tables": tables}
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / SNAPSHOT_MANIFEST
+    tmp_path = manifest_path.with_name(f".{SNAPSHOT_MANIFEST}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def read_snapshot_manifest(snapshot_dir: str) -> Dict:
+    """Read the snapshot manifest, empty when no snapshot was written yet."""
+    path = Path(snapshot_dir) / SNAPSHOT_MANIFEST
+    if not path.exists():
+        return {"tables": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_snapshot(path: str) -> pa.Table:
+    """
+    Open a Feather v2 snapshot memory-mapped.
+
+    Uncompressed columns point straight into the mapped file: nothing is
+    copied or decoded, the pages are read lazily and every process mapping
+    the same file shares them through the page cache. LZ4 snapshots are
+    decompressed into memory instead.
+    """
+    with pa.memory_map(str(path), "r") as source:
+        # The table's buffers keep the mapping alive after the file is closed
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_snapshots(
+    snapshot_dir: str = "data/snapshots", model: str = "star", tables: Optional[List[str]] = None
+) -> Dict[str, pa.Table]:
+    """
+    Open the snapshots of a model, e.g. dim_player, dim_game and fact_pitch of the star schema.
+
+    Args:
+        snapshot_dir: Directory written by :func:`write_snapshots`
+        model: Model directory, "star", "snowflake", "obt" or "rollup"
+        tables: Table names to open, every snapshot of the model by default
+
+    Returns:
+        Mapping of table name to memory-mapped Arrow table
+    """
+    entries = {
+        entry["name"]: entry
+        for entry in read_snapshot_manifest(snapshot_dir)["tables"]
+        if entry["model"] == model
+    }
+    names = list(entries) if tables is None else tables
+    missing = [name for name in names if name not in entries]
+    if missing:
+        raise FileNotFoundError(f"No {model} snapshot of {missing} in {snapshot_dir}")
+    return {name: open_snapshot(Path(snapshot_dir) / entries[name]["path"]) for name in names}
+
+
+def main():
+    """Build snapshots from the processed outputs, or time how fast they load."""
+    parser = argparse.ArgumentParser(description="Arrow IPC snapshots of the processed models")
+    parser.add_argument("--data-dir", default="data", help="Pipeline data directory")
+    parser.add_argument("--build", action="store_true", help="Snapshot data/processed first")
+    parser.add_argument("--compression", choices=["uncompressed", "lz4"], default="uncompressed")
+    parser.add_argument("--model", default="star", help="Model to load")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    snapshot_dir = f"{args.data_dir}/snapshots"
+    if args.build:
+        write_snapshots(f"{args.data_dir}/processed", snapshot_dir, args.compression)
+
+    start = time.perf_counter()
+    tables = load_snapshots(snapshot_dir, args.model)
+    elapsed = time.perf_counter() - start
+    for name, table in tables.items():
+        logger.info(f"{args.model}.{name}: {table.num_rows} rows, {table.nbytes} bytes")
+    logger.info(
+        f"Opened {len(tables)} snapshots in {elapsed * 1000:.1f} ms, "
+        f"{pa.total_allocated_bytes()} bytes allocated"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,31 @@
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+import json
+import logging
+import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import os
+import shutil
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+Table = Union[pd.DataFrame, pa.Table]
+
+# Parquet tuning, overridden by output.parquet in config.yaml. Row groups match
+# DuckDB's 122,880-row vectors so min/max statistics can skip whole groups.
+PARQUET_DEFAULTS = {
+    "compression": "zstd",
+    "row_group_size": 122_880,
+    "layout": "file",
+    "partitioned_tables": ["fact_pitch", "one_big_table"],
+    "partition_by": ["game_year", "game_date"],
+    "sort_by": ["pitcher"],
+}
+
 
 def write_to_csv(dataframes: dict, output_dir: str = "data/processed"):
     """Write dataframes to CSV files."""
@@ -26,11 +49,361 @@ def write_to_parquet(dataframes: dict, output_dir: str = "data/processed"):
         print(f"Saved {name} to {file_path}")
 
 
-def save_dataframes(dataframes: Dict[str, pd.DataFrame], output_dir: str):
-    """Save DataFrames to both CSV and Parquet formats."""
-    os.makedirs(output_dir, exist_ok=True)
-    write_to_csv(dataframes, output_dir)
-    write_to_parquet(dataframes, output_dir)
+def save_dataframes(dataframes: Dict[str, pd.DataFrame], output_dir: str) -> List[Dict]:
+    """Save DataFrames to the configured formats in a single concurrent pass."""
+    return write_tables(dataframes, output_dir)
+
+
+def _write_csv(table: Table, path: Path, options: Dict):
+    # pandas writes the published CSV format: minimal quoting, True/False
+    # booleans and floats as repr; Arrow's writer quotes every string
+    frame = table if isinstance(table, pd.DataFrame) else table.to_pandas()
+    frame.to_csv(path, index=False)
+
+
+def conform_string_types(table: pa.Table) -> pa.Table:
+    """
+    Store strings with one Arrow type whatever built the table.
+
+    pandas 3 converts str columns to large_string and categoricals to
+    dictionaries with int8 or int16 indices, ordered for pd.cut bins and
+    DuckDB ENUMs, while the Arrow engine builds string and dictionary<int32>
+    columns. Strings are written as string and dictionaries as unordered
+    dictionary<int32, string>, so the pandas and Arrow engines write the same
+    Parquet schema. The pandas metadata is kept for round trips.
+    """
+    fields = []
+    for field in table.schema:
+        if pa.types.is_large_string(field.type):
+            field = field.with_type(pa.string())
+        elif pa.types.is_dictionary(field.type) and (
+            pa.types.is_string(field.type.value_type)
+            or pa.types.is_large_string(field.type.value_type)
+        ):
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        fields.append(field)
+    schema = pa.schema(fields, metadata=table.schema.metadata)
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+
+def _write_parquet(table: pa.Table, path: Path, options: Dict):
+    pq.write_table(
+        conform_string_types(table),
+        path,
+        compression=options["compression"],
+        row_group_size=options["row_group_size"],
+        use_dictionary=True,
+        write_statistics=True,
+    )
+
+
+# Full schema of a partitioned dataset, partition columns included, stored
+# next to the partitions as in Spark and Arrow's _common_metadata convention
+DATASET_SCHEMA = "_common_metadata"
+
+
+def write_dataset_schema(schema: pa.Schema, path: Path):
+    """Record the schema of a partitioned dataset, whose files lack the partition columns."""
+    pq.write_metadata(schema, Path(path) / DATASET_SCHEMA)
+
+
+def read_dataset_schema(path: Path) -> Optional[pa.Schema]:
+    """Schema recorded by :func:`write_dataset_schema`, None for older datasets."""
+    schema_path = Path(path) / DATASET_SCHEMA
+    return pq.read_schema(schema_path) if schema_path.exists() else None
+
+
+def write_partitioned_parquet(
+    table: pa.Table, path: Path, options: Dict, existing_data_behavior: str = "error"
+):
+    """
+    Write a table as a hive-partitioned Parquet dataset.
+
+    Rows are sorted by the partition columns and then by ``sort_by`` so each
+    file holds a contiguous pitcher range per row group, which lets readers
+    prune row groups on pitcher as well as whole partitions on date.
+
+    Args:
+        table: Table to write
+        path: Dataset directory, e.g. star/fact_pitch/game_year=2025/game_date=2025-08-04/
+        options: Parquet options (partition_by, sort_by, compression, row_group_size)
+        existing_data_behavior: "delete_matching" replaces only the partitions
+            present in ``table``, leaving the rest of the dataset untouched
+    """
+    table = conform_string_types(table)
+    partition_by = [column for column in options["partition_by"] if column in table.column_names]
+    sort_by = [column for column in options["sort_by"] if column in table.column_names]
+    for column in partition_by:
+        if pa.types.is_dictionary(table.schema.field(column).type):
+            index = table.schema.get_field_index(column)
+            table = table.set_column(
+                index, column, table[column].cast(table.schema.field(column).type.value_type)
+            )
+    table = table.sort_by([(column, "ascending") for column in partition_by + sort_by])
+
+    file_options = ds.ParquetFileFormat().make_write_options(
+        compression=options["compression"], use_dictionary=True, write_statistics=True
+    )
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=partition_by or None,
+        partitioning_flavor="hive" if partition_by else None,
+        file_options=file_options,
+        basename_template="part-{i}.parquet",
+        existing_data_behavior=existing_data_behavior,
+        max_rows_per_group=options["row_group_size"],
+        # Keep the sort order within files
+        use_threads=False,
+    )
+    write_dataset_schema(table.schema, path)
+
+
+WRITERS = {"csv": _write_csv, "parquet": _write_parquet}
+
+
+def path_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def remove_path(path: Path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def replace_path(tmp_path: Path, path: Path):
+    """Move a finished file or dataset directory into place."""
+    if path.is_dir():
+        old_path = path.with_name(f".{path.name}.old")
+        remove_path(old_path)
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path)
+    else:
+        os.replace(tmp_path, path)
+
+
+def _write_atomic(
+    name: str, table: Table, fmt: str, output_path: Path, parquet_options: Dict
+) -> Dict:
+    partitioned = (
+        fmt == "parquet"
+        and parquet_options["layout"] == "partitioned"
+        and name in parquet_options["partitioned_tables"]
+    )
+    # Partitioned tables are dataset directories named after the table
+    path = output_path / (name if partitioned else f"{name}.{fmt}")
+    tmp_path = output_path / f".{path.name}.tmp"
+    start = time.perf_counter()
+    try:
+        remove_path(tmp_path)
+        if partitioned:
+            write_partitioned_parquet(table, tmp_path, parquet_options)
+        else:
+            WRITERS[fmt](table, tmp_path, parquet_options)
+        replace_path(tmp_path, path)
+    finally:
+        remove_path(tmp_path)
+
+    # Drop the other layout's output so readers never see both
+    if fmt == "parquet":
+        remove_path(output_path / (f"{name}.parquet" if partitioned else name))
+
+    return {
+        "table": name,
+        "format": fmt,
+        "path": str(path),
+        "rows": len(table),
+        "bytes": path_size(path),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def write_tables(
+    tables: Dict[str, Table],
+    output_dir: str,
+    formats: Optional[List[str]] = None,
+    max_workers: int = 4,
+    parquet_options: Optional[Dict] = None,
+) -> List[Dict]:
+    """
+    Write tables to every configured format concurrently.
+
+    DataFrames are converted to Arrow once, then each (table, format) pair is
+    serialized on a thread pool; Arrow's Parquet writer releases the GIL, so
+    large tables are written in parallel. CSV files are written by pandas,
+    from the original DataFrame when there is one, to keep the published CSV
+    format. Files are written to a
+    temporary name and renamed, so readers never see a partial file.
+
+    Args:
+        tables: Mapping of table name to DataFrame or Arrow table
+        output_dir: Directory receiving ``{name}.{format}`` files
+        formats: Formats to write, defaults to ``output.formats`` from config.yaml
+        max_workers: Maximum number of files written at the same time
+        parquet_options: Overrides of PARQUET_DEFAULTS, defaults to ``output.parquet``
+
+    Returns:
+        One report per written file with its path, rows, bytes and seconds
+    """
+    if formats is None or parquet_options is None:
+        import config
+
+        settings = config.load_config()
+        if formats is None:
+            formats = config.output_formats(settings)
+        if parquet_options is None:
+            parquet_options = config.parquet_options(settings)
+    parquet_options = {**PARQUET_DEFAULTS, **parquet_options}
+    unknown = set(formats) - set(WRITERS)
+    if unknown:
+        raise ValueError(f"Unsupported output formats: {sorted(unknown)}")
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    arrow_tables = {
+        name: table
+        if isinstance(table, pa.Table)
+        else pa.Table.from_pandas(table, preserve_index=False)
+        for name, table in tables.items()
+    }
+
+    jobs = [
+        (name, tables[name] if fmt == "csv" else table, fmt)
+        for name, table in arrow_tables.items()
+        for fmt in formats
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reports = list(
+            executor.map(lambda job: _write_atomic(*job, output_path, parquet_options), jobs)
+        )
+
+    for report in reports:
+        logger.info(
+            f"Saved {report['table']}.{report['format']} "
+            f"({report['rows']} rows, {report['bytes']} bytes) in {report['seconds']}s"
+        )
+    return reports
+
+
+def write_parquet_partitions(
+    tables: Dict[str, Table], output_dir: str, parquet_options: Optional[Dict] = None
+) -> List[Dict]:
+    """
+    Replace only the partitions present in each table of a partitioned dataset.
+
+    Used by incremental runs to add or rewrite a day of games without touching
+    the rest of the history. A table previously written as a single file is
+    converted to a dataset first.
+
+    Args:
+        tables: Mapping of table name to the rows of the partitions to replace
+        output_dir: Model directory holding the ``{name}/`` datasets
+        parquet_options: Overrides of PARQUET_DEFAULTS, defaults to ``output.parquet``
+
+    Returns:
+        One report per dataset with its path, rows, bytes and seconds
+    """
+    if parquet_options is None:
+        import config
+
+        parquet_options = config.parquet_options()
+    parquet_options = {**PARQUET_DEFAULTS, **parquet_options}
+
+    reports = []
+    for name, table in tables.items():
+        if not isinstance(table, pa.Table):
+            table = pa.Table.from_pandas(table, preserve_index=False)
+        path = Path(output_dir) / name
+        start = time.perf_counter()
+
+        single_file = Path(output_dir) / f"{name}.parquet"
+        if single_file.exists():
+            logger.info(f"Converting {single_file} to a partitioned dataset")
+            write_partitioned_parquet(
+                pq.read_table(single_file), path, parquet_options, "delete_matching"
+            )
+            single_file.unlink()
+
+        write_partitioned_parquet(table, path, parquet_options, "delete_matching")
+        reports.append(
+            {
+                "table": name,
+                "format": "parquet",
+                "path": str(path),
+                "rows": table.num_rows,
+                "bytes": path_size(path),
+                "seconds": round(time.perf_counter() - start, 4),
+            }
+        )
+        logger.info(f"Replaced {table.num_rows} rows of partitions in {path}")
+    return reports
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def build_manifest(processed_dir: str) -> Dict:
+    """
+    Describe the Parquet outputs of every model under ``processed_dir``.
+
+    Single files and partitioned dataset directories are both listed, with
+    row counts taken from the Parquet footers.
+
+    Returns:
+        Manifest with one entry per table: model, name, path, partitioned,
+        files, rows and bytes
+    """
+    root = Path(processed_dir)
+    tables = []
+    for model_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+        for entry in sorted(model_dir.iterdir()):
+            if entry.name.startswith("."):
+                continue
+            if entry.is_file() and entry.suffix == ".parquet":
+                name, files, partitioned = entry.stem, [entry], False
+            elif entry.is_dir():
+                name, files, partitioned = entry.name, sorted(entry.rglob("*.parquet")), True
+            else:
+                continue
+            if not files:
+                continue
+            tables.append(
+                {
+                    "model": model_dir.name,
+                    "name": name,
+                    "path": str(entry.relative_to(root)),
+                    "partitioned": partitioned,
+                    "files": len(files),
+                    "rows": sum(pq.ParquetFile(f).metadata.num_rows for f in files),
+                    "bytes": sum(f.stat().st_size for f in files),
+                }
+            )
+    return {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "tables": tables}
+
+
+def write_manifest(processed_dir: str) -> Path:
+    """Write the manifest of ``processed_dir`` next to the model directories."""
+    path = Path(processed_dir) / MANIFEST_NAME
+    tmp_path = path.with_name(f".{MANIFEST_NAME}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(build_manifest(processed_dir), f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_manifest(processed_dir: str) -> Dict:
+    """Read the manifest of ``processed_dir``, building it if the pipeline did not."""
+    path = Path(processed_dir) / MANIFEST_NAME
+    if not path.exists():
+        return build_manifest(processed_dir)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
 
 
 def main():
@@ -1,15 +1,100 @@
+import argparse
 import sys
 from pathlib import Path
 
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from config import load_config
 from etl.pipeline import MLBDataPipeline
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the MLB dimensional modeling pipeline")
+    parser.add_argument("--config", default=None, help="Config file (default: src/config/config.yaml)")
+    parser.add_argument(
+        "--data-dir", default="data", help="Root of the raw, processed, cache and state directories"
+    )
+    parser.add_argument(
+        "--start-date", default=None, help="First game date (YYYY-MM-DD), from config by default"
+    )
+    parser.add_argument(
+        "--end-date",
+        default=None,
+        help="Last game date (YYYY-MM-DD), from config by default, yesterday for --incremental",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Concurrent Statcast downloads per shard"
+    )
+    parser.add_argument(
+        "--engine", choices=["pandas", "arrow", "duckdb"], default=None, help="Execution engine"
+    )
+    parser.add_argument(
+        "--from-raw", action="store_true", help="Rebuild from data/raw instead of downloading"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Recompute every stage, ignoring the stage cache"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Overlap downloads, player lookups, model builds and writes chunk by chunk",
+    )
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="Also write memory-mappable Arrow IPC snapshots of every model to <data-dir>/snapshots",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Load only game dates after the last run, up to --end-date (default: yesterday)",
+    )
+    parser.add_argument(
+        "--lookback-days", type=int, default=0, help="Days to refetch in incremental runs"
+    )
+    parser.add_argument(
+        "--http-mode",
+        choices=["live", "record", "replay"],
+        default=None,
+        help="Call the APIs, also record their responses, or replay recorded ones offline",
+    )
+    parser.add_argument(
+        "--http-archive", default=None, help="Recorded responses (default: <data-dir>/cache/http_archive.sqlite)"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "pyinstrument"],
+        default=None,
+        help="Profile each stage into data/reports/profiles/",
+    )
+    return parser.parse_args()
+
+
 def main():
-    pipeline = MLBDataPipeline()
-    pipeline.run_pipeline()
+    args = parse_args()
+    config = load_config(args.config)
+    if args.no_cache:
+        config.setdefault("cache", {})["enabled"] = False
+    if args.streaming:
+        config.setdefault("pipeline", {})["streaming"] = True
+    if args.snapshots:
+        config.setdefault("output", {}).setdefault("snapshots", {})["enabled"] = True
+    if args.http_mode:
+        config.setdefault("http", {})["mode"] = args.http_mode
+    if args.http_archive:
+        config.setdefault("http", {})["archive_path"] = args.http_archive
+    if args.profile:
+        config.setdefault("instrumentation", {})["profiler"] = args.profile
+    pipeline = MLBDataPipeline(
+        data_dir=args.data_dir, max_workers=args.workers, engine=args.engine, config=config
+    )
+    if args.incremental:
+        pipeline.run_incremental(
+            args.end_date, default_start=args.start_date, lookback_days=args.lookback_days
+        )
+    else:
+        pipeline.run_pipeline(args.start_date, args.end_date, from_raw=args.from_raw)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules are imported as top-level packages, as src/main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from benchmarks.synthetic_statcast import generate  # noqa: E402
+from config import load_config  # noqa: E402
+from etl.pipeline import MLBDataPipeline  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def synthetic(tmp_path_factory) -> Path:
+    """Synthetic games from 2024-04-01..09 and 2025-04-01..09, with a seeded player cache."""
+    data_dir = tmp_path_factory.mktemp("synthetic")
+    generate(
+        str(data_dir),
+        seasons=(2024, 2025),
+        teams=["TOR", "COL", "NYY", "BOS"],
+        games_per_team=4,
+        season_start="04-01",
+        season_end="04-10",
+    )
+    return data_dir
+
+
+@pytest.fixture
+def synthetic_pipeline(synthetic):
+    """Build pipelines over a copy of the synthetic raw store, without network access."""
+
+    def build(data_dir: Path, engine: str = "pandas", **sections) -> MLBDataPipeline:
+        config = load_config()
+        config["data"]["teams"] = []
+        config["cache"]["enabled"] = False
+        for section, settings in sections.items():
+            config.setdefault(section, {}).update(settings)
+        pipeline = MLBDataPipeline(
+            str(data_dir), engine=engine, database_path=str(data_dir / "mlb.duckdb"), config=config
+        )
+        shutil.copytree(synthetic / "raw", pipeline.raw_store.root, dirs_exist_ok=True)
+        (data_dir / "cache").mkdir(exist_ok=True)
+        shutil.copy(synthetic / "cache" / "players.sqlite", data_dir / "cache" / "players.sqlite")
+        return pipeline
+
+    return build
@@ -0,0 +1,62 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from io_utlis.duckdb_loader import load_models
+from io_utlis.write import DATASET_SCHEMA, PARQUET_DEFAULTS, write_manifest, write_tables
+
+
+def fact_pitch() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "pitch_type": pd.Categorical(["FF", "SL", "FF"]),
+            "game_date": ["2024-04-01", "2024-04-01", "2025-04-02"],
+            "pitcher": pd.array([10, 11, 10], dtype="Int32"),
+            "game_year": pd.array([2024, 2024, 2025], dtype="Int32"),
+            "release_speed": [95.1, 85.0, 96.3],
+        }
+    )
+
+
+def load(tmp_path, layout: str):
+    processed = tmp_path / layout / "processed"
+    write_tables(
+        {"fact_pitch": fact_pitch()},
+        str(processed / "star"),
+        formats=["parquet"],
+        parquet_options={**PARQUET_DEFAULTS, "layout": layout},
+    )
+    write_manifest(str(processed))
+    return processed
+
+
+def describe(db_path) -> list:
+    conn = duckdb.connect(str(db_path))
+    try:
+        columns = conn.execute("DESCRIBE star_fact_pitch").fetchall()
+        rows = conn.execute("SELECT * FROM star_fact_pitch ORDER BY game_date, pitcher").fetchall()
+        return [column[:2] for column in columns], rows
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("mode", ["table", "view"])
+def test_layouts_load_identical_schemas(tmp_path, mode):
+    for layout in ["file", "partitioned"]:
+        load_models(str(tmp_path / f"{layout}.duckdb"), str(load(tmp_path, layout)), mode)
+
+    file_columns, file_rows = describe(tmp_path / "file.duckdb")
+    assert ("game_date", "VARCHAR") in file_columns and ("game_year", "INTEGER") in file_columns
+    assert describe(tmp_path / "partitioned.duckdb") == (file_columns, file_rows)
+
+
+def test_datasets_without_recorded_schema_keep_partition_types(tmp_path):
+    load_models(str(tmp_path / "file.duckdb"), str(load(tmp_path, "file")))
+    processed = load(tmp_path, "partitioned")
+    (processed / "star" / "fact_pitch" / DATASET_SCHEMA).unlink()
+    load_models(str(tmp_path / "partitioned.duckdb"), str(processed))
+
+    # The partition columns come last, but with the types of the file layout
+    file_columns, _ = describe(tmp_path / "file.duckdb")
+    columns, _ = describe(tmp_path / "partitioned.duckdb")
+    assert sorted(columns) == sorted(file_columns)
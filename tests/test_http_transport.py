@@ -0,0 +1,83 @@
+import shutil
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+import requests
+
+from benchmarks.standin_server import StandinServer
+from etl.http_transport import HttpArchive, NotRecordedError, create_session
+
+
+@pytest.fixture
+def standin(synthetic):
+    """Stand-in Savant and MLB API serving the synthetic data on a free port."""
+    server = StandinServer(str(synthetic), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_replay_refuses_unrecorded_requests(tmp_path):
+    session = create_session(mode="replay", archive_path=str(tmp_path / "archive.sqlite"))
+
+    with pytest.raises(NotRecordedError):
+        session.get("http://127.0.0.1:9/api/v1/people/1")
+    # Clients retrying connection errors would otherwise catch it as one
+    assert issubclass(NotRecordedError, requests.ConnectionError)
+
+
+def test_replay_returns_recorded_responses(standin, tmp_path):
+    archive_path = str(tmp_path / "archive.sqlite")
+    url = f"{standin.base_url}/statcast_search/csv?game_date_lt=2024-04-02&game_date_gt=2024-04-02"
+    people = f"{standin.base_url}/api/v1/people/0"
+
+    recorder = create_session(mode="record", archive_path=archive_path)
+    recorded = recorder.get(url)
+    assert recorded.ok and recorded.content
+    # Error responses are not archived, so they can't be replayed forever
+    assert recorder.get(people).status_code == 404
+    assert HttpArchive(archive_path).stats()["responses"] == 1
+
+    standin.shutdown()
+    replayer = create_session(mode="replay", archive_path=archive_path)
+    # The query order doesn't change the recorded request
+    replayed = replayer.get(
+        f"{standin.base_url}/statcast_search/csv?game_date_gt=2024-04-02&game_date_lt=2024-04-02"
+    )
+    assert replayed.status_code == recorded.status_code
+    assert replayed.content == recorded.content
+    assert replayed.headers["Content-Type"] == recorded.headers["Content-Type"]
+    with pytest.raises(NotRecordedError):
+        replayer.get(people)
+
+
+def test_replayed_run_matches_the_recorded_run(standin, synthetic_pipeline, tmp_path):
+    sections = {"api": standin.api_config(), "cache": {"player_ttl_seconds": 0}}
+    recording = synthetic_pipeline(tmp_path / "record", http={"mode": "record"}, **sections)
+    shutil.rmtree(recording.raw_store.root)
+    recording.run_pipeline("2024-04-01", "2024-04-04")
+
+    archive = tmp_path / "record" / "cache" / "http_archive.sqlite"
+    conn = sqlite3.connect(archive)
+    recorded = conn.execute("SELECT url FROM responses").fetchall()
+    conn.close()
+    assert any("/statcast_search/csv" in url for url, in recorded)
+    assert any("/api/v1/people" in url for url, in recorded)
+
+    standin.shutdown()
+    replaying = synthetic_pipeline(
+        tmp_path / "replay", http={"mode": "replay", "archive_path": str(archive)}, **sections
+    )
+    shutil.rmtree(replaying.raw_store.root)
+    replaying.run_pipeline("2024-04-01", "2024-04-04")
+
+    expected = tmp_path / "record" / "processed"
+    actual = tmp_path / "replay" / "processed"
+    parquet_files = sorted(path.relative_to(expected) for path in expected.rglob("*.parquet"))
+    assert parquet_files
+    for path in parquet_files:
+        pd.testing.assert_frame_equal(pd.read_parquet(actual / path), pd.read_parquet(expected / path))
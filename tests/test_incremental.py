@@ -0,0 +1,168 @@
+import duckdb
+import pandas as pd
+import pyarrow.dataset as ds
+import pytest
+
+from etl.incremental import PipelineState, settled_through
+from etl.transforms.rollups import ROLLUPS, rollup_sql
+from io_utlis.duckdb_loader import upsert_dataframe
+
+
+def incremental(synthetic_pipeline, data_dir, **sections):
+    """Pipeline whose Statcast "downloads" read the synthetic raw store."""
+    runner = synthetic_pipeline(data_dir, **sections)
+    runner.download_statcast_data = (
+        lambda start_date, end_date, raise_errors=False: runner.load_raw_statcast(
+            start_date, end_date
+        )
+    )
+    return runner
+
+
+def query(runner, sql: str) -> pd.DataFrame:
+    conn = duckdb.connect(runner.database_path, read_only=True)
+    try:
+        return conn.execute(sql).df()
+    finally:
+        conn.close()
+
+
+def test_upsert_refuses_views():
+    conn = duckdb.connect()
+    conn.execute("CREATE VIEW star_dim_game AS SELECT 1 AS game_pk")
+    with pytest.raises(ValueError, match="mode=table"):
+        upsert_dataframe(conn, "star_dim_game", pd.DataFrame({"game_pk": [1]}), ["game_pk"])
+
+
+def test_incremental_run_refuses_views_before_downloading(synthetic_pipeline, tmp_path):
+    runner = synthetic_pipeline(tmp_path)
+    conn = duckdb.connect(runner.database_path)
+    conn.execute("CREATE VIEW star_fact_pitch AS SELECT '2024-04-01' AS game_date")
+    conn.close()
+
+    def download(*args, **kwargs):
+        raise AssertionError("downloaded before checking the tables")
+
+    runner.download_statcast_data = download
+    with pytest.raises(ValueError, match="star_fact_pitch .*mode=table"):
+        runner.run_incremental("2024-04-02", default_start="2024-04-01")
+
+
+def test_incremental_runs_write_partitions_and_touched_seasons(synthetic_pipeline, tmp_path):
+    runner = incremental(synthetic_pipeline, tmp_path, output={"formats": ["csv", "parquet"]})
+    star = tmp_path / "processed" / "star"
+
+    for end_date, lookback_days in [("2024-04-05", 0), ("2025-04-09", 0), ("2025-04-09", 3)]:
+        runner.run_incremental(end_date, default_start="2024-04-01", lookback_days=lookback_days)
+
+        # Rollups rebuilt for the window's seasons match a full rebuild
+        for name in ROLLUPS:
+            rebuilt = query(runner, f"SELECT * FROM rollup_{name} ORDER BY ALL")
+            expected = query(runner, f"SELECT * FROM ({rollup_sql(name)}) ORDER BY ALL")
+            pd.testing.assert_frame_equal(rebuilt, expected)
+
+    # layout: "file" is configured, but facts are kept as partitions and
+    # their whole-history CSV files are not rewritten
+    assert (star / "fact_pitch").is_dir()
+    assert not (star / "fact_pitch.parquet").exists()
+    assert not (star / "fact_pitch.csv").exists()
+    assert (star / "dim_game.csv").exists()
+    assert sorted(path.name for path in (star / "fact_pitch").glob("game_year=*")) == [
+        "game_year=2024",
+        "game_year=2025",
+    ]
+    assert query(runner, "SELECT DISTINCT season FROM rollup_pitcher_season ORDER BY 1")[
+        "season"
+    ].tolist() == [2024, 2025]
+
+
+def test_incremental_rewrites_whole_files_on_request(synthetic_pipeline, tmp_path):
+    runner = incremental(
+        synthetic_pipeline,
+        tmp_path,
+        output={"formats": ["csv", "parquet"]},
+        pipeline={"incremental_rewrite_files": True},
+    )
+    runner.run_incremental("2024-04-03", default_start="2024-04-01")
+    runner.run_incremental("2024-04-06")
+
+    history = pd.read_csv(tmp_path / "processed" / "star" / "fact_pitch.csv")
+    assert len(history) == len(query(runner, "SELECT * FROM star_fact_pitch"))
+    assert history["game_date"].min() == "2024-04-01"
+
+
+def test_settled_through_stops_before_unpublished_days():
+    # Pitches through the 9th: the 10th-12th may not be published yet
+    assert settled_through("2024-04-05", "2024-04-12", "2024-04-09") == "2024-04-09"
+    assert settled_through("2024-04-10", "2024-04-12", None) is None
+    # Off-season days have nothing to wait for
+    assert settled_through("2024-11-20", "2025-01-15", "2024-11-30") == "2025-01-15"
+    assert settled_through("2024-11-20", "2025-03-05", "2024-11-30") == "2025-02-28"
+
+
+def test_empty_windows_keep_the_high_water_mark(synthetic_pipeline, tmp_path, caplog):
+    runner = incremental(synthetic_pipeline, tmp_path)
+    state_path = str(tmp_path / "state" / "pipeline_state.json")
+
+    runner.run_incremental("2024-04-12", default_start="2024-04-01")
+    assert PipelineState(state_path).high_water_mark("statcast") == "2024-04-09"
+
+    runner.run_incremental("2024-04-12")
+    assert PipelineState(state_path).high_water_mark("statcast") == "2024-04-09"
+    assert "returned no pitches" in caplog.text
+
+
+def snapshot(runner) -> dict:
+    tables = {
+        name: query(runner, f"SELECT * FROM {name} ORDER BY ALL")
+        for name in ["star_dim_game", "star_dim_player", "star_fact_pitch", "one_big_table"]
+    }
+    tables.update(
+        {name: query(runner, f"SELECT * FROM rollup_{name} ORDER BY ALL") for name in ROLLUPS}
+    )
+    path = runner.data_dir + "/processed/star/fact_pitch"
+    dataset = ds.dataset(path, format="parquet", partitioning="hive").to_table().to_pandas()
+    tables["fact_pitch_dataset"] = dataset.sort_values(
+        ["game_pk", "at_bat_number", "pitch_number"], ignore_index=True
+    )
+    return tables
+
+
+def test_rerunning_a_window_is_idempotent(synthetic_pipeline, tmp_path):
+    runner = incremental(synthetic_pipeline, tmp_path)
+    runner.run_incremental("2024-04-05", default_start="2024-04-01")
+    first = snapshot(runner)
+
+    # The lookback refetches the whole window
+    runner.run_incremental("2024-04-05", lookback_days=5)
+    second = snapshot(runner)
+
+    for name, table in first.items():
+        pd.testing.assert_frame_equal(second[name], table, obj=name)
+
+
+def test_later_windows_keep_game_keys(synthetic_pipeline, tmp_path):
+    runner = incremental(synthetic_pipeline, tmp_path)
+    runner.run_incremental("2024-04-05", default_start="2024-04-01")
+    games = query(runner, "SELECT game_pk, game_key FROM star_dim_game")
+    facts = query(
+        runner, "SELECT game_pk, at_bat_number, pitch_number, game_key FROM star_fact_pitch"
+    )
+
+    runner.run_incremental("2024-04-09", lookback_days=2)
+    all_games = query(runner, "SELECT game_pk, game_key FROM star_dim_game")
+    kept = games.merge(all_games, on="game_pk", suffixes=("", "_after"))
+    assert len(kept) == len(games)
+    assert (kept["game_key"] == kept["game_key_after"]).all()
+    new_games = all_games[~all_games["game_pk"].isin(games["game_pk"])]
+    assert len(new_games) > 0 and new_games["game_key"].min() > games["game_key"].max()
+    assert all_games["game_key"].is_unique
+
+    all_facts = query(
+        runner, "SELECT game_pk, at_bat_number, pitch_number, game_key FROM star_fact_pitch"
+    )
+    old_facts = facts.merge(
+        all_facts, on=["game_pk", "at_bat_number", "pitch_number"], suffixes=("", "_after")
+    )
+    assert len(old_facts) == len(facts)
+    assert (old_facts["game_key"] == old_facts["game_key_after"]).all()
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from etl.transforms.keys import count_keys, map_keys
+
+
+def as_floats(values) -> np.ndarray:
+    return pd.Series(values).astype("Float64").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def test_map_keys_matches_left_merge():
+    game_dim = pd.DataFrame({"game_pk": [745001, 745002, 745003], "game_key": [3, 1, 2]})
+    pitches = pd.DataFrame({"game_pk": [745002, 745003, 999999, 745001, np.nan, 745002]})
+
+    merged = pitches.merge(game_dim, on="game_pk", how="left")
+    keys = map_keys(pitches["game_pk"], game_dim["game_pk"], game_dim["game_key"])
+
+    np.testing.assert_array_equal(as_floats(keys), as_floats(merged["game_key"]))
+    assert keys.isna().tolist() == [False, False, True, False, True, False]
+
+
+def test_map_keys_with_empty_dimension():
+    empty = pd.Series([], dtype="int64")
+    keys = map_keys(pd.Series([1, 2]), empty, empty)
+    assert keys.isna().all() and len(keys) == 2
+
+
+def test_count_keys_matches_left_merge():
+    count_dim = pd.DataFrame(
+        [
+            {"count_key": key, "balls": balls, "strikes": strikes}
+            for key, (balls, strikes) in enumerate(
+                ((b, s) for b in range(4) for s in range(3)), start=1
+            )
+        ]
+    )
+    pitches = pd.DataFrame(
+        {
+            "balls": [0, 3, 1, 2, np.nan, 4, 0, 3],
+            "strikes": [0, 2, 1, 0, 1, 0, 3, np.nan],
+        }
+    )
+
+    merged = pitches.merge(count_dim, on=["balls", "strikes"], how="left")
+    keys = count_keys(pitches["balls"], pitches["strikes"], count_dim)
+
+    np.testing.assert_array_equal(as_floats(keys), as_floats(merged["count_key"]))
+    assert keys.isna().tolist() == [False, False, False, False, True, True, True, True]
+
+
+def test_star_fact_matches_previous_merges():
+    from etl.transforms.star_schema import create_star_schema
+
+    pitches = pd.DataFrame(
+        {
+            "game_pk": [1, 1, 2, 3],
+            "pitcher": [10, 10, 11, 12],
+            "batter": [20, 21, 20, 99],
+            "balls": [0, 1, 3, 2],
+            "strikes": [0, 2, 2, 1],
+        }
+    )
+    game_dim = pd.DataFrame({"game_pk": [2, 1, 3], "game_key": [1, 2, 3]})
+    player_dim = pd.DataFrame({"player_id": [10, 11, 12, 20, 21]})
+    count_dim = pd.DataFrame(
+        {"balls": [0, 1, 3, 2], "strikes": [0, 2, 2, 1], "count_key": [1, 6, 12, 8]}
+    )
+
+    # The fact table as the chained merges used to build it
+    expected = pitches.merge(game_dim[["game_pk", "game_key"]], on="game_pk", how="left")
+    expected = expected.merge(
+        player_dim[["player_id"]], left_on="pitcher", right_on="player_id", how="left",
+        suffixes=("", "_pitcher_fk"),
+    )
+    expected = expected.merge(
+        player_dim[["player_id"]], left_on="batter", right_on="player_id", how="left",
+        suffixes=("", "_batter_fk"),
+    )
+    expected = expected.merge(
+        count_dim[["balls", "strikes", "count_key"]], on=["balls", "strikes"], how="left"
+    )
+
+    fact = create_star_schema(pitches, game_dim, player_dim, count_dim)["fact_pitch"]
+
+    assert list(fact.columns) == list(expected.columns)
+    for column in expected.columns:
+        np.testing.assert_array_equal(as_floats(fact[column]), as_floats(expected[column]))
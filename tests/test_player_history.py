@@ -0,0 +1,116 @@
+import json
+import sqlite3
+
+import pandas as pd
+
+from etl.players_client import PlayersClient
+from etl.transforms.player_history import OPEN_START, bind_player_keys, merge_player_versions
+
+
+def players(ids, team_city="Toronto"):
+    return pd.DataFrame(
+        {
+            "player_id": ids,
+            "full_name": [f"Player {i}" for i in ids],
+            "birth_city": team_city,
+        }
+    )
+
+
+def test_merge_player_versions_accepts_a_slice_of_the_dimension():
+    # A streaming run merges only the rows of the players it just saw, so
+    # the existing rows keep index labels past the slice's length
+    dimension, _ = merge_player_versions(None, players(list(range(1, 30))), "2024-04-01")
+    subset = dimension[dimension["player_id"].isin([3, 25])]
+    assert list(subset.index) != [0, 1]
+
+    snapshot = players([3, 25]).assign(birth_city=["Denver", "Toronto"])
+    merged, changed = merge_player_versions(subset, snapshot, "2024-05-01", next_key=30)
+
+    # The closed version and the new one
+    assert set(changed["player_id"]) == {3}
+    assert 30 in set(changed["player_key"])
+    versions = merged[merged["player_id"] == 3].sort_values("player_key")
+    assert list(versions["valid_to"]) == ["2024-05-01", "9999-12-31"]
+    assert list(versions["is_current"]) == [False, True]
+    assert merged.loc[merged["player_id"] == 25, "is_current"].tolist() == [True]
+
+
+def test_stale_player_records_open_versions_after_the_ttl(
+    synthetic, synthetic_pipeline, tmp_path, monkeypatch
+):
+    conn = sqlite3.connect(synthetic / "cache" / "players.sqlite")
+    seeded = {
+        player_id: json.loads(record)
+        for player_id, record in conn.execute("SELECT player_id, record FROM players")
+    }
+    conn.close()
+
+    def heavier(self, player_ids, raw_writer=None):
+        return [
+            dict(seeded[player_id], weight=seeded[player_id]["weight"] + 5)
+            for player_id in player_ids
+            if player_id in seeded
+        ]
+
+    monkeypatch.setattr(PlayersClient, "fetch_batch", heavier)
+    synthetic_pipeline(tmp_path).run_pipeline("2024-04-01", "2024-04-04", from_raw=True)
+    # Records fetched within the TTL are reused, so nothing changed yet
+    dimension = pd.read_parquet(tmp_path / "processed" / "star" / "dim_player.parquet")
+    assert dimension["is_current"].all()
+
+    pipeline = synthetic_pipeline(tmp_path, cache={"player_ttl_seconds": 0})
+    pipeline.run_pipeline("2024-04-05", "2024-04-09", from_raw=True)
+
+    dimension = pd.read_parquet(tmp_path / "processed" / "star" / "dim_player.parquet")
+    versions = dimension[dimension["valid_from"] == "2024-04-05"]
+    assert len(versions) and versions["is_current"].all()
+    closed = dimension[~dimension["is_current"]]
+    assert sorted(closed["player_id"]) == sorted(versions["player_id"])
+    assert (closed["valid_to"] == "2024-04-05").all()
+
+    facts = pd.read_parquet(tmp_path / "processed" / "star" / "fact_pitch.parquet")
+    # Players seen in both windows bind to their new version
+    bound = set(facts["pitcher_key"]) | set(facts["batter_key"])
+    assert set(versions["player_key"]) <= bound
+    assert bound.isdisjoint(closed["player_key"])
+
+
+def test_bind_player_keys_picks_the_version_current_on_each_game_date():
+    dimension, _ = merge_player_versions(None, players([7, 8]), "2024-04-01")
+    dimension, _ = merge_player_versions(
+        dimension, players([7, 8]).assign(birth_city=["Denver", "Toronto"]), "2024-05-01"
+    )
+    dimension, _ = merge_player_versions(
+        dimension, players([7, 8]).assign(birth_city=["Boston", "Toronto"]), "2024-06-15"
+    )
+    keys = dimension.set_index(["player_id", "valid_from"])["player_key"]
+
+    bound = bind_player_keys(
+        [7, 7, 7, 7, 7, 8, 8, 9, None],
+        [
+            "2023-09-30",
+            "2024-04-30",
+            "2024-05-01",
+            "2024-06-14",
+            "2024-06-15",
+            "2024-04-30",
+            "2024-07-01",
+            "2024-05-01",
+            "2024-05-01",
+        ],
+        dimension,
+    )
+
+    # Versions start on their valid_from date and end the day before valid_to
+    assert bound.tolist() == [
+        keys[(7, OPEN_START)],
+        keys[(7, OPEN_START)],
+        keys[(7, "2024-05-01")],
+        keys[(7, "2024-05-01")],
+        keys[(7, "2024-06-15")],
+        keys[(8, OPEN_START)],
+        keys[(8, OPEN_START)],
+        pd.NA,
+        pd.NA,
+    ]
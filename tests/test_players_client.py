@@ -0,0 +1,80 @@
+import pytest
+import requests
+
+from etl import players_client
+from etl.players_client import PlayersClient
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, people=()):
+        self.status_code = status_code
+        self.people = people
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self):
+        return {"people": [{"id": player_id, "fullName": f"Player {player_id}"} for player_id in self.people]}
+
+
+class FakeSession:
+    """Answers each people query, keyed by its IDs, from a queue of scripted responses."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url, timeout=None):
+        ids = url.split("personIds=")[-1].rsplit("/", 1)[-1]
+        self.calls.append(ids)
+        return self.responses[ids].pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(players_client.time, "sleep", delays.append)
+    return delays
+
+
+def client(session, **kwargs):
+    return PlayersClient(save_raw=False, session=session, backoff_factor=0.5, **kwargs)
+
+
+def test_fetch_batch_retries_transient_failures_with_backoff(sleeps):
+    session = FakeSession(
+        {"1,2": [FakeResponse(503), FakeResponse(500), FakeResponse(people=[1, 2])]}
+    )
+    players = client(session).fetch_batch([1, 2])
+    assert [player["player_id"] for player in players] == [1, 2]
+    assert session.calls == ["1,2"] * 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_failed_batch_falls_back_to_single_players(sleeps):
+    session = FakeSession(
+        {
+            "1,2,3": [FakeResponse(503), FakeResponse(503)],
+            "1": [FakeResponse(people=[1])],
+            "2": [FakeResponse(404)],
+            "3": [FakeResponse(people=[3])],
+        }
+    )
+    players = client(session, max_retries=1).fetch_batch([1, 2, 3])
+    assert [player["player_id"] for player in players] == [1, 3]
+    assert session.calls == ["1,2,3", "1,2,3", "1", "2", "3"]
+
+
+def test_fetch_player_data_reports_missing_ids(sleeps, caplog):
+    session = FakeSession(
+        {
+            "1,2": [FakeResponse(people=[1])],
+            "3": [FakeResponse(502), FakeResponse(502)],
+        }
+    )
+    api = client(session, batch_size=2, max_workers=1, max_retries=1)
+    frame = api.fetch_player_data([1, 2, 3])
+    assert frame["player_id"].tolist() == [1]
+    assert api.missing_ids == [2, 3]
+    assert "No player data for 2 players: [2, 3]" in caplog.text
@@ -0,0 +1,36 @@
+import duckdb
+
+from benchmarks.query_benchmark import QUERIES
+from etl.transforms.rollups import rollup_sql
+from io_utlis.duckdb_loader import load_models
+
+
+def rows(conn, sql):
+    return sorted(
+        tuple(round(value, 9) if isinstance(value, float) else value for value in row)
+        for row in conn.execute(sql).fetchall()
+    )
+
+
+def test_models_answer_queries_alike(synthetic_pipeline, tmp_path):
+    synthetic_pipeline(tmp_path).run_pipeline("2024-04-01", "2024-04-10", from_raw=True)
+    db_path = str(tmp_path / "benchmark.duckdb")
+    load_models(db_path, str(tmp_path / "processed"))
+
+    with duckdb.connect(db_path, read_only=True) as conn:
+        for name, variants in QUERIES.items():
+            expected = rows(conn, variants["star"])
+            assert expected, name
+            assert rows(conn, variants["snowflake"]) == expected, name
+            assert rows(conn, variants["obt"]) == expected, name
+
+        # Whiffs per swing, as the pitcher_season rollup counts them
+        whiff_rate = rows(
+            conn,
+            f"""
+            SELECT count_category, sum(whiffs) / nullif(sum(swings), 0)
+            FROM ({rollup_sql("pitcher_season")})
+            GROUP BY ALL
+            """,
+        )
+        assert rows(conn, QUERIES["whiff_rate_by_count_category"]["star"]) == whiff_rate
@@ -0,0 +1,110 @@
+import os
+
+import pandas as pd
+import pandas.testing as tm
+
+from etl.stage_cache import StageCache
+
+
+def frame(n=3):
+    return {"pitches": pd.DataFrame({"pitch_id": range(n), "pitch_type": ["FF", "SL", "CH"][:n]})}
+
+
+class Compute:
+    """Stage function counting its calls."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.tables
+
+
+def test_hit_returns_stored_tables_without_computing(tmp_path):
+    cache = StageCache(tmp_path)
+    compute = Compute(frame())
+
+    first, fingerprint, hit = cache.run("raw", {"season": 2024}, compute)
+    assert not hit
+    second, cached_fingerprint, hit = cache.run("raw", {"season": 2024}, compute)
+
+    assert hit
+    assert compute.calls == 1
+    assert cached_fingerprint == fingerprint
+    tm.assert_frame_equal(second["pitches"], first["pitches"])
+
+
+def test_changed_inputs_or_code_miss(tmp_path):
+    cache = StageCache(tmp_path)
+    compute = Compute(frame())
+    cache.run("raw", {"season": 2024}, compute, code="v1")
+
+    assert not cache.run("raw", {"season": 2025}, compute, code="v1")[2]
+    assert not cache.run("raw", {"season": 2024}, compute, code="v2")[2]
+    assert not cache.run("star", {"season": 2024}, compute, code="v1")[2]
+    assert compute.calls == 4
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = StageCache(tmp_path)
+    compute = Compute(frame())
+    cache.run("players", {}, compute)
+
+    assert cache.run("players", {}, compute, max_age_seconds=3600)[2]
+    assert not cache.run("players", {}, compute, max_age_seconds=-1)[2]
+    assert compute.calls == 2
+
+
+def test_hash_output_fingerprints_by_content(tmp_path):
+    cache = StageCache(tmp_path)
+
+    _, first, _ = cache.run("raw", {"date": "2024-04-01"}, Compute(frame()), hash_output=True)
+    _, second, _ = cache.run("raw", {"date": "2024-04-02"}, Compute(frame()), hash_output=True)
+    _, third, _ = cache.run("raw", {"date": "2024-04-03"}, Compute(frame(2)), hash_output=True)
+
+    assert first == second
+    assert third != first
+
+
+def test_empty_output_is_not_cached(tmp_path):
+    cache = StageCache(tmp_path)
+    compute = Compute({"pitches": frame()["pitches"].iloc[0:0]})
+
+    assert not cache.run("raw", {"season": 2024}, compute)[2]
+    assert not cache.run("raw", {"season": 2024}, compute)[2]
+    assert compute.calls == 2
+    assert cache.entries() == []
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path):
+    probe = StageCache(tmp_path / "probe")
+    probe.run("raw", {"season": 0}, Compute(frame()))
+    entry_size = probe.entries()[0][1]
+
+    cache = StageCache(tmp_path / "cache", max_bytes=int(entry_size * 2.5))
+    compute = Compute(frame())
+    cache.run("raw", {"season": 2023}, compute)
+    cache.run("raw", {"season": 2024}, compute)
+    for age, season in [(200, 2023), (100, 2024)]:
+        manifest = cache.entry_dir("raw", cache.key("raw", {"season": season})) / "manifest.json"
+        os.utime(manifest, (manifest.stat().st_atime - age, manifest.stat().st_mtime - age))
+
+    # Reading 2023 makes 2024 the least recently used entry
+    assert cache.run("raw", {"season": 2023}, compute)[2]
+    cache.run("raw", {"season": 2025}, compute)
+
+    kept = sorted(entry_dir.name for _, _, entry_dir in cache.entries())
+    assert kept == sorted(cache.key("raw", {"season": season}) for season in (2023, 2025))
+    assert sum(size for _, size, _ in cache.entries()) <= cache.max_bytes
+
+
+def test_disabled_cache_always_computes(tmp_path):
+    cache = StageCache(tmp_path / "stages", enabled=False)
+    compute = Compute(frame())
+
+    assert not cache.run("raw", {}, compute)[2]
+    assert not cache.run("raw", {}, compute)[2]
+    assert compute.calls == 2
+    assert not (tmp_path / "stages").exists()
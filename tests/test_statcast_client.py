@@ -0,0 +1,126 @@
+import time
+
+import pytest
+import requests
+
+from etl import statcast_client
+from etl.statcast_client import StatcastClient
+
+# Kept before the tests patch time.sleep to record backoff delays
+real_sleep = time.sleep
+
+CSV_HEADER = "pitch_type,game_date,game_pk,at_bat_number,pitch_number,pitcher,batter\n"
+
+
+def day_csv(day: str) -> bytes:
+    return (CSV_HEADER + f"FF,{day},1{day[-2:]},1,1,100,200\n").encode()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, blocks=(), error=None):
+        self.status_code = status_code
+        self.blocks = blocks
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=None):
+        yield from self.blocks
+        if self.error is not None:
+            raise self.error
+
+
+class FakeSession:
+    """Answers each day's export from a queue of scripted responses."""
+
+    def __init__(self, responses, delays=None):
+        self.responses = responses
+        self.delays = delays or {}
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        day = params["game_date_gt"]
+        self.calls.append(day)
+        real_sleep(self.delays.get(day, 0))
+        return self.responses[day].pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(statcast_client.time, "sleep", delays.append)
+    return delays
+
+
+def client(tmp_path, session, **kwargs):
+    return StatcastClient(
+        "2024-04-01",
+        "2024-04-01",
+        session=session,
+        download_dir=str(tmp_path),
+        backoff_factor=0.5,
+        **kwargs,
+    )
+
+
+def test_fetch_chunk_retries_transient_failures_with_backoff(tmp_path, sleeps):
+    session = FakeSession(
+        {
+            "2024-04-01": [
+                FakeResponse(503),
+                FakeResponse(blocks=[b"pitch_type"], error=requests.exceptions.ChunkedEncodingError()),
+                FakeResponse(blocks=[day_csv("2024-04-01")]),
+            ]
+        }
+    )
+    pitches = client(tmp_path, session).fetch_chunk("2024-04-01", "2024-04-01", "TOR")
+
+    assert len(session.calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert pitches["game_date"].astype(str).tolist() == ["2024-04-01"]
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_fetch_chunk_gives_up_after_max_retries_and_cleans_up(tmp_path, sleeps):
+    dropped = [
+        FakeResponse(blocks=[b"pitch_type"], error=requests.exceptions.ChunkedEncodingError())
+        for _ in range(3)
+    ]
+    session = FakeSession({"2024-04-01": dropped})
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client(tmp_path, session, max_retries=2).fetch_chunk("2024-04-01", "2024-04-01", "TOR")
+    assert sleeps == [0.5, 1.0]
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_fetch_chunk_does_not_retry_client_errors(tmp_path, sleeps):
+    session = FakeSession({"2024-04-01": [FakeResponse(404)]})
+
+    with pytest.raises(requests.HTTPError):
+        client(tmp_path, session).fetch_chunk("2024-04-01", "2024-04-01", "TOR")
+    assert len(session.calls) == 1
+    assert sleeps == []
+
+
+def test_fetch_data_keeps_chronological_order(tmp_path):
+    days = ["2024-04-01", "2024-04-02", "2024-04-03", "2024-04-04"]
+    # Earlier days answer last, so chunks complete in reverse order
+    session = FakeSession(
+        {day: [FakeResponse(blocks=[day_csv(day)])] for day in days},
+        delays={day: 0.05 * (len(days) - i) for i, day in enumerate(days)},
+    )
+    fetcher = StatcastClient(
+        days[0], days[-1], session=session, download_dir=str(tmp_path), max_workers=4
+    )
+
+    pitches = fetcher.fetch_data()
+    assert pitches["game_date"].astype(str).tolist() == days